@@ -0,0 +1,284 @@
+"""
+Benchmarks for the core ConfigGrid operations, on synthetic grids of increasing size.
+
+Run from the root of the repository e.g.
+
+    python -m benchmarks.bench run --sizes default --output before.json
+    ... upgrade ...
+    python -m benchmarks.bench run --sizes default --output after.json
+    python -m benchmarks.bench compare before.json after.json
+
+run times each benchmark (best of --repeat runs) and records the peak memory it allocated (measured by tracemalloc, in
+a separate untimed run), for every combination of size and payload, and writes the results as JSON.
+
+A benchmark that raises is recorded with its error, instead of a time and peak, and the run carries on.
+
+compare matches up the results of two runs, and flags any that got slower or used more memory by more than
+--threshold (10% by default), or that now fail, exiting with status 1 if there were any.
+
+Grids are generated from a seeded random.Random, so two runs with the same --seed benchmark exactly the same grids.
+"""
+import argparse
+import csv
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import config_grid
+from config_grid import ConfigGrid
+
+
+SIZES = {
+    "quick": [(10, 10), (100, 100), (1000, 100)],
+    "default": [(10, 10), (100, 100), (1000, 1000)],
+    "full": [(10, 10), (100, 100), (1000, 1000), (10000, 1000), (10000, 10000)],
+}
+
+PAYLOADS = {
+    "str": lambda rng: "value {}".format(rng.randrange(10 ** 6)),
+    "int": lambda rng: rng.randrange(-10 ** 6, 10 ** 6),
+    "float": lambda rng: rng.uniform(-10 ** 6, 10 ** 6),
+}
+
+
+def make_lines(rows, cols, payload, seed=0, prefix=""):
+    """
+    Lines of a synthetic grid, in the format taken by ConfigGrid.from_lines
+
+    :param prefix: prepended to the headings, so grids with different headings can be generated for combine
+    """
+    rng = random.Random(seed)
+    value = PAYLOADS[payload]
+    lines = [["Bench Grid"] + ["{}Col {}".format(prefix, i) for i in range(cols)]]
+    for i in range(rows):
+        lines.append(["{}Row {}".format(prefix, i)] + [value(rng) for _ in range(cols)])
+    return lines
+
+
+def csv_text(lines, quoting=csv.QUOTE_MINIMAL):
+    text = io.StringIO()
+    csv.writer(text, lineterminator="\n", quoting=quoting).writerows(lines)
+    return text.getvalue()
+
+
+def exhaust(iterable):
+    deque(iterable, maxlen=0)
+
+
+# Each benchmark is a pair of functions, setup(grid_cls, lines) -> state, which isn't timed, and run(state).
+
+
+def _grid(grid_cls, lines):
+    return grid_cls.from_lines(lines)
+
+
+def _half_new(grid_cls, lines):
+    """
+    A grid and another that shares half its rows and columns with it
+    """
+    grid = grid_cls.from_lines(lines)
+    rows, cols = len(grid.row_hds), len(grid.col_hds)
+    other = make_lines(rows, cols, "int", seed=1, prefix="New ")
+    other[0][1:cols // 2 + 1] = grid.col_hds[:cols // 2]
+    for line, heading in zip(other[1:rows // 2 + 1], grid.row_hds):
+        line[0] = heading
+    return grid, grid_cls.from_lines(other)
+
+
+def _appends(grid_cls, lines):
+    grid = grid_cls.from_lines(lines)
+    count = min(len(grid.row_hds), len(grid.col_hds), 100)
+    return grid, count
+
+
+def _append_rows(state):
+    grid, count = state
+    row = [grid.default] * len(grid.col_hds)
+    for i in range(count):
+        grid.append_row("Appended {}".format(i), row)
+
+
+def _append_cols(state):
+    grid, count = state
+    col = [grid.default] * len(grid.row_hds)
+    for i in range(count):
+        grid.append_col("Appended {}".format(i), col)
+
+
+def _swap_rows(grid):
+    first, last = grid.row_hds[0], grid.row_hds[-1]
+    for _ in range(1000):
+        grid.swap_rows(first, last)
+
+
+BENCHMARKS = {
+    "from_lines": (lambda grid_cls, lines: (grid_cls, lines),
+                   lambda state: state[0].from_lines(state[1])),
+    "from_csv_file": (lambda grid_cls, lines: (grid_cls, csv_text(lines)),
+                      lambda state: state[0].from_csv_file(io.StringIO(state[1]), {"dialect": "excel"})),
+    # quoted, so the sniffed dialect is needed to parse it, and it takes the csv module path
+    "from_csv_file_sniff": (lambda grid_cls, lines: (grid_cls, csv_text(lines, csv.QUOTE_ALL)),
+                            lambda state: state[0].from_csv_file(io.StringIO(state[1]))),
+    "from_csv_file_csv": (lambda grid_cls, lines: (grid_cls, csv_text(lines)),
+                          lambda state: state[0].from_csv_file(io.StringIO(state[1]), parser="csv")),
+    "save_to_file": (_grid, lambda grid: grid.save_to_file(io.StringIO())),
+    "repr": (_grid, repr),
+    "cells": (_grid, lambda grid: exhaust(grid.cells)),
+    "rows": (_grid, lambda grid: exhaust(map(exhaust, grid.rows))),
+    "cols": (_grid, lambda grid: exhaust(map(exhaust, grid.cols))),
+    "combine": (_half_new, lambda state: state[0].combine(state[1])),
+    "append_row": (_appends, _append_rows),
+    "append_col": (_appends, _append_cols),
+    "swap_rows": (_grid, _swap_rows),
+}
+
+
+def measure(setup, run, grid_cls, lines, repeat):
+    """
+    :return: (best time in seconds of repeat runs, peak bytes allocated by one run)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup(grid_cls, lines)
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    state = setup(grid_cls, lines)
+    tracemalloc.start()
+    try:
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def parse_sizes(sizes):
+    """
+    Sizes from either the name of a preset in SIZES, or a comma separated list like "100x10,1000x1000"
+    """
+    if sizes in SIZES:
+        return SIZES[sizes]
+    parsed = []
+    for size in sizes.split(","):
+        rows, cols = size.lower().split("x")
+        parsed.append((int(rows), int(cols)))
+    return parsed
+
+
+def run_benchmarks(sizes, payloads, names, grid_cls=ConfigGrid, repeat=3, seed=0, log=None):
+    """
+    Run the benchmarks names for each size and payload
+
+    :return: dict of the run's metadata and results, as written by the run command
+    """
+    results = []
+    for rows, cols in sizes:
+        for payload in payloads:
+            lines = make_lines(rows, cols, payload, seed)
+            for name in names:
+                setup, run = BENCHMARKS[name]
+                result = {"name": name, "rows": rows, "cols": cols, "payload": payload}
+                try:
+                    result["seconds"], result["peak_bytes"] = measure(setup, run, grid_cls, lines, repeat)
+                except Exception as e:
+                    # e.g. the Sniffer guessing the wrong delimiter, record it rather than abandon the run
+                    result["seconds"] = result["peak_bytes"] = None
+                    result["error"] = "{}: {}".format(type(e).__name__, e)
+                results.append(result)
+                if log and "error" in result:
+                    log("{name:<20} {rows:>6}x{cols:<6} {payload:<6} {error}".format(**result))
+                elif log:
+                    log("{name:<20} {rows:>6}x{cols:<6} {payload:<6} {seconds:>10.5f}s {peak_bytes:>12,}B"
+                        .format(**result))
+    return {"meta": {"python": platform.python_version(),
+                     "implementation": platform.python_implementation(),
+                     "platform": platform.platform(),
+                     "config_grid": getattr(config_grid, "__file__", ""),
+                     "grid_class": grid_cls.__name__,
+                     "repeat": repeat,
+                     "seed": seed,
+                     "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+
+def compare(old, new, threshold=0.1):
+    """
+    Compare the results of two runs
+
+    :return: list of (key, metric, old value, new value, ratio) for each metric that grew by more than threshold, and
+        (key, "error", None, error, None) for each benchmark that ran in old but failed in new. Benchmarks that only
+        ran in one of the runs, or failed in both, aren't compared
+    """
+    def keyed(run):
+        return {(result["name"], result["rows"], result["cols"], result["payload"]): result
+                for result in run["results"]}
+
+    old_results = keyed(old)
+    regressions = []
+    for key, result in keyed(new).items():
+        if key not in old_results:
+            continue
+        if "error" in result:
+            if "error" not in old_results[key]:
+                regressions.append((key, "error", None, result["error"], None))
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            before, after = old_results[key][metric], result[metric]
+            if before and after is not None and after / before > 1 + threshold:
+                regressions.append((key, metric, before, after, after / before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for config_grid")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("--sizes", default="default",
+                     help="one of {} or a list like 100x10,1000x1000".format(", ".join(SIZES)))
+    run.add_argument("--payloads", default=",".join(PAYLOADS), help="comma separated, from {}".format(", ".join(PAYLOADS)))
+    run.add_argument("--only", default=",".join(BENCHMARKS), help="comma separated names of benchmarks to run")
+    run.add_argument("--grid-class", default="ConfigGrid", help="name of the grid class in config_grid to benchmark")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", help="file to write the results to, as JSON")
+
+    comp = commands.add_parser("compare", help="flag regressions between two runs")
+    comp.add_argument("old")
+    comp.add_argument("new")
+    comp.add_argument("--threshold", type=float, default=0.1, help="allowed relative growth, 0.1 = 10%%")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = run_benchmarks(parse_sizes(args.sizes), args.payloads.split(","), args.only.split(","),
+                                 getattr(config_grid, args.grid_class), args.repeat, args.seed, log=print)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        return 0
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+    regressions = compare(old, new, args.threshold)
+    for (name, rows, cols, payload), metric, before, after, ratio in regressions:
+        if metric == "error":
+            print("REGRESSION {} {}x{} {} now fails: {}".format(name, rows, cols, payload, after))
+            continue
+        print("REGRESSION {} {}x{} {} {}: {:.6g} -> {:.6g} ({:+.0%})".format(name, rows, cols, payload, metric,
+                                                                            before, after, ratio - 1))
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
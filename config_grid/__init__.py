@@ -1,6 +1,22 @@
+import asyncio
 import csv
-
-from .utilities import Cell, UniqueList, LineDict
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
+
+from . import parsers
+from .binary import save_binary, load_binary
+from .cache import default_cache
+from .changes import ChangeTracker
+from .index import ValueIndex
+from .instrument import Instrumentation, instrumented, timed
+from .parallel import load_csv_parallel
+from .reductions import ReductionCache
+from .render import RenderCache, render_lines, shown, stream_lines
+from .utilities import Cell, UniqueList, LineDict, CopiedLines, Patch, WriteStats, CountingWriter, open_grid_file, apply_converter, \
+    result_or_error
 
 
 class ConfigGrid:
@@ -14,8 +30,21 @@ class ConfigGrid:
     A from_csv_file factory is also provided for convenience.
 
     Saving to files is also supported
+
+    Values can be converted column by column (or row by row) as they are loaded and saved, by setting col_types/
+    row_types and col_formats/ row_formats, see from_lines and save_to_file.
     """
 
+    col_types = {}
+    row_types = {}
+    col_formats = {}
+    row_formats = {}
+    max_repr_rows = 60
+    max_repr_cols = 20
+    _listeners = ()
+    _listener_attributes = ("_listeners", "_renderer", "_value_index", "_reductions")
+    _line_cls = LineDict
+
     def __init__(self, row_hds, col_hds, title="", default=""):
         """
         Initialisation for a blank ConfigGrid.
@@ -49,13 +78,37 @@ class ConfigGrid:
         self.col_hds = UniqueList(col_hds)
         self._data = LineDict(self.row_hds)
         for row_heading in self.row_hds:
-            self._data[row_heading] = LineDict(self.col_hds, default)
+            self._data[row_heading] = self._line_cls(self.col_hds, default)
+
+    @staticmethod
+    def _split_lines(lines):
+        """
+        Single pass over lines, splitting off the title, and the row and column headings, without creating any Cells.
+
+        Each row is checked to be no wider than the col headings, shorter rows are left to be filled with the default.
+
+        :param lines: as process_lines
+        :return: (title, row_hds, col_hds, rows)
+            rows: list containing a list of values for each row, in the same order as row_hds
+        """
+        lines = iter(lines)
+        title, *col_headings = lines.__next__()
+        width = len(col_headings)
+        row_headings = []
+        rows = []
+        for row in lines:
+            row_heading, *values = row
+            if len(values) > width:
+                raise IndexError("Different number of incoming values, to cols to fill")
+            row_headings.append(row_heading)
+            rows.append(values)
+        return title, row_headings, col_headings, rows
 
     @staticmethod
     def process_lines(lines):
         """
         Helper staticmethod that separates row and column headers from the data in a table. Will also extract the
-        first value as the title. Used by both from_lines and from_csv_file
+        first value as the title.
         :param lines:
             simply takes any 2D iterable where the first dimension contains each row in the table,
             and the second dimension contains the contents in each row INCLUDING ROW AND COLUMN HEADERS.
@@ -72,20 +125,16 @@ class ConfigGrid:
             data: list of Cell objects, that contain their row and column and their value
             title: the item found in the top left of the table
         """
-        lines = iter(lines)
-        title, *col_headings = lines.__next__()
-        row_headings = []
+        title, row_headings, col_headings, rows = ConfigGrid._split_lines(lines)
         data = []
-        for row in lines:
-                row = iter(row)
-                row_heading = row.__next__()
-                row_headings.append(row_heading)
-                for col_heading, value in zip(col_headings, row):
-                    data.append(Cell(row=row_heading, col=col_heading, value=value))
+        for row_heading, values in zip(row_headings, rows):
+            for col_heading, value in zip(col_headings, values):
+                data.append(Cell(row=row_heading, col=col_heading, value=value))
         return row_headings, col_headings, data, title
 
     @classmethod
-    def from_lines(cls, lines):
+    @instrumented("from_lines")
+    def from_lines(cls, lines, col_types=None, row_types=None):
         """
         Alternative constructor for ConfigGrid, returns filled initialised instance of ConfigGrid,
         populated with the input lines.
@@ -99,20 +148,146 @@ class ConfigGrid:
                      ("Dinner"   , "Curry", "Curry", "Curry", "Curry"))
             grid = ConfigGrid.from_lines(lines)
 
+        Rows are loaded straight into storage in bulk. preprocess_value is only called if a subclass overrides it.
+
+        Whole columns or rows can be converted in one pass as they're loaded, by mapping their headings to converters
+        in col_types/ row_types e.g.
+
+            grid = ConfigGrid.from_lines(lines, col_types={"Mon": int, "Tues": float})
+
+        Each converter is called with each value in the column/ row, unless it's been decorated with
+        utilities.vectorised, in which case it's called once with a list of all of them. Column converters are
+        applied before row converters. preprocess_value is only applied to cells that aren't covered by either.
+
         :param lines:
             2D iterable, that returns each row in the first dimension, and the contents of each row in the second.
             The fist row and column are taken as the col_hds and row_hds respectively. The top left taken as
             the title of your table
+        :param col_types: dict of col heading -> converter, defaults to the col_types class attribute
+        :param row_types: dict of row heading -> converter, defaults to the row_types class attribute
         :return: an initialised and filled instance of ConfigGrid, from the contents of lines
         """
-        row_headings, col_headings, data, title = cls.process_lines(lines)
-        obj = cls(row_headings, col_headings, title)
-        for cell in data:
-            obj[cell.row][cell.col] = cls.preprocess_value(obj, cell.row, cell.col, cell.value)
+        with timed("from_lines.parse"):
+            title, row_headings, col_headings, rows = cls._split_lines(lines)
+        return cls._from_rows(title, row_headings, col_headings, rows, col_types, row_types)
+
+    @classmethod
+    def _from_rows(cls, title, row_headings, col_headings, rows, col_types=None, row_types=None, preprocess=True):
+        """
+        Create a grid from the output of _split_lines, applying any converters and preprocess_value.
+
+        :param preprocess: set to False if preprocess_value has already been applied to rows
+        """
+        with timed("from_lines.headings"):
+            obj = cls(row_headings, col_headings, title)
+        col_types = cls.col_types if col_types is None else col_types
+        row_types = cls.row_types if row_types is None else row_types
+        if col_types or row_types:
+            with timed("from_lines.convert"):
+                width = len(col_headings)
+                lengths = None
+                if any(len(values) != width for values in rows):
+                    # the padding is left as the default, only the cells that were read are converted
+                    lengths = [len(values) for values in rows]
+                    default = obj.default
+                    rows = [values + [default] * (width - len(values)) for values in rows]
+                columns = [list(column) for column in zip(*rows)]
+                if not columns:
+                    columns = [[] for _ in col_headings]
+                columns = obj._convert(obj.row_hds, columns, col_types, row_types, obj._preprocessor(), lengths)
+            with timed("from_lines.load"):
+                obj._load_columns(columns)
+            return obj
+        preprocess_value = obj._preprocessor() if preprocess else None
+        if preprocess_value is not None:
+            with timed("from_lines.convert"):
+                rows = [[preprocess_value(row_heading, col_heading, value)
+                         for col_heading, value in zip(col_headings, values)]
+                        for row_heading, values in zip(row_headings, rows)]
+        with timed("from_lines.load"):
+            obj._load_rows(rows)
         return obj
 
+    def _preprocessor(self):
+        """
+        preprocess_value, or None if it hasn't been overridden
+        """
+        if type(self).preprocess_value is ConfigGrid.preprocess_value:
+            return None
+        return self.preprocess_value
+
+    def _postprocessor(self):
+        """
+        postprocess_value, or None if it hasn't been overridden
+        """
+        if type(self).postprocess_value is ConfigGrid.postprocess_value:
+            return None
+        return self.postprocess_value
+
+    def _convert(self, row_hds, columns, col_funcs, row_funcs, cell_func, lengths=None):
+        """
+        Apply converters to the values of the grid, held as a list of column lists in the order of col_hds.
+
+        :param row_hds: the row headings of the values in each column, usually self.row_hds
+        :param columns: list of lists of values, modified in place
+        :param col_funcs: dict of col heading -> converter
+        :param row_funcs: dict of row heading -> converter
+        :param cell_func: preprocess_value/ postprocess_value style function, applied to the cells that are not covered by
+            col_funcs or row_funcs. Can be None
+        :param lengths: number of values actually read for each row, the cells after them are padding, and are left
+            as they are. None if every row is full
+        :return: columns
+        """
+        width = len(columns)
+        if lengths is None:
+            lengths = [width] * len(row_hds)
+        for i, col_heading in enumerate(self.col_hds):
+            func = col_funcs.get(col_heading)
+            if func is not None:
+                column = columns[i]
+                present = [j for j, length in enumerate(lengths) if length > i]
+                if len(present) == len(column):
+                    columns[i] = apply_converter(func, column)
+                else:
+                    for j, value in zip(present, apply_converter(func, [column[j] for j in present])):
+                        column[j] = value
+        for j, row_heading in enumerate(row_hds):
+            func = row_funcs.get(row_heading)
+            if func is not None:
+                read = columns[:lengths[j]]
+                for column, value in zip(read, apply_converter(func, [column[j] for column in read])):
+                    column[j] = value
+        if cell_func is not None:
+            plain_rows = [(j, row_heading) for j, row_heading in enumerate(row_hds) if row_heading not in row_funcs]
+            for i, (col_heading, column) in enumerate(zip(self.col_hds, columns)):
+                if col_heading in col_funcs:
+                    continue
+                for j, row_heading in plain_rows:
+                    if lengths[j] > i:
+                        column[j] = cell_func(row_heading, col_heading, column[j])
+        return columns
+
+    def _load_columns(self, columns):
+        """
+        As _load_rows, but from a list of lists of values, one for each heading in col_hds, in order. Each must be as
+        long as row_hds.
+        """
+        self._load_rows(list(zip(*columns)))
+
+    def _load_rows(self, rows):
+        """
+        Bulk fill a freshly initialised grid, bypassing the per cell heading checks of LineDict.
+
+        :param rows: list of lists of values, one for each heading in row_hds, in order. Each may be shorter than
+            col_hds, leaving the default in the remaining cells.
+        """
+        col_hds = self.col_hds
+        for line, values in zip(map(self._data.__getitem__, self.row_hds), rows):
+            dict.update(line, zip(col_hds, values))
+
     @classmethod
-    def from_csv_file(cls, file, csv_reader_args=None):
+    @instrumented("from_csv_file")
+    def from_csv_file(cls, file, csv_reader_args=None, col_types=None, row_types=None, parser=None):
         """
         Alternative constructor allowing for easy loading from csv files . returns initialised and populated config grid
         based on file provided. utilises csv.reader
@@ -124,40 +299,407 @@ class ConfigGrid:
             ConfigGrid will try and sniff your file for its dialect, but you can bypass this by providing a dict of
             csv.reader args as csv_reader_args optional argument. There is also a write_to_file (see below)
 
+        The start of the file is scanned first, and files without any quoting, with a clear delimiter, are parsed by
+        simply splitting each line, which is several times faster than csv.reader. Anything else is sniffed and parsed
+        with csv.reader as usual. See parsers for the backends.
+
         :param file:
             file object that contains the grid. NOTE: ConfigGrid will set seek to 0
         :param csv_reader_args:
             dictionary of dialect arguments that will be passed to csv.reader if provided
             (see csv.reader for details)
+        :param col_types: see from_lines
+        :param row_types: see from_lines
+        :param parser: name of the parser backend to use, "split", "csv" or "pyarrow" (if installed), by default it's
+            chosen automatically
         :return: an initialised and filled instance of ConfigGrid, from the contents of file
         """
         file.seek(0)
-        if csv_reader_args:
-            reader_obj = csv.reader(file, csv_reader_args)
-        else:
-            try:
-                dialect = csv.Sniffer().sniff(file.read(1024))
-            except csv.Error:
-                dialect = csv.excel
-                dialect.delimiter = ","
-                dialect.lineterminator = "\n"
-            file.seek(0)
-            reader_obj = csv.reader(file, dialect)
-        return cls.from_lines(reader_obj)
+        with timed("from_csv_file.sniff"):
+            parser, reader_args = parsers.select(file.read(1024), parser, csv_reader_args, cls._sniff)
+        file.seek(0)
+        return cls.from_lines(parsers.PARSERS[parser](file, reader_args), col_types, row_types)
+
+    @classmethod
+    def from_csv_parallel(cls, path, workers=None, csv_reader_args=None, col_types=None, row_types=None,
+                          encoding="utf-8", min_size=4 * 1024 * 1024):
+        """
+        Alternative constructor that parses a large csv file on several cores at once. e.g.
+
+            grid = ConfigGrid.from_csv_parallel("grid.csv", workers=8)
+
+        The file is split into byte ranges on line breaks, which are parsed (and run through preprocess_value) in a
+        process pool. The rows are then put back together in their original order, so the result is the same as
+        from_csv_file.
+
+        Falls back to parsing the file in this process with from_csv_file if the file is smaller than min_size, is
+        compressed, contains the quote character anywhere (as quoted fields may span lines) or if the class can't be
+        pickled (e.g. it was defined inside a function).
+
+        :param path: path of the csv file
+        :param workers: number of processes to use, defaults to the number of cpus
+        :param csv_reader_args: see from_csv_file
+        :param col_types: see from_lines, applied once all the rows have been gathered
+        :param row_types: see from_lines
+        :param encoding: text encoding of the file
+        :param min_size: files smaller than this many bytes are parsed serially
+        :return: an initialised and filled instance of ConfigGrid, from the contents of the file
+        """
+        return load_csv_parallel(cls, path, workers, csv_reader_args, col_types, row_types, encoding, min_size)
+
+    @classmethod
+    def load(cls, path, cache=True, **kwargs):
+        """
+        Load the grid stored at path, sharing parsed grids between callers e.g.
+
+            grid = ConfigGrid.load("grid.csv")
+
+        Files ending in .cgrid are loaded with load_binary, anything else with from_csv_file (decompressing gzip, bz2 and
+        xz files on the way, based on their extension).
+
+        By default parsed grids are kept in a process wide cache (cache.default_cache), so later loads of the same,
+        unchanged, file skip the parsing. Each caller gets their own copy of the grid.
+
+        :param path: path of the file
+        :param cache: True to use the default cache, False to always parse the file, or a cache.GridCache to use
+        :param kwargs: passed on to from_csv_file, e.g. col_types
+        :return: an initialised and filled instance of ConfigGrid, from the contents of the file, with path set
+        """
+        if cache is False:
+            return cls._load_path(path, **kwargs)
+        if cache is True:
+            cache = default_cache
+        return cache.get(cls, path, cls._load_path, **kwargs)
+
+    @classmethod
+    async def aload(cls, path, executor=None, **kwargs):
+        """
+        Coroutine version of load, that parses the file in executor, leaving the event loop free e.g.
+
+            grids = await asyncio.gather(*(ConfigGrid.aload(path) for path in paths), return_exceptions=True)
+
+        :param path: path of the file
+        :param executor: concurrent.futures.Executor to load the file in, None for the loop's default thread pool
+        :param kwargs: passed on to load
+        :return: as load
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(cls.load, path, **kwargs))
+
+    async def asave(self, path, executor=None, **kwargs):
+        """
+        Coroutine that saves the grid to path in executor, leaving the event loop free. Paths ending in .cgrid are saved
+        with save_binary, anything else with save_to_path.
+
+        The grid shouldn't be changed until the save has finished.
+
+        :param path: path of the file to write
+        :param executor: concurrent.futures.Executor to save the file in, None for the loop's default thread pool
+        :param kwargs: passed on to save_to_path
+        :return: as save_to_path, or None for .cgrid files
+        """
+        loop = asyncio.get_running_loop()
+        if os.fspath(path).endswith(".cgrid"):
+            return await loop.run_in_executor(executor, partial(self.save_binary, path))
+        return await loop.run_in_executor(executor, partial(self.save_to_path, path, **kwargs))
+
+    @classmethod
+    def load_many(cls, paths, max_workers=None, processes=False, **kwargs):
+        """
+        Load a batch of files at once, with load, in a pool of threads or processes e.g.
+
+            grids = ConfigGrid.load_many(paths, max_workers=16)
+            failed = [(path, grid) for path, grid in zip(paths, grids) if isinstance(grid, Exception)]
+
+        Threads overlap the time spent waiting on the files, which suits slow (e.g. network) storage. Parsing holds the
+        GIL, so use processes=True to parse on several cores, at the cost of sending each grid back to this process.
+        cls must be importable (defined at the top level of a module) to use processes, and grids loaded in other
+        processes aren't added to this process's cache.
+
+        A file that fails to load doesn't stop the others, the exception it raised is returned in its place.
+
+        :param paths: iterable of paths
+        :param max_workers: size of the pool, see concurrent.futures
+        :param processes: use a process pool rather than a thread pool
+        :param kwargs: passed on to load
+        :return: list containing, for each path in order, its grid or the exception raised loading it
+        """
+        paths = list(paths)
+        pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool_cls(max_workers=max_workers) as executor:
+            futures = [executor.submit(cls.load, path, **kwargs) for path in paths]
+            return [result_or_error(future) for future in futures]
+
+    @classmethod
+    def _load_path(cls, path, **kwargs):
+        if os.fspath(path).endswith(".cgrid"):
+            return cls.load_binary(path)
+        with open_grid_file(path, "r") as file:
+            obj = cls.from_csv_file(file, **kwargs)
+        obj.path = path
+        return obj
+
+    @classmethod
+    def load_binary(cls, path):
+        """
+        Alternative constructor, loading a grid written by save_binary. e.g.
+
+            grid = ColumnarGrid.load_binary("grid.cgrid")
+
+        The file is memory mapped, and with ColumnarGrid the int and float columns are used directly from the mapping,
+        without being copied or parsed. Changes to those columns are never written back to the file. Other grid classes
+        copy the values into their own storage.
+
+        :param path: path of the file
+        :return: an initialised and filled instance of ConfigGrid, from the contents of the file
+        """
+        return load_binary(cls, path)
+
+    def save_binary(self, path):
+        """
+        Save ConfigGrid to path in a compact binary format, that can be loaded much faster than csv with load_binary.
+
+        Columns of all ints or all floats are stored as packed arrays, any other column is stored as JSON, so must only
+        contain values json can serialise, as must the title, default and headings.
+
+        :param path: path of the file to write
+        """
+        save_binary(self, path)
+
+    @staticmethod
+    def _sniff(sample):
+        """
+        Guess the csv dialect of sample, falling back to csv.excel if the Sniffer can't make sense of it.
+        """
+        try:
+            return csv.Sniffer().sniff(sample)
+        except csv.Error:
+            return csv.excel
 
     def __repr__(self):
-        first_col = [self.title] + self.row_hds
-        rows = []
-        for row in self.rows:
-            rows.append(tuple(str(value) for value in row))
-        headed_data_rows = [self.col_hds] + rows
-        headed_data_cols = [col for col in zip(*headed_data_rows)]
-        all_cols = [first_col] + headed_data_cols
-        widths = [max(map(len, tuple(col))) + 2 for col in all_cols]
-        row_strings = []
-        for row in zip(*all_cols):
-            row_strings.append("".join((val.ljust(width) for val, width in zip(row, widths))))
-        return "\n".join(row_strings)
+        return self.render(self.max_repr_rows, self.max_repr_cols)
+
+    @instrumented("render")
+    def render(self, max_rows=None, max_cols=None, file=None, cache=False):
+        """
+        The grid as a text table, with each column padded to fit its widest value. This is what __repr__ returns,
+        limited to max_repr_rows and max_repr_cols e.g.
+
+            print(grid.render(max_rows=4, max_cols=4))
+            Big Grid  Col 1  Col 2  ...  Col 99  Col 100
+            Row 1     1      2      ...  99      100
+            Row 2     101    102    ...  199     200
+            ...       ...    ...    ...  ...     ...
+            Row 999   99801  99802  ...  99899   99900
+            Row 1000  99901  99902  ...  99999   100000
+
+        If there are more rows (or cols) than fit, only the first and last halves are shown, either side of a row (or
+        column) of "...". Only the cells shown are read, so the cost doesn't depend on the size of the grid.
+
+        With cache=True the render is kept, and only redone once a cell it shows is set, or its headings, the title or
+        the default change, so repeatedly printing a large grid is cheap. This registers a listener with the grid (see
+        add_listener), which makes every write to the grid slightly slower, so __repr__ doesn't cache.
+
+        :param max_rows: maximum number of rows to show, None for all of them
+        :param max_cols: maximum number of cols to show, None for all of them
+        :param file: if given, the lines are written to file one at a time, rather than returned
+        :param cache: keep the render, and reuse it until the cells it shows change
+        :return: the table as a str, or None if file was given
+        """
+        if cache:
+            renderer = self.__dict__.get("_renderer")
+            if renderer is None:
+                renderer = self._renderer = RenderCache()
+                self.add_listener(renderer)
+            lines = renderer.lines(self, max_rows, max_cols)
+        else:
+            rows, row_gap = shown(self.row_hds, max_rows)
+            cols, col_gap = shown(self.col_hds, max_cols)
+            if file is not None:
+                lines = stream_lines(self, rows, cols, row_gap, col_gap)
+            else:
+                lines = render_lines(self, rows, cols, row_gap, col_gap)
+        if file is None:
+            return "\n".join(lines)
+        for line in lines:
+            file.write(line)
+            file.write("\n")
+
+    def add_listener(self, listener):
+        """
+        Register listener, to be told about the changes made to the cells of the grid, see utilities.GridListener.
+
+        Only writes made through the grid are reported e.g. grid[row][col] = value, set_row, or combine. Listeners are
+        not copied along with the grid.
+
+        :param listener: a GridListener
+        """
+        if not self._listeners:
+            self._listeners = []
+            self._watch_rows(True)
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Stop telling listener about changes
+        """
+        self._listeners.remove(listener)
+        if not self._listeners:
+            self._watch_rows(False)
+
+    def _watch_rows(self, watch):
+        """
+        Start (or stop, if watch is False) the rows of the grid reporting each write to _cell_set
+        """
+        for row_heading in self.row_hds:
+            self._watch_row(row_heading, watch)
+
+    def _watch_row(self, row_heading, watch=True):
+        self._data[row_heading].observer = partial(self._cell_set, row_heading) if watch else None
+
+    def _cell_set(self, row_heading, col_heading, old, new):
+        for listener in self._listeners:
+            listener.cell_set(self, row_heading, col_heading, old, new)
+
+    def _headings_added(self, new_rows, new_cols):
+        """
+        Tell the listeners about new row and col headings
+        """
+        for listener in self._listeners:
+            for row_heading in new_rows:
+                listener.row_added(self, row_heading)
+            for col_heading in new_cols:
+                listener.col_added(self, col_heading)
+
+    def __getstate__(self):
+        """
+        Listeners stay with the original grid when it's pickled
+        """
+        state = dict(self.__dict__)
+        for name in self._listener_attributes:
+            state.pop(name, None)
+        return state
+
+    def _shallow_copy(self):
+        """
+        New instance of the class, sharing all of the attributes of self, apart from its listeners
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(ConfigGrid.__getstate__(self))
+        return new
+
+    def copy(self):
+        """
+        Independent copy of the grid. Values themselves aren't copied.
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        new._data = LineDict(new.row_hds)
+        for row_heading in new.row_hds:
+            line = self._line_cls(new.col_hds, self.default)
+            dict.update(line, self._data[row_heading])
+            dict.__setitem__(new._data, row_heading, line)
+        return new
+
+    def _lazy_copy(self):
+        """
+        As copy, but each row is only copied the first time it's used, so the copy is cheap to make if few of its rows
+        are. Only safe if self is never changed afterwards, see cache.GridCache.
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        new._data = CopiedLines(new.row_hds, self._data, self._line_cls, new.col_hds, self.default)
+        return new
+
+    def _adopt_headings(self, row_hds, col_hds):
+        """
+        Replace the grid's headings with row_hds and col_hds, lists equal to its own, whose values are used as the keys
+        of its storage in place of its own, see store.GridStore
+        """
+        data = LineDict(row_hds)
+        for row_heading in row_hds:
+            old = self._data[row_heading]
+            line = self._line_cls(col_hds, self.default)
+            dict.update(line, ((col_heading, dict.__getitem__(old, col_heading)) for col_heading in col_hds
+                               if dict.__contains__(old, col_heading)))
+            dict.__setitem__(data, row_heading, line)
+        self.row_hds = row_hds
+        self.col_hds = col_hds
+        self._data = data
+        if self._listeners:
+            self._watch_rows(True)
+
+    def _nbytes(self):
+        """
+        Rough size in bytes of the grid's storage and values, not counting its headings, see store.GridStore
+        """
+        getsizeof = sys.getsizeof
+        total = getsizeof(self._data)
+        for line in dict.values(self._data):
+            total += getsizeof(line) + sum(map(getsizeof, dict.values(line)))
+        return total
+
+    def _blank(self, row_hds, col_hds):
+        """
+        New grid with row_hds and col_hds, and the same title and default as self, to fill with a copy of (some of) the
+        values of self
+        """
+        return self.__class__(row_hds, col_hds, self.title, self.default)
+
+    def view(self, rows=None, cols=None):
+        """
+        View of some of the rows and cols of the grid, that shares the grid's storage e.g.
+
+            weekend = grid.view(cols=("Sat", "Sun"))
+            weekend["Lunch"]["Sat"] = "Brunch"  # sets grid["Lunch"]["Sat"]
+            weekend.save_to_file(file)  # saves just the Sat and Sun cols
+
+        The view supports the same reading and writing as the grid, and writes pass through to the grid. Its shape can't
+        be changed, call its materialize method for an independent grid. See views.GridView.
+
+        :param rows: iterable of the row headings to include, in the order to show them, None for all of them
+        :param cols: iterable of the col headings to include, in the order to show them, None for all of them
+        :return: views.GridView
+        """
+        return GridView(self, rows, cols)
+
+    @property
+    def loc(self):
+        """
+        Subscript to make views, selecting rows and cols by heading e.g.
+
+            grid.loc["Row 2":"Row 4", "Col 1"]  # rows Row 2 to Row 4 inclusive, of col Col 1
+            grid.loc[["Row 1", "Row 3"], :]  # rows Row 1 and Row 3, all cols
+            grid.loc["Row 1":]  # rows Row 1 onwards, all cols
+
+        Slices go from the start heading up to and including the stop heading, and may have a step. A list selects the
+        headings in it, in the order given, and a single heading selects just that heading. The result is always a
+        view, see view.
+        """
+        return GridLoc(self)
+
+    def transpose(self):
+        """
+        The grid with its rows and cols swapped e.g.
+
+            by_day = grid.transpose()
+            by_day["Mon"]["Lunch"]  # grid["Lunch"]["Mon"]
+
+        This is a view, sharing the grid's storage, so it takes O(1) time and memory. Writes to it pass through to the
+        grid. Call its materialize method for an independent grid. See views.TransposedView.
+
+        :return: views.TransposedView
+        """
+        return TransposedView(self)
+
+    @property
+    def T(self):
+        """
+        Shorthand for transpose()
+        """
+        return self.transpose()
 
     def __getitem__(self, row_hd):
         """
@@ -185,15 +727,187 @@ class ConfigGrid:
         :param row_heading: name of the row being modified
         :param value: value to set row to
         """
-        self._data.__setitem__(row_heading, value)
+        if not self._listeners:
+            self._data.__setitem__(row_heading, value)
+            return
+        # a new line, so value can be any mapping, and another grid's row isn't taken over (with its observer)
+        line = self._line_cls(self.col_hds, self.default)
+        line.update(value)
+        old = self._data[row_heading]
+        self._data.__setitem__(row_heading, line)
+        self._watch_row(row_heading)
+        for col_heading in self.col_hds:
+            self._cell_set(row_heading, col_heading, old[col_heading], line[col_heading])
 
     def __eq__(self, other):
         """
-        True if rows and headings of both grids are equal
+        True if rows and headings of both grids are equal, the order of the headings isn't considered
         :param other: ConfigGrid to compare to
         :return:
         """
-        return set(self.row_hds) == set(other.row_headings) and set(self.col_hds) == set(other.col_headings)
+        if not isinstance(other, ConfigGrid):
+            return NotImplemented
+        if set(self.row_hds) != set(other.row_hds) or set(self.col_hds) != set(other.col_hds):
+            return False
+        return not self.diff(other).cells
+
+    def diff(self, other):
+        """
+        Compare with other, returning the patch that would bring self into line with it e.g.
+
+            patch = old_grid.diff(new_grid)
+            old_grid.apply_patch(patch)
+
+        Only the cells that differ (or are in rows/ cols that self doesn't have) are included, so patches are small
+        enough to send between processes or machines in place of the whole grid. They only contain lists and
+        headings/ values, so can be serialised e.g. with json.dumps(patch._asdict())
+
+        The patch can't describe removing headings, so other must have all of the row and col headings of self. The
+        order of the headings isn't compared.
+
+        :param other: a ConfigGrid
+        :return: utilities.Patch, with:
+            rows: list of the row headings other has, but self doesn't
+            cols: list of the col headings other has, but self doesn't
+            cells: list of (row, col, value) triples, the cells whose value in other differs from self
+            title: the title of other, or None if it's the same as that of self
+        """
+        missing = [heading for heading in self.row_hds if heading not in other.row_hds] + \
+                  [heading for heading in self.col_hds if heading not in other.col_hds]
+        if missing:
+            raise ValueError("other is missing headings {}, diff can't remove headings".format(missing))
+        rows = [heading for heading in other.row_hds if heading not in self.row_hds]
+        cols = [heading for heading in other.col_hds if heading not in self.col_hds]
+        new_rows = set(rows)
+        new_cols = set(cols)
+        other_col_hds = other.col_hds
+        cells = []
+        for row_heading, values in zip(other.row_hds, other.rows):
+            if row_heading in new_rows:
+                cells.extend((row_heading, col_heading, value) for col_heading, value in zip(other_col_hds, values))
+                continue
+            line = self[row_heading]
+            for col_heading, value in zip(other_col_hds, values):
+                if col_heading in new_cols or line[col_heading] != value:
+                    cells.append((row_heading, col_heading, value))
+        title = other.title if other.title != self.title else None
+        return Patch(rows, cols, cells, title)
+
+    def apply_patch(self, patch):
+        """
+        Apply a patch, from diff or ChangeTracker.patch, to the grid. New headings are added to the end, as with
+        combine.
+
+        :param patch: utilities.Patch, or a sequence of rows, cols, cells, title as in a Patch
+        :return: self
+        """
+        rows, cols, cells, title = patch
+        self._grow(rows, cols)
+        for row_heading, col_heading, value in cells:
+            self[row_heading][col_heading] = value
+        if title is not None:
+            self.title = title
+        return self
+
+    def index_values(self):
+        """
+        Start keeping an index of value -> cells of the grid, so where, rows_with and cols_with don't have to scan the
+        grid. Building the index takes one pass over the grid, after which it's updated as cells are set or headings
+        are added.
+
+        Called automatically by where, rows_with and cols_with, so only needs calling directly to build the index
+        ahead of time.
+
+        :return: index.ValueIndex
+        """
+        index = self.__dict__.get("_value_index")
+        if index is None:
+            index = self._value_index = ValueIndex(self)
+            self.add_listener(index)
+        return index
+
+    def where(self, value):
+        """
+        Find the cells holding value e.g.
+
+            grid.where("Curry!") -> {("Dinner", "Mon"), ("Dinner", "Tues")}
+
+        Uses the value index (see index_values), building it on the first call, so the cost only depends on the number
+        of cells found. Values that compare equal are found together (e.g. 1 and 1.0), unhashable values can't be found.
+
+        :param value: value to look for
+        :return: set of the (row, col) headings of each cell that holds value
+        """
+        return self.index_values().where(value)
+
+    def rows_with(self, value):
+        """
+        As where, but returns the set of the row headings of the rows containing value
+        """
+        return self.index_values().rows_with(value)
+
+    def cols_with(self, value):
+        """
+        As where, but returns the set of the col headings of the cols containing value
+        """
+        return self.index_values().cols_with(value)
+
+    def reduce(self, axis="col", func="sum"):
+        """
+        Reduce each row (axis="row") or column (axis="col") to a single value e.g.
+
+            grid.reduce("col", "sum") -> {"Mon": 12, "Tues": 9, ...}
+            grid.reduce("row", "max")
+            grid.reduce("col", statistics.median)
+
+        func may be one of "sum", "min", "max", "mean" or "count" (the number of values that aren't equal to the
+        default), or any function that takes a list of the values in a row/ column. min, max and mean are None for an
+        empty row or column.
+
+        Results are memoised, and setting a cell only invalidates the results for its row and its column, so calling
+        this repeatedly costs O(headings) between writes. Only changes made through the grid are noticed, see
+        add_listener. Functions are memoised by identity, so pass the same function each time, not a new lambda.
+        NumericGrid computes the built in reductions with numpy.
+
+        :param axis: "row" for one result per row, "col" for one per column
+        :param func: name of a built in reduction, or a function of a list of values
+        :return: dict of heading -> result, in heading order
+        """
+        cache = self.__dict__.get("_reductions")
+        if cache is None:
+            cache = self._reductions = ReductionCache()
+            self.add_listener(cache)
+        return cache.reduce(self, axis, func)
+
+    def _reduce_all(self, axis, func):
+        """
+        Results of the built in reduction func for every row (axis="row") or column (axis="col"), in heading order.
+        Used by reduce when it has no results yet, subclasses with a faster way to compute these can override it.
+
+        :return: list of results, or None to reduce each row/ column in turn
+        """
+        return None
+
+    def track_changes(self):
+        """
+        Start recording changes made to the grid e.g.
+
+            tracker = grid.track_changes()
+            grid["Row 1"]["Col 2"] = "foo"
+            grid.append_row("Row 3", ("a", "b"))
+            tracker.patch() -> Patch(rows=["Row 3"], cols=[], cells=[("Row 3", "Col 1", "a"), ("Row 3", "Col 2", "b"),
+                                                                      ("Row 1", "Col 2", "foo")], title=None)
+            tracker.reset()
+
+        Cells set through the grid are recorded, as are new rows and cols (e.g. from append_row or combine). Only which
+        cells changed is recorded, the patch is made from their current values, so its size doesn't depend on how many
+        times they changed.
+
+        :return: changes.ChangeTracker, call its stop method to stop tracking
+        """
+        tracker = ChangeTracker(self)
+        self.add_listener(tracker)
+        return tracker
 
     def __add__(self, other):
         """
@@ -247,21 +961,84 @@ class ConfigGrid:
         """
         return value
 
-    def save_to_file(self, file, csv_writer_args=None):
+    def _lines_out(self, col_formats, row_formats):
+        """
+        Generator yielding the lines of the grid, as they're written to file, with any formatters applied, and
+        postprocess_value applied if it's been overridden.
+        """
+        yield [self.title] + self.col_hds
+        postprocess_value = self._postprocessor()
+        if col_formats or row_formats:
+            columns = [list(col) for col in self.cols]
+            columns = self._convert(self.row_hds, columns, col_formats, row_formats, postprocess_value)
+            for row_heading, row in zip(self.row_hds, zip(*columns)):
+                yield (row_heading, *row)
+        elif postprocess_value is None:
+            for row_heading, row in zip(self.row_hds, self.rows):
+                yield (row_heading, *row)
+        else:
+            col_hds = self.col_hds
+            for row_heading, row in zip(self.row_hds, self.rows):
+                yield (row_heading, *(postprocess_value(row_heading, col_heading, value)
+                                      for col_heading, value in zip(col_hds, row)))
+
+    @instrumented("save_to_file")
+    def save_to_file(self, file, csv_writer_args=None, batch_size=1000, col_formats=None, row_formats=None):
         """
         Save ConfigGrid to file using csv.writer
 
+        Rows are streamed to the writer batch_size at a time through writerows.
+
+        As with col_types/ row_types in from_lines, whole columns or rows can be formatted in one pass on the way out,
+        by mapping their headings to formatters in col_formats/ row_formats e.g.
+
+            grid.save_to_file(file, col_formats={"Mon": datetime.isoformat})
+
+        postprocess_value is then only applied to the cells that aren't covered by either.
+
         :param file: file object for writing to
         :param csv_writer_args: dict of arguments to be passed to csv.writer see csv.writer documentation for details
+        :param batch_size: number of rows handed to csv.writer in each call to writerows
+        :param col_formats: dict of col heading -> formatter, defaults to the col_formats class attribute
+        :param row_formats: dict of row heading -> formatter, defaults to the row_formats class attribute
+        :return: WriteStats(rows, chars, bytes)
+            rows: number of rows written, including the heading row
+            chars: number of characters handed to file.write
+            bytes: None, as the encoding is up to file
         """
-        writer = csv.writer(file, lineterminator="\n") if not csv_writer_args else csv.writer(file, **csv_writer_args)
-        fieldnames = [self.title] + self.col_hds
-        writer.writerow(fieldnames)
-        for row_heading, row in zip(self.row_hds, self.rows):
-            data_bit = tuple(self.postprocess_value(row_heading, col_heading, value)
-                             for col_heading, value in zip(self.col_hds, row))
-            combined = (row_heading,) + data_bit
-            writer.writerow(combined)
+        col_formats = self.col_formats if col_formats is None else col_formats
+        row_formats = self.row_formats if row_formats is None else row_formats
+        counter = CountingWriter(file)
+        writer = csv.writer(counter, lineterminator="\n") if not csv_writer_args else csv.writer(counter, **csv_writer_args)
+        lines = self._lines_out(col_formats, row_formats)
+        rows = 0
+        while True:
+            batch = list(islice(lines, batch_size))
+            if not batch:
+                break
+            writer.writerows(batch)
+            rows += len(batch)
+        return WriteStats(rows=rows, chars=counter.chars, bytes=None)
+
+    def save_to_path(self, path, csv_writer_args=None, batch_size=1000, compression="infer", encoding="utf-8",
+                     col_formats=None, row_formats=None):
+        """
+        Save ConfigGrid to the file at path, optionally compressing it on the way, e.g.
+
+            grid.save_to_path("grid.csv.gz")
+
+        :param path: path of the file to write
+        :param csv_writer_args: see save_to_file
+        :param batch_size: see save_to_file
+        :param compression: one of "gzip", "bz2", "xz" or None, or "infer" to choose based on the extension of path
+        :param encoding: text encoding for the file
+        :param col_formats: see save_to_file
+        :param row_formats: see save_to_file
+        :return: WriteStats(rows, chars, bytes), as save_to_file but with bytes set to the size of the written file
+        """
+        with open_grid_file(path, "w", compression, encoding=encoding) as file:
+            stats = self.save_to_file(file, csv_writer_args, batch_size, col_formats, row_formats)
+        return stats._replace(bytes=os.path.getsize(path))
 
     @property
     def rows(self):
@@ -279,7 +1056,7 @@ class ConfigGrid:
             in order
         """
         for row_heading in self.row_hds:
-            yield (self._data[row_heading][col_heading] for col_heading in self.col_hds)
+            yield map(self._data[row_heading].__getitem__, self.col_hds)
 
     @property
     def cols(self):
@@ -296,8 +1073,9 @@ class ConfigGrid:
             provides a generator that yields another generator for each line that yields the values in that column
             in order
         """
+        lines = list(map(self._data.__getitem__, self.row_hds))
         for col_heading in self.col_hds:
-            yield (self._data[row_heading][col_heading] for row_heading in self.row_hds)
+            yield (line[col_heading] for line in lines)
 
     @property
     def cells(self):
@@ -311,8 +1089,57 @@ class ConfigGrid:
             a generator that yields Cell objects for each cell in the grid
         """
         for row_heading in self.row_hds:
+            line = self._data[row_heading]
             for column_heading in self.col_hds:
-                yield Cell(row=row_heading, col=column_heading, value=self._data[row_heading][column_heading])
+                yield Cell(row=row_heading, col=column_heading, value=line[column_heading])
+
+    def iter_values(self):
+        """
+        Iterator over every value in the grid, rastering across the grid from left to right, top to bottom, as cells
+        does, but without making a Cell (or an iterator per row) for each value e.g.
+
+            total = sum(grid.iter_values())
+
+        :return: a flat iterator of the values
+        """
+        return chain.from_iterable(self.rows)
+
+    def itertuples(self):
+        """
+        Iterate over the rows as plain tuples, of the row heading followed by the values in the row e.g.
+
+            for meal, mon, tues in grid.itertuples():
+                print("{} on Monday is {}".format(meal, mon))
+
+        :return: a generator that yields a tuple for each row, in order
+        """
+        for row_heading, row in zip(self.row_hds, self.rows):
+            yield (row_heading, *row)
+
+    def to_lists(self):
+        """
+        All of the values of the grid, as a list of lists, one for each row, following the order of row_hds and
+        col_hds. The headings aren't included.
+        """
+        return [list(row) for row in self.rows]
+
+    @property
+    def iat(self):
+        """
+        Subscript for reading and writing cells by their position, rather than their headings e.g.
+
+            grid.iat[0, -1] -> value in the first row and last col
+            grid.iat[1, 2] = "foo"
+
+        Positions follow the order of row_hds and col_hds, and can be negative, as with list indices.
+        """
+        return GridIat(self)
+
+    def _get_cell(self, row_heading, col_heading):
+        """
+        Value of a cell, straight from storage. Both headings must be in the grid.
+        """
+        return self._data[row_heading][col_heading]
 
     def col(self, col):
         """
@@ -347,6 +1174,8 @@ class ConfigGrid:
         if not len(self.row_hds) == len(col):
             raise IndexError("Different number of incoming values, to rows to fill")
         self.col_hds.append(col_heading)
+        if self._listeners:
+            self._headings_added((), (col_heading,))
         for row_heading, value in zip(self.row_hds, col):
             self._data[row_heading][col_heading] = value
 
@@ -361,7 +1190,10 @@ class ConfigGrid:
         if not len(self.col_hds) == len(row):
             raise IndexError("Different number of incoming values, to cols to fill")
         self.row_hds.append(row_hd)
-        self._data[row_hd] = LineDict(self.col_hds)
+        self._data[row_hd] = self._line_cls(self.col_hds, self.default)
+        if self._listeners:
+            self._watch_row(row_hd)
+            self._headings_added((row_hd,), ())
         for col_heading, value in zip(self.col_hds, row):
             self._data[row_hd][col_heading] = value
 
@@ -391,35 +1223,79 @@ class ConfigGrid:
         for row_heading, new_val in zip(self.row_hds, values):
             self._data[row_heading][col_hd] = new_val
 
+    @instrumented("combine")
     def combine(self, other, overwrite=True):
         """
         Combine the rows and values from other in self. By default will add new rows/ columns to the end of the grid,
-        and will overwrite any matching columns/ rows.
+        and will overwrite any matching cells.
 
-        CAN ONLY MODIFY ONE OF ROWS OR COLUMNS NOT BOTH.
+        New rows and columns can both be added at once, any cell in them that isn't covered by other is left as the
+        default.
 
         if overwrite=False, any matching cells will not be over-writen by those in other.
 
+        Headings are matched up by hash lookups, so the cost only depends on the number of cells in other.
+
         :param other: another ConfigGrid
         :param overwrite: do overwrite current matching cells with new ones?
+        :return: self, for chaining
         """
-        new_rows = list(heading for heading in other.row_hds if heading not in self.row_hds)
-        new_cols = list(heading for heading in other.col_hds if heading not in self.col_hds)
-        if len(new_rows) > 0 and len(new_cols) > 0:
-            raise KeyError("Can only add to one row or column at a time, incoming grid does not match in either")
-        for heading in new_rows:
-            self.append_row(heading, other.row(heading))
-        for heading in new_cols:
-            self.append_col(heading, other.col(heading))
-        if overwrite:
-            if new_rows:
-                overlap_rows = (heading for heading in other.row_hds if heading in self.row_hds)
-                for heading in overlap_rows:
-                    self.set_row(heading, other.row(heading))
-            if new_cols:
-                overlap_cols = (heading for heading in other.col_hds if heading in self.col_hds)
-                for heading in overlap_cols:
-                    self.set_col(heading, other.col(heading))
+        new_rows = [heading for heading in other.row_hds if heading not in self.row_hds]
+        new_cols = [heading for heading in other.col_hds if heading not in self.col_hds]
+        self._grow(new_rows, new_cols)
+        new_rows = set(new_rows)
+        new_cols = set(new_cols)
+        other_col_hds = other.col_hds
+        for row_heading, row in zip(other.row_hds, other.rows):
+            line = self[row_heading]
+            if overwrite or row_heading in new_rows:
+                for col_heading, value in zip(other_col_hds, row):
+                    line[col_heading] = value
+            elif new_cols:
+                for col_heading, value in zip(other_col_hds, row):
+                    if col_heading in new_cols:
+                        line[col_heading] = value
+        return self
+
+    @classmethod
+    def merge(cls, *grids, overwrite=True):
+        """
+        Alternative constructor, merging any number of grids into a new grid in one go e.g.
+
+            master = ConfigGrid.merge(north_grid, south_grid, east_grid, west_grid)
+
+        The new grid has every row and column heading found in grids, in the order they're first seen, and takes its
+        title and default from the first grid. Where grids share a cell, the value from the last of them is kept, or the
+        first if overwrite=False.
+
+        :param grids: ConfigGrids to merge
+        :param overwrite: do later grids overwrite the matching cells of earlier ones?
+        :return: a new instance of cls, containing the cells of all of grids
+        """
+        if not grids:
+            raise ValueError("merge needs at least one grid")
+        row_hds = dict.fromkeys(heading for grid in grids for heading in grid.row_hds)
+        col_hds = dict.fromkeys(heading for grid in grids for heading in grid.col_hds)
+        obj = cls(row_hds, col_hds, grids[0].title, grids[0].default)
+        for grid in (grids if overwrite else reversed(grids)):
+            obj.combine(grid)
+        return obj
+
+    def _grow(self, new_rows, new_cols):
+        """
+        Add new rows and columns to the end of the grid, filled with the default.
+
+        :param new_rows: list of new row headings
+        :param new_cols: list of new col headings
+        """
+        self.col_hds.extend(new_cols)
+        self.row_hds.extend(new_rows)
+        for row_heading in new_rows:
+            self._data[row_heading] = self._line_cls(self.col_hds, self.default)
+            if self._listeners:
+                self._watch_row(row_heading)
+        if self._listeners:
+            self._headings_added(new_rows, new_cols)
 
     def swap_rows(self, row1, row2):
         row1_i = self.row_hds.index(row1)
@@ -430,3 +1306,65 @@ class ConfigGrid:
         col1_i = self.col_hds.index(col1)
         col2_i = self.col_hds.index(col2)
         self.col_hds.swap(col1_i, col2_i)
+
+    def reorder_rows(self, order):
+        """
+        Put the rows in order. Only the headings are rearranged, none of the values are moved.
+
+        :param order: iterable containing each row heading exactly once
+        """
+        self.row_hds.reorder(order)
+
+    def reorder_cols(self, order):
+        """
+        Put the cols in order. Only the headings are rearranged, none of the values are moved.
+
+        :param order: iterable containing each col heading exactly once
+        """
+        self.col_hds.reorder(order)
+
+    def sort_rows(self, key=None, by_col=None, reverse=False):
+        """
+        Sort the rows, by their headings or by their values in one column e.g.
+
+            grid.sort_rows()  # by heading
+            grid.sort_rows(by_col="Price", reverse=True)  # most expensive first
+            grid.sort_rows(key=len)  # by the length of the heading
+
+        The sort is stable and, as with reorder_rows, only the headings are rearranged.
+
+        :param key: function of the heading (or value, if by_col is given) to sort by, as for sorted
+        :param by_col: sort by the values in this column, rather than the headings
+        :param reverse: sort in descending order
+        """
+        self.row_hds.sort(key=self._sort_key(self.row_hds, key, None if by_col is None else self.col(by_col)),
+                          reverse=reverse)
+
+    def sort_cols(self, key=None, by_row=None, reverse=False):
+        """
+        As sort_rows, but sorts the cols, by their headings or by their values in the row by_row
+        """
+        self.col_hds.sort(key=self._sort_key(self.col_hds, key, None if by_row is None else self.row(by_row)),
+                          reverse=reverse)
+
+    @staticmethod
+    def _sort_key(headings, key, values):
+        """
+        Key function for sorting headings, by key(heading), or by key(value) if values is given
+
+        :param values: iterable of values, one for each of headings in order, or None
+        """
+        if values is None:
+            return key
+        values = dict(zip(headings, values))
+        if key is None:
+            return values.__getitem__
+        return lambda heading: key(values[heading])
+
+
+from .columnar import ColumnarGrid
+from .lazy import LazyCsvGrid
+from .numeric import NumericGrid
+from .sparse import SparseGrid
+from .views import GridView, GridLoc, GridIat, TransposedView
+from .store import GridStore
@@ -0,0 +1,112 @@
+"""
+Compact binary format for grids, see ConfigGrid.save_binary and ConfigGrid.load_binary
+
+Layout:
+
+    MAGIC                   8 bytes
+    header length           8 bytes, little endian unsigned
+    header                  utf-8 JSON, containing the title, default, headings, and for each column its kind and the
+                            offset/ length of its block
+    column blocks           each starting on an 8 byte boundary
+
+Columns of ints are stored as int64 ("q") blocks, columns of floats as float64 ("d") blocks, both in the byte order of
+the machine that saved them. Anything else is stored as a JSON list.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+
+MAGIC = b"CGRDBIN1"
+VERSION = 1
+ALIGNMENT = 8
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def column_kind(values):
+    """
+    Typecode of the block a column of values will be stored in, "q", "d" or "json"
+    """
+    if values and all(type(value) is int for value in values):
+        if INT64_RANGE[0] <= min(values) and max(values) <= INT64_RANGE[1]:
+            return "q"
+    elif values and all(type(value) is float for value in values):
+        return "d"
+    return "json"
+
+
+def _padding(position):
+    return -position % ALIGNMENT
+
+
+def save_binary(grid, path):
+    """
+    See ConfigGrid.save_binary
+    """
+    blocks = []
+    specs = []
+    offset = 0
+    for col in grid.cols:
+        values = list(col)
+        kind = column_kind(values)
+        if kind == "json":
+            block = json.dumps(values).encode("utf-8")
+        else:
+            block = array(kind, values).tobytes()
+        specs.append({"kind": kind, "offset": offset, "length": len(block)})
+        blocks.append(block)
+        offset += len(block) + _padding(len(block))
+    header = json.dumps({"version": VERSION,
+                         "byteorder": sys.byteorder,
+                         "title": grid.title,
+                         "default": grid.default,
+                         "row_hds": list(grid.row_hds),
+                         "col_hds": list(grid.col_hds),
+                         "columns": specs}).encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header)))
+        file.write(header)
+        written = len(MAGIC) + 8 + len(header)
+        file.write(b"\0" * _padding(written))
+        for block in blocks:
+            file.write(block)
+            file.write(b"\0" * _padding(len(block)))
+
+
+def load_binary(grid_cls, path):
+    """
+    See ConfigGrid.load_binary
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    if mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        raise ValueError("{} is not a config_grid binary file".format(path))
+    header_length, = struct.unpack("<Q", mapped[len(MAGIC):len(MAGIC) + 8])
+    start = len(MAGIC) + 8
+    header = json.loads(mapped[start:start + header_length].decode("utf-8"))
+    if header["version"] > VERSION:
+        raise ValueError("{} was saved by a newer version of config_grid".format(path))
+    start += header_length
+    start += _padding(start)
+
+    view = memoryview(mapped)
+    columns = []
+    for spec in header["columns"]:
+        block = view[start + spec["offset"]:start + spec["offset"] + spec["length"]]
+        if spec["kind"] == "json":
+            columns.append(json.loads(bytes(block).decode("utf-8")))
+        elif header["byteorder"] != sys.byteorder:
+            column = array(spec["kind"], bytes(block))
+            column.byteswap()
+            columns.append(column.tolist())
+        else:
+            columns.append(block.cast(spec["kind"]))
+
+    obj = grid_cls(header["row_hds"], header["col_hds"], header["title"], header["default"])
+    obj.path = path
+    obj._load_columns(columns)
+    return obj
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def _freeze(value):
+    """
+    Hashable version of the keyword arguments given to ConfigGrid.load, so they can form part of a cache key.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class GridCache:
+    """
+    Size bounded LRU cache of parsed grids, used by ConfigGrid.load.
+
+    Entries are keyed by the grid class, the path and the arguments used to load it. Each entry remembers the mtime and
+    size of the file (and optionally a hash of its contents) when it was loaded, and is reloaded automatically if the
+    file has changed since.
+
+    Callers are always handed their own grid, so changes they make can't affect anyone else. The cached grid's values
+    are only copied into it as they're used (see ConfigGrid._lazy_copy), so a hit costs little more than copying the
+    headings.
+
+    Hit, miss, eviction and invalidation counts are available from stats() e.g.
+
+        cache = GridCache(maxsize=64)
+        grid = ConfigGrid.load("grid.csv", cache=cache)
+        cache.stats() -> {"hits": 0, "misses": 1, "evictions": 0, "invalidations": 0, "size": 1, "maxsize": 64}
+    """
+
+    def __init__(self, maxsize=32, hash_contents=False):
+        """
+        :param maxsize: maximum number of grids to keep
+        :param hash_contents: also compare a hash of the file's contents, catching changes that keep the same mtime
+            and size, at the cost of reading the file on every lookup
+        """
+        self.maxsize = maxsize
+        self.hash_contents = hash_contents
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _stamp(self, path):
+        stat = os.stat(path)
+        digest = None
+        if self.hash_contents:
+            with open(path, "rb") as file:
+                digest = hashlib.sha256(file.read()).hexdigest()
+        return stat.st_mtime_ns, stat.st_size, digest
+
+    def get(self, grid_cls, path, loader, **kwargs):
+        """
+        Fetch a new grid with the contents of the file at path, calling loader(path, **kwargs) to parse it if there's no valid cached grid.
+        """
+        key = (grid_cls, os.path.abspath(path), _freeze(kwargs))
+        stamp = self._stamp(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == stamp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]._lazy_copy()
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+        grid = loader(path, **kwargs)
+        with self._lock:
+            self._entries[key] = (stamp, grid)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return grid._lazy_copy()
+
+    def invalidate(self, path=None):
+        """
+        Drop the cached grids loaded from path, or every cached grid if path is None
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(path)
+            for key in [key for key in self._entries if key[1] == path]:
+                del self._entries[key]
+
+    def stats(self):
+        """
+        dict of the cache's hit/ miss/ eviction/ invalidation counts and its current and maximum size
+        """
+        with self._lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "evictions": self.evictions,
+                    "invalidations": self.invalidations,
+                    "size": len(self._entries),
+                    "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+default_cache = GridCache()
@@ -0,0 +1,67 @@
+from .utilities import GridListener, Patch
+
+
+class ChangeTracker(GridListener):
+    """
+    Records which cells and headings of a grid have changed since tracking started (or since the last reset), see
+    ConfigGrid.track_changes
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the changes recorded so far, e.g. once they've been saved or sent on
+        """
+        self.rows = {}
+        self.cols = {}
+        self.cells = {}
+        self.title = self.grid.title
+
+    def stop(self):
+        """
+        Stop tracking changes to the grid
+        """
+        self.grid.remove_listener(self)
+
+    @property
+    def dirty(self):
+        """
+        True if anything has changed
+        """
+        return bool(self.rows or self.cols or self.cells or self.title != self.grid.title)
+
+    def cell_set(self, grid, row, col, old, new):
+        self.cells[row, col] = None
+
+    def row_added(self, grid, row):
+        self.rows[row] = None
+
+    def col_added(self, grid, col):
+        self.cols[col] = None
+
+    def patch(self):
+        """
+        Patch of the changes made, that will bring a copy of the grid from before them up to date, see
+        ConfigGrid.apply_patch
+        """
+        grid = self.grid
+        rows = list(self.rows)
+        cols = list(self.cols)
+        cells = []
+        for row_heading in rows:
+            cells.extend((row_heading, col_heading, value) for col_heading, value in zip(grid.col_hds,
+                                                                                        grid.row(row_heading)))
+        new_rows = self.rows
+        for col_heading in cols:
+            cells.extend((row_heading, col_heading, value) for row_heading, value in zip(grid.row_hds,
+                                                                                        grid.col(col_heading))
+                         if row_heading not in new_rows)
+        new_cols = self.cols
+        cells.extend((row_heading, col_heading, grid[row_heading][col_heading])
+                     for row_heading, col_heading in self.cells
+                     if row_heading not in new_rows and col_heading not in new_cols)
+        title = grid.title if grid.title != self.title else None
+        return Patch(rows, cols, cells, title)
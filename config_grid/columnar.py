@@ -0,0 +1,396 @@
+import sys
+from operator import itemgetter
+
+from . import ConfigGrid
+from .utilities import Cell, UniqueList
+
+# The only type of value each kind of memoryview column made by load_binary can hold unchanged, writing e.g. 3 into a
+# "d" column would silently store 3.0
+_FORMAT_TYPES = {"q": int, "d": float}
+
+
+def _picker(slots):
+    """
+    Returns a function that pulls the values at slots out of a column, in order, at C speed.
+    """
+    if not slots:
+        return lambda column: ()
+    if len(slots) == 1:
+        slot = slots[0]
+        return lambda column: (column[slot],)
+    if slots == list(range(len(slots))):
+        return lambda column: column
+    return itemgetter(*slots)
+
+
+class ColumnarRow:
+    """
+    Helper class for ColumnarGrid
+
+    Lightweight view onto a single row of a ColumnarGrid. Stands in for the LineDict rows of a ConfigGrid, so
+    grid[row][col] reads and writes straight through to the column arrays.
+
+    As with LineDict, DIRECT ITERATION ITERATES OVER CONTENTS NOT KEYS.
+    """
+    __slots__ = ("_grid", "_slot", "_heading")
+
+    def __init__(self, grid, slot, heading):
+        self._grid = grid
+        self._slot = slot
+        self._heading = heading
+
+    @property
+    def headings(self):
+        return self._grid.col_hds
+
+    @property
+    def default(self):
+        return self._grid.default
+
+    def _col_slot(self, key):
+        try:
+            return self._grid._col_slots[key]
+        except KeyError:
+            raise KeyError("{} not found in row/ column headings: {}".format(key, self.headings)) from None
+
+    def __getitem__(self, key):
+        return self._grid._columns[self._col_slot(key)][self._slot]
+
+    def __setitem__(self, key, value):
+        grid = self._grid
+        col_slot = self._col_slot(key)
+        if not grid._listeners:
+            grid._set_cell(col_slot, self._slot, value)
+            return
+        old = grid._columns[col_slot][self._slot]
+        grid._set_cell(col_slot, self._slot, value)
+        grid._cell_set(self._heading, key, old, value)
+
+    def __iter__(self):
+        return map(itemgetter(self._slot), self._grid._ordered_columns())
+
+    def __len__(self):
+        return len(self._grid.col_hds)
+
+    def __contains__(self, key):
+        return key in self._grid._col_slots
+
+    def get(self, key, d=None):
+        if key in self._grid._col_slots:
+            return self[key]
+        return d
+
+    def keys(self):
+        return self.headings
+
+    def items(self):
+        return zip(self.headings, iter(self))
+
+    def values(self):
+        return iter(self)
+
+    def __repr__(self):
+        return "ColumnarRow {{{}}}".format(", ".join("{}: {}".format(key, value) for key, value in self.items()))
+
+
+class ColumnarGrid(ConfigGrid):
+    """
+    ConfigGrid that stores its cells column by column.
+
+    Each column is a plain list, indexed by the slot each row heading was given when it was added. Rows are served as
+    ColumnarRow views, so the grid["Row 1"]["Col 2"] style of access, row(), col(), rows, cols and cells all work as they
+    do for ConfigGrid, but column scans and whole grid iteration run at list speed and no dict is kept per row.
+
+    Reordering the headings (swap_rows, swap_cols, sorting row_hds/ col_hds) doesn't move any cell data, the slots
+    simply no longer follow the heading order.
+
+        grid = ColumnarGrid.from_lines(lines)
+        total = sum(grid.col("Mon"))
+    """
+
+    _row_cls = ColumnarRow
+
+    def __init__(self, row_hds, col_hds, title="", default=""):
+        """
+        Initialisation for a blank ColumnarGrid, see ConfigGrid.__init__ for the parameters.
+
+        Creates one list per column, each filled with default.
+        """
+        self.title = title
+        self.default = default
+        self.path = ""
+        self.row_hds = UniqueList(row_hds)
+        self.col_hds = UniqueList(col_hds)
+        self._row_slots = dict(zip(self.row_hds, range(len(self.row_hds))))
+        self._col_slots = dict(zip(self.col_hds, range(len(self.col_hds))))
+        self._columns = [[default] * len(self.row_hds) for _ in self.col_hds]
+
+    def _load_rows(self, rows):
+        """
+        As ConfigGrid._load_rows, transposes the rows straight into the column lists.
+        """
+        width = len(self.col_hds)
+        if not rows:
+            return
+        if any(len(values) != width for values in rows):
+            default = self.default
+            rows = [list(values) + [default] * (width - len(values)) for values in rows]
+        self._columns = [list(column) for column in zip(*rows)]
+
+    def _load_columns(self, columns):
+        """
+        As ConfigGrid._load_columns, adopts the columns as they are. These may be any sequence that supports item
+        assignment, e.g. the memoryviews made by load_binary. They are swapped for lists once they need to grow, or
+        are given a value they can't hold.
+        """
+        self._columns = columns
+
+    def _list_column(self, slot):
+        """
+        The column at slot, first converting it to a list if it isn't one already.
+        """
+        column = self._columns[slot]
+        if not isinstance(column, list):
+            column = self._columns[slot] = list(column)
+        return column
+
+    def _set_cell(self, col_slot, row_slot, value):
+        column = self._columns[col_slot]
+        if not isinstance(column, list):
+            if type(value) is not _FORMAT_TYPES.get(getattr(column, "format", None)):
+                column = self._list_column(col_slot)
+            else:
+                try:
+                    column[row_slot] = value
+                    return
+                except (ValueError, TypeError):  # int out of the range of the column, or a read only column
+                    column = self._list_column(col_slot)
+        column[row_slot] = value
+
+    def __getstate__(self):
+        """
+        As ConfigGrid.__getstate__, columns memory mapped by load_binary are pickled as lists
+        """
+        state = super().__getstate__()
+        state["_columns"] = [column if isinstance(column, list) else list(column) for column in self._columns]
+        return state
+
+    def copy(self):
+        """
+        As ConfigGrid.copy
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        new._row_slots = dict(self._row_slots)
+        new._col_slots = dict(self._col_slots)
+        new._columns = [list(column) for column in self._columns]
+        return new
+
+    def _lazy_copy(self):
+        """
+        As ConfigGrid._lazy_copy, columns memory mapped by load_binary are shared read only, and only copied into a list
+        once they're written to
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        new._row_slots = dict(self._row_slots)
+        new._col_slots = dict(self._col_slots)
+        new._columns = [list(column) if isinstance(column, list) else column.toreadonly() for column in self._columns]
+        return new
+
+    def _adopt_headings(self, row_hds, col_hds):
+        """
+        As ConfigGrid._adopt_headings
+        """
+        self._row_slots = {row_heading: self._row_slots[row_heading] for row_heading in row_hds}
+        self._col_slots = {col_heading: self._col_slots[col_heading] for col_heading in col_hds}
+        self.row_hds = row_hds
+        self.col_hds = col_hds
+
+    def _nbytes(self):
+        """
+        As ConfigGrid._nbytes
+        """
+        getsizeof = sys.getsizeof
+        total = getsizeof(self._row_slots) + getsizeof(self._col_slots) + getsizeof(self._columns)
+        for column in self._columns:
+            if isinstance(column, list):
+                total += getsizeof(column) + sum(map(getsizeof, column))
+            else:
+                total += column.nbytes
+        return total
+
+    def _watch_rows(self, watch):
+        """
+        ColumnarRow reports writes itself, whenever the grid has listeners
+        """
+
+    def _row_slot(self, row_hd):
+        try:
+            return self._row_slots[row_hd]
+        except KeyError:
+            raise KeyError("{} not found in row/ column headings: {}".format(row_hd, self.row_hds)) from None
+
+    def _col_slot(self, col_hd):
+        try:
+            return self._col_slots[col_hd]
+        except KeyError:
+            raise KeyError("{} not found in row/ column headings: {}".format(col_hd, self.col_hds)) from None
+
+    def _ordered_columns(self):
+        """
+        The column lists, in the order of col_hds
+        """
+        columns = self._columns
+        return [columns[slot] for slot in map(self._col_slots.__getitem__, self.col_hds)]
+
+    def _row_picker(self):
+        """
+        Function that takes a column list and returns its values in the order of row_hds
+        """
+        return _picker(list(map(self._row_slots.__getitem__, self.row_hds)))
+
+    def __getitem__(self, row_hd):
+        """
+        As ConfigGrid.__getitem__, but returns a ColumnarRow view onto the row rather than a LineDict
+        """
+        return self._row_cls(self, self._row_slot(row_hd), row_hd)
+
+    def __setitem__(self, row_heading, value):
+        """
+        Replace the contents of a whole row from a mapping of col heading -> value, e.g. another row of a grid.
+        """
+        self.set_row(row_heading, (value[col_heading] for col_heading in self.col_hds))
+
+    @property
+    def rows(self):
+        """
+        As ConfigGrid.rows
+        """
+        columns = self._ordered_columns()
+        for slot in map(self._row_slots.__getitem__, self.row_hds):
+            yield map(itemgetter(slot), columns)
+
+    @property
+    def cols(self):
+        """
+        As ConfigGrid.cols
+        """
+        picker = self._row_picker()
+        for column in self._ordered_columns():
+            yield iter(picker(column))
+
+    @property
+    def cells(self):
+        """
+        As ConfigGrid.cells
+        """
+        columns = self._ordered_columns()
+        col_hds = self.col_hds
+        for row_heading in self.row_hds:
+            slot = self._row_slots[row_heading]
+            for column_heading, column in zip(col_hds, columns):
+                yield Cell(row=row_heading, col=column_heading, value=column[slot])
+
+    def _get_cell(self, row_heading, col_heading):
+        return self._columns[self._col_slots[col_heading]][self._row_slots[row_heading]]
+
+    def col(self, col):
+        """
+        As ConfigGrid.col
+        """
+        return iter(self._row_picker()(self._columns[self._col_slot(col)]))
+
+    def row(self, row):
+        """
+        As ConfigGrid.row
+        """
+        return map(itemgetter(self._row_slot(row)), self._ordered_columns())
+
+    def append_col(self, col_heading, col):
+        """
+        As ConfigGrid.append_col
+        """
+        col = tuple(col)
+        if not len(self.row_hds) == len(col):
+            raise IndexError("Different number of incoming values, to rows to fill")
+        self.col_hds.append(col_heading)
+        column = [self.default] * len(self._row_slots)
+        for slot, value in zip(map(self._row_slots.__getitem__, self.row_hds), col):
+            column[slot] = value
+        self._col_slots[col_heading] = len(self._columns)
+        self._columns.append(column)
+        if self._listeners:
+            self._headings_added((), (col_heading,))
+
+    def append_row(self, row_hd, row):
+        """
+        As ConfigGrid.append_row
+        """
+        row = tuple(row)
+        if not len(self.col_hds) == len(row):
+            raise IndexError("Different number of incoming values, to cols to fill")
+        self.row_hds.append(row_hd)
+        self._row_slots[row_hd] = len(self._row_slots)
+        for slot, value in zip(map(self._col_slots.__getitem__, self.col_hds), row):
+            self._list_column(slot).append(value)
+        if self._listeners:
+            self._headings_added((row_hd,), ())
+
+    def _grow(self, new_rows, new_cols):
+        """
+        As ConfigGrid._grow
+        """
+        self.col_hds.extend(new_cols)
+        self.row_hds.extend(new_rows)
+        if new_rows:
+            padding = [self.default] * len(new_rows)
+            for row_heading in new_rows:
+                self._row_slots[row_heading] = len(self._row_slots)
+            for slot in range(len(self._columns)):
+                self._list_column(slot).extend(padding)
+        for col_heading in new_cols:
+            self._col_slots[col_heading] = len(self._columns)
+            self._columns.append([self.default] * len(self._row_slots))
+        if self._listeners:
+            self._headings_added(new_rows, new_cols)
+
+    def set_row(self, row_heading, values):
+        """
+        As ConfigGrid.set_row
+        """
+        slot = self._row_slot(row_heading)
+        values = tuple(values)
+        if not len(self.col_hds) == len(values):
+            raise IndexError("Different number of incoming values, to cols to fill")
+        if self._listeners:
+            old = tuple(self.row(row_heading))
+        for col_slot, new_val in zip(map(self._col_slots.__getitem__, self.col_hds), values):
+            self._set_cell(col_slot, slot, new_val)
+        if self._listeners:
+            for col_heading, old_val, new_val in zip(self.col_hds, old, values):
+                self._cell_set(row_heading, col_heading, old_val, new_val)
+
+    def set_col(self, col_hd, values):
+        """
+        As ConfigGrid.set_col
+        """
+        col_slot = self._col_slot(col_hd)
+        values = tuple(values)
+        if not len(self.row_hds) == len(values):
+            raise IndexError("Different number of incoming values, to rows to fill")
+        if self._listeners:
+            old = tuple(self.col(col_hd))
+        column = self._columns[col_slot]
+        slots = map(self._row_slots.__getitem__, self.row_hds)
+        if isinstance(column, list):
+            for slot, new_val in zip(slots, values):
+                column[slot] = new_val
+        else:
+            for slot, new_val in zip(slots, values):
+                self._set_cell(col_slot, slot, new_val)
+        if self._listeners:
+            for row_heading, old_val, new_val in zip(self.row_hds, old, values):
+                self._cell_set(row_heading, col_hd, old_val, new_val)
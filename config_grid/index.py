@@ -0,0 +1,67 @@
+from .utilities import GridListener
+
+
+class ValueIndex(GridListener):
+    """
+    Inverted index of a grid, value -> set of the (row, col) of the cells that hold it, see ConfigGrid.index_values
+
+    Built with a single pass over the grid, then kept up to date as a listener. Values are looked up as dict keys, so
+    values that compare equal (e.g. 1, 1.0 and True) are found together, and unhashable values (e.g. lists) aren't
+    indexed.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.positions = {}
+        for row_heading, row in zip(grid.row_hds, grid.rows):
+            for col_heading, value in zip(grid.col_hds, row):
+                self._add(value, row_heading, col_heading)
+
+    def _add(self, value, row, col):
+        try:
+            cells = self.positions.get(value)
+        except TypeError:
+            return
+        if cells is None:
+            cells = self.positions[value] = set()
+        cells.add((row, col))
+
+    def _discard(self, value, row, col):
+        try:
+            cells = self.positions.get(value)
+        except TypeError:
+            return
+        if cells is not None:
+            cells.discard((row, col))
+            if not cells:
+                del self.positions[value]
+
+    def where(self, value):
+        """
+        Set of the (row, col) of each cell holding value
+        """
+        return set(self.positions.get(value, ()))
+
+    def rows_with(self, value):
+        """
+        Set of the row headings of the rows that contain value
+        """
+        return {row for row, col in self.positions.get(value, ())}
+
+    def cols_with(self, value):
+        """
+        Set of the col headings of the cols that contain value
+        """
+        return {col for row, col in self.positions.get(value, ())}
+
+    def cell_set(self, grid, row, col, old, new):
+        self._discard(old, row, col)
+        self._add(new, row, col)
+
+    def row_added(self, grid, row):
+        for col_heading, value in zip(grid.col_hds, grid.row(row)):
+            self._add(value, row, col_heading)
+
+    def col_added(self, grid, col):
+        for row_heading, value in zip(grid.row_hds, grid.col(col)):
+            self._add(value, row_heading, col)
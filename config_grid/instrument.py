@@ -0,0 +1,251 @@
+"""
+Opt-in instrumentation of ConfigGrid, see Instrumentation
+"""
+import threading
+import time
+from functools import wraps
+
+from .utilities import LineDict, SparseLineDict
+
+
+_active = None
+_lock = threading.Lock()
+
+
+class _NullPhase:
+    """
+    Stands in for a phase while instrumentation is disabled
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Records how many times, and for how long in total, each phase of loading, saving and combining grids runs, along
+    with the number of cells read and written, while it's enabled e.g.
+
+        with Instrumentation() as stats:
+            with open("grid.csv") as grid_file:
+                grid = ConfigGrid.from_csv_file(grid_file)
+        stats.as_dict() -> {"phases": {"from_csv_file": {"count": 1, "seconds": 0.02},
+                                       "from_csv_file.sniff": {...},
+                                       "from_lines.parse": {...}, ...},
+                            "cell_reads": 0,
+                            "cell_writes": 0}
+
+    Or enable it for the whole process with enable(), and fetch it again with active().
+
+    The phases recorded are:
+
+        from_csv_file, from_csv_file.sniff, from_lines, from_lines.parse (reading lines, which for from_csv_file
+        includes the csv parsing, and checking the headings), from_lines.headings (building the grid's headings),
+        from_lines.convert (converters and preprocess_value), from_lines.load (filling storage), save_to_file, combine
+        and render (which includes repr)
+
+    Nested phases are included in the time of the phase around them, so from_csv_file includes from_lines.
+
+    Cells are counted as they're read or written through a row e.g. grid["Row 1"]["Col 2"]. Bulk operations that
+    bypass rows, like loading or iterating over a ColumnarGrid, aren't counted.
+
+    Instrumentation is process wide: while one is enabled it records every grid, in every thread, not only the grids
+    used inside its with block. Counts from several threads at once aren't locked, so may be slightly low.
+
+    Only one Instrumentation is enabled at a time. When none is, phases cost a single global lookup, and cell access
+    isn't touched at all: the counting versions of the row __getitem__/__setitem__ methods are patched into the row
+    classes only while cells are being counted.
+    """
+
+    def __init__(self, count_cells=True):
+        """
+        :param count_cells: count cell reads/ writes. This slows cell access down while enabled, so can be turned off
+            if only the phase timings are wanted
+        """
+        self.count_cells = count_cells
+        self._previous = None
+        self._patched = []
+        self.reset()
+
+    def reset(self):
+        """
+        Zero all counts and timings
+        """
+        self.phases = {}
+        self.cell_reads = 0
+        self.cell_writes = 0
+
+    def record(self, name, seconds):
+        """
+        Add a run of the phase name, that took seconds
+        """
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = {"count": 0, "seconds": 0.0}
+        phase["count"] += 1
+        phase["seconds"] += seconds
+
+    def phase(self, name):
+        """
+        Context manager, recording the time spent inside it as a run of the phase name
+        """
+        return _Phase(self, name)
+
+    def as_dict(self):
+        """
+        Plain dict of the recorded stats, ready to be serialised e.g. as JSON
+        """
+        return {"phases": {name: dict(phase) for name, phase in self.phases.items()},
+                "cell_reads": self.cell_reads,
+                "cell_writes": self.cell_writes}
+
+    def _patch(self):
+        from .columnar import ColumnarRow
+        from .numeric import NumericRow
+
+        def read_line(line, key, _getitem=LineDict.__getitem__):
+            value = _getitem(line, key)
+            if not isinstance(value, LineDict):  # a row being looked up from the grid's LineDict of rows
+                self.cell_reads += 1
+            return value
+
+        def write_line(line, key, value, _setitem=LineDict.__setitem__):
+            _setitem(line, key, value)
+            if not isinstance(value, LineDict):
+                self.cell_writes += 1
+
+        def write_sparse_line(line, key, value, _setitem=SparseLineDict.__setitem__):
+            _setitem(line, key, value)
+            self.cell_writes += 1
+
+        def counting_reads(_getitem):
+            def read_row(row, key):
+                self.cell_reads += 1
+                return _getitem(row, key)
+            return read_row
+
+        def counting_writes(_setitem):
+            def write_row(row, key, value):
+                _setitem(row, key, value)
+                self.cell_writes += 1
+            return write_row
+
+        for cls, name, counting in ((LineDict, "__getitem__", read_line), (LineDict, "__setitem__", write_line),
+                                    (SparseLineDict, "__setitem__", write_sparse_line),
+                                    (ColumnarRow, "__getitem__", counting_reads(ColumnarRow.__getitem__)),
+                                    (ColumnarRow, "__setitem__", counting_writes(ColumnarRow.__setitem__)),
+                                    (NumericRow, "__getitem__", counting_reads(NumericRow.__getitem__)),
+                                    (NumericRow, "__setitem__", counting_writes(NumericRow.__setitem__))):
+            self._patched.append((cls, name, cls.__dict__.get(name)))
+            setattr(cls, name, counting)
+
+    def _unpatch(self):
+        for cls, name, original in reversed(self._patched):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patched = []
+
+    def __enter__(self):
+        enable(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        disable()
+        return False
+
+
+def enable(instrumentation=None):
+    """
+    Start recording into instrumentation (a new Instrumentation if None), replacing the one currently enabled until
+    disable is called.
+
+    :return: the enabled Instrumentation
+    """
+    global _active
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    with _lock:
+        if _active is not None:
+            _active._unpatch()
+        instrumentation._previous = _active
+        _active = instrumentation
+        if instrumentation.count_cells:
+            instrumentation._patch()
+    return instrumentation
+
+
+def disable():
+    """
+    Stop recording into the enabled Instrumentation, re-enabling the one it replaced, if any.
+
+    :return: the Instrumentation that was enabled, or None
+    """
+    global _active
+    with _lock:
+        instrumentation = _active
+        if instrumentation is None:
+            return None
+        instrumentation._unpatch()
+        _active = instrumentation._previous
+        instrumentation._previous = None
+        if _active is not None and _active.count_cells:
+            _active._patch()
+    return instrumentation
+
+
+def active():
+    """
+    The enabled Instrumentation, or None
+    """
+    return _active
+
+
+def timed(name):
+    """
+    Context manager timing the phase name, if instrumentation is enabled
+    """
+    stats = _active
+    if stats is None:
+        return _NULL_PHASE
+    return stats.phase(name)
+
+
+def instrumented(name):
+    """
+    Decorator timing each call of a method as the phase name, if instrumentation is enabled
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = _active
+            if stats is None:
+                return func(*args, **kwargs)
+            with stats.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,339 @@
+import csv
+import mmap
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from . import ConfigGrid
+from .utilities import COMPRESSION_EXTENSIONS, UniqueList, LineDict
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("LazyCsvGrid is read only, load the file with ConfigGrid.from_csv_file to modify it")
+
+
+class _ReadOnlyLine(LineDict):
+    """
+    Helper class for LazyCsvGrid
+
+    The rows decoded by _LazyRows. A row may be dropped from the cache and decoded again at any time, so writes to it
+    would be lost, instead they raise TypeError. copy() gives a LineDict that can be changed.
+    """
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    update = _read_only
+    setdefault = _read_only
+    append = _read_only
+    pop = _read_only
+    popitem = _read_only
+    clear = _read_only
+
+    def copy(self):
+        new_obj = LineDict(self.headings, self.default)
+        dict.update(new_obj, self)
+        return new_obj
+
+    def __reduce__(self):
+        return self.copy().__reduce__()
+
+
+class _SharedMap:
+    """
+    Helper class for LazyCsvGrid
+
+    The memory map of a file, shared by a LazyCsvGrid and its copies. Each grid holds one reference, the map is only
+    closed once every grid holding it has released its reference.
+    """
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+        self.references = 1
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.references += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self.references -= 1
+            if not self.references:
+                self.mapped.close()
+
+
+class _LazyRows:
+    """
+    Helper class for LazyCsvGrid
+
+    Stands in for the LineDict of rows kept by a ConfigGrid. Looking up a row heading finds the row's byte offsets in
+    the index, decodes just that line of the file and keeps the result in a bounded LRU cache.
+    """
+
+    def __init__(self, grid, shared, encoding, dialect, cache_size):
+        self.grid = grid
+        self.shared = shared
+        self.headings = grid.row_hds
+        self.mapped = shared.mapped
+        self.encoding = encoding
+        self.dialect = dialect
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.slots = {}
+        self.starts = array("q")
+
+    def __getitem__(self, row_hd):
+        cache = self.cache
+        try:
+            line = cache[row_hd]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(row_hd)
+            return line
+        try:
+            slot = self.slots[row_hd]
+        except KeyError:
+            raise KeyError("{} not found in row/ column headings: {}".format(row_hd, self.headings)) from None
+        line = self.decode(row_hd, slot)
+        cache[row_hd] = line
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return line
+
+    def decode(self, row_hd, slot):
+        grid = self.grid
+        text = self.mapped[self.starts[slot]:self.starts[slot + 1]].decode(self.encoding).rstrip("\r\n")
+        _, *values = next(csv.reader((text,), self.dialect))
+        if len(values) > len(grid.col_hds):
+            raise IndexError("Different number of incoming values, to cols to fill")
+        if grid.col_types or grid.row_types:
+            read = len(values)
+            values += [grid.default] * (len(grid.col_hds) - read)
+            columns = grid._convert((row_hd,), [[value] for value in values], grid.col_types, grid.row_types,
+                                    grid._preprocessor(), [read])
+            values = [column[0] for column in columns]
+        else:
+            preprocess_value = grid._preprocessor()
+            if preprocess_value is not None:
+                values = [preprocess_value(row_hd, col_heading, value)
+                          for col_heading, value in zip(grid.col_hds, values)]
+        line = _ReadOnlyLine(grid.col_hds, grid.default)
+        dict.update(line, zip(grid.col_hds, values))
+        return line
+
+
+class LazyCsvGrid(ConfigGrid):
+    """
+    Read only ConfigGrid for csv files that are too large to comfortably load into memory.
+
+    On initialisation the file is memory mapped and scanned once, to find the column headings and to build an index of
+    row heading -> byte offset. Individual rows are only parsed when they are accessed, and the most recently used
+    are kept in a bounded cache, so memory use stays flat however large the file is.
+
+        with open("huge_grid.csv") as grid_file:
+            grid = LazyCsvGrid.from_csv_file(grid_file, cache_size=1024)
+        value = grid["Row 1"]["Col 2"]
+
+    grid[row][col], row(), rows and the other read methods work as for ConfigGrid. rows and row() only parse each line
+    once, whereas col(), cols and cells revisit every line of the file for each column.
+
+    Rows are decoded into read only LineDicts, they and the methods of ConfigGrid that change the grid raise TypeError.
+
+    Quoted fields that span more than one line are not supported.
+    """
+
+    def __init__(self, file, csv_reader_args=None, cache_size=128, col_types=None, row_types=None):
+        """
+        Build the row index of file.
+
+        :param file:
+            file object that contains the grid, opened in either text or binary mode. It must be backed by a real file
+            (have a fileno), and may be closed once the LazyCsvGrid has been created.
+        :param csv_reader_args:
+            dictionary of dialect arguments that will be passed to csv.reader if provided, otherwise the dialect is
+            sniffed as for ConfigGrid.from_csv_file
+        :param cache_size:
+            Number of decoded rows to keep in memory
+        :param col_types: dict of col heading -> converter, applied as each row is decoded, defaults to the col_types
+            class attribute
+        :param row_types: dict of row heading -> converter, as for col_types
+        """
+        if col_types is not None:
+            self.col_types = col_types
+        if row_types is not None:
+            self.row_types = row_types
+        encoding = getattr(file, "encoding", None) or "utf-8"
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if csv_reader_args:
+            dialect = csv.reader((), **csv_reader_args).dialect
+        else:
+            dialect = self._sniff(mapped[:1024].decode(encoding, errors="ignore"))
+
+        lines = self._scan(mapped, encoding, dialect)
+        self.title, *col_headings = lines.__next__()
+        self.default = ""
+        self.path = getattr(file, "name", "")
+        self.col_hds = UniqueList(col_headings)
+        self.row_hds = UniqueList()
+        self._data = _LazyRows(self, _SharedMap(mapped), encoding, dialect, cache_size)
+        slots = self._data.slots
+        starts = self._data.starts
+        for row_heading, start in lines:
+            self.row_hds.append(row_heading)
+            slots[row_heading] = len(starts)
+            starts.append(start)
+        starts.append(len(mapped))
+
+    @staticmethod
+    def _scan(mapped, encoding, dialect):
+        """
+        Generator that yields the parsed header line, followed by (row_heading, start offset) for each line after it.
+
+        Only the row heading is parsed, by a plain split unless the line contains the quote character.
+        """
+        delimiter = dialect.delimiter
+        quotechar = dialect.quotechar or ""
+        size = len(mapped)
+        start = 0
+        header = True
+        while start < size:
+            end = mapped.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            text = mapped[start:end].decode(encoding).rstrip("\r\n")
+            if text:
+                if quotechar and quotechar in text:
+                    if text.count(quotechar) % 2:
+                        raise ValueError("LazyCsvGrid does not support quoted fields that span lines")
+                    fields = next(csv.reader((text,), dialect))
+                else:
+                    fields = text.split(delimiter) if header else text.split(delimiter, 1)
+                if header:
+                    header = False
+                    yield fields
+                else:
+                    yield fields[0], start
+            start = end
+        if header:
+            raise ValueError("Can't create a grid from an empty file")
+
+    @classmethod
+    def from_csv_file(cls, file, csv_reader_args=None, col_types=None, row_types=None, parser=None, cache_size=128):
+        """
+        Alternative constructor, matching ConfigGrid.from_csv_file, see __init__. LazyCsvGrid indexes and decodes the
+        file itself, so parser must be None.
+        """
+        if parser is not None:
+            raise ValueError("LazyCsvGrid parses rows as they're accessed, it doesn't take a parser")
+        return cls(file, csv_reader_args, cache_size, col_types, row_types)
+
+    @classmethod
+    def _load_path(cls, path, **kwargs):
+        """
+        As ConfigGrid._load_path, only uncompressed csv files can be memory mapped
+        """
+        extension = os.path.splitext(os.fspath(path))[1].lower()
+        if extension in COMPRESSION_EXTENSIONS or extension == ".cgrid":
+            raise ValueError("LazyCsvGrid can only load uncompressed csv files, not {}".format(path))
+        return super()._load_path(path, **kwargs)
+
+    @classmethod
+    def from_lines(cls, lines):
+        raise TypeError("LazyCsvGrid can only be created from a file, see from_csv_file")
+
+    def copy(self):
+        """
+        New LazyCsvGrid over the same memory map and row index, with its own cache of decoded rows. Closing a copy
+        (or the original) doesn't affect the others, the map is closed once they have all been closed.
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        rows = self._data
+        new._data = _LazyRows(new, rows.shared.acquire(), rows.encoding, rows.dialect, rows.cache_size)
+        new._data.slots = rows.slots
+        new._data.starts = rows.starts
+        return new
+
+    _lazy_copy = copy
+
+    def _blank(self, row_hds, col_hds):
+        """
+        As ConfigGrid._blank, but a (writable) ConfigGrid
+        """
+        return ConfigGrid(row_hds, col_hds, self.title, self.default)
+
+    def _adopt_headings(self, row_hds, col_hds):
+        """
+        As ConfigGrid._adopt_headings, the cached rows are dropped
+        """
+        rows = self._data
+        rows.slots = {row_heading: rows.slots[row_heading] for row_heading in row_hds}
+        rows.headings = row_hds
+        rows.cache.clear()
+        self.row_hds = row_hds
+        self.col_hds = col_hds
+
+    def _nbytes(self):
+        """
+        As ConfigGrid._nbytes, the size of the row index and the cached rows, the file itself is only mapped
+        """
+        rows = self._data
+        return sys.getsizeof(rows.slots) + sys.getsizeof(rows.starts) + sum(map(sys.getsizeof, rows.cache.values()))
+
+    def close(self):
+        """
+        Release the grid's reference to the memory map of the underlying file, closing it if no copy of the grid still
+        uses it. The grid can't be used afterwards.
+        """
+        rows = self._data
+        rows.cache.clear()
+        if rows.shared is not None:
+            rows.shared.release()
+            rows.shared = rows.mapped = None
+
+    @property
+    def rows(self):
+        """
+        As ConfigGrid.rows, parses each line once
+        """
+        for row_heading in self.row_hds:
+            line = self._data[row_heading]
+            yield (line[col_heading] for col_heading in self.col_hds)
+
+    @property
+    def cols(self):
+        """
+        As ConfigGrid.cols, revisiting every line for each column, so no more than cache_size rows are held at once
+        """
+        for col_heading in self.col_hds:
+            yield self.col(col_heading)
+
+    def row(self, row):
+        """
+        As ConfigGrid.row
+        """
+        line = self._data[row]
+        return (line[col] for col in self.col_hds)
+
+    def _watch_rows(self, watch):
+        """
+        The grid can't be changed, so there's nothing to report
+        """
+
+    __setitem__ = _read_only
+    append_col = _read_only
+    append_row = _read_only
+    set_row = _read_only
+    set_col = _read_only
+    combine = _read_only
+    apply_patch = _read_only
+    swap_rows = _read_only
+    swap_cols = _read_only
+    reorder_rows = _read_only
+    reorder_cols = _read_only
+    sort_rows = _read_only
+    sort_cols = _read_only
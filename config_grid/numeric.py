@@ -0,0 +1,388 @@
+import operator
+import sys
+
+from . import ConfigGrid
+from .columnar import ColumnarGrid, ColumnarRow
+from .reductions import REDUCTIONS
+from .utilities import Cell, UniqueList
+
+
+def _numpy():
+    """
+    numpy is only imported once a NumericGrid is actually used, so config_grid doesn't depend on it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumericGrid requires numpy, install it with `pip install numpy`") from None
+    return numpy
+
+
+class NumericRow(ColumnarRow):
+    """
+    Helper class for NumericGrid
+
+    ColumnarRow that reads and writes the grid's array directly, returning plain python numbers as the rest of
+    NumericGrid does.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return self._grid._values[self._slot, self._col_slot(key)].item()
+
+    def __setitem__(self, key, value):
+        grid = self._grid
+        col_slot = self._col_slot(key)
+        if not grid._listeners:
+            grid._values[self._slot, col_slot] = value
+            return
+        old = grid._values[self._slot, col_slot].item()
+        grid._values[self._slot, col_slot] = value
+        grid._cell_set(self._heading, key, old, value)
+
+    def __iter__(self):
+        return self._grid.row(self._heading)
+
+
+class NumericGrid(ColumnarGrid):
+    """
+    ConfigGrid for grids of numbers, backed by a single 2D numpy array.
+
+    Headings behave exactly as they do for ConfigGrid, and from_lines, from_csv_file and save_to_file all work, but the
+    values live in one ndarray of dtype, giving vectorised reductions and arithmetic e.g.
+
+        with open("times.csv") as grid_file:
+            grid = NumericGrid.from_csv_file(grid_file)
+        grid.sum(axis="col") -> {"Mon": 12.0, "Tues": 9.5, ...}
+        doubled = grid * 2
+        array = grid.to_numpy()
+
+    Arithmetic (+, -, *, /) works elementwise, against either a number or another grid with the same headings, the other
+    grid's cells are matched up by heading. NOTE: this means + doesn't combine NumericGrids, use combine for that.
+
+    Appending a row or column reallocates the array, so build large grids with from_lines or from_csv_file.
+
+    numpy is imported lazily, the first time a NumericGrid is created.
+    """
+
+    dtype = float
+    _row_cls = NumericRow
+
+    def __init__(self, row_hds, col_hds, title="", default=0, dtype=None):
+        """
+        Initialisation for a blank NumericGrid, see ConfigGrid.__init__ for the parameters.
+
+        :param dtype: numpy dtype of the values, by default the dtype class attribute (float)
+        """
+        np = _numpy()
+        self.title = title
+        self.default = default
+        self.path = ""
+        if dtype is not None:
+            self.dtype = dtype
+        self.row_hds = UniqueList(row_hds)
+        self.col_hds = UniqueList(col_hds)
+        self._row_slots = dict(zip(self.row_hds, range(len(self.row_hds))))
+        self._col_slots = dict(zip(self.col_hds, range(len(self.col_hds))))
+        self._values = np.full((len(self.row_hds), len(self.col_hds)), default, dtype=self.dtype)
+
+    @property
+    def _columns(self):
+        return self._values.T
+
+    def __getstate__(self):
+        """
+        As ConfigGrid.__getstate__, the array is pickled as it is
+        """
+        return ConfigGrid.__getstate__(self)
+
+    def _load_rows(self, rows):
+        """
+        As ConfigGrid._load_rows, converts the rows to an array in one go.
+        """
+        width = len(self.col_hds)
+        if any(len(values) != width for values in rows):
+            default = self.default
+            rows = [list(values) + [default] * (width - len(values)) for values in rows]
+        if rows:
+            self._values = _numpy().array(rows, dtype=self.dtype).reshape(len(rows), width)
+
+    def _set_cell(self, col_slot, row_slot, value):
+        self._values[row_slot, col_slot] = value
+
+    def _load_columns(self, columns):
+        """
+        As ConfigGrid._load_columns, converts the columns to an array in one go.
+        """
+        np = _numpy()
+        values = np.array(columns, dtype=self.dtype).reshape(len(self.col_hds), len(self.row_hds))
+        self._values = np.ascontiguousarray(values.T)
+
+    def _order(self, headings, slots):
+        """
+        Positions in the array of headings, or None if they are already in order
+        """
+        order = list(map(slots.__getitem__, headings))
+        if order == list(range(len(order))):
+            return None
+        return order
+
+    def to_numpy(self):
+        """
+        Values of the grid as a 2D array, rows following row_hds and columns following col_hds.
+
+        If the headings haven't been reordered (e.g. by swap_rows or sorting), this is the underlying array itself, not a
+        copy, so changes to it change the grid.
+        """
+        values = self._values
+        row_order = self._order(self.row_hds, self._row_slots)
+        col_order = self._order(self.col_hds, self._col_slots)
+        if row_order is not None:
+            values = values[row_order]
+        if col_order is not None:
+            values = values[:, col_order]
+        return values
+
+    def _aligned(self, other):
+        """
+        Values of other as an array that lines up with self._values, other may be a NumericGrid or a number.
+        """
+        if not isinstance(other, NumericGrid):
+            return other
+        if self._row_slots == other._row_slots and self._col_slots == other._col_slots:
+            return other._values
+        if set(self.row_hds) != set(other.row_hds) or set(self.col_hds) != set(other.col_hds):
+            raise KeyError("Both grids must have the same row and column headings")
+        rows = sorted(self._row_slots, key=self._row_slots.__getitem__)
+        cols = sorted(self._col_slots, key=self._col_slots.__getitem__)
+        return other._values[_numpy().ix_([other._row_slots[heading] for heading in rows],
+                                          [other._col_slots[heading] for heading in cols])]
+
+    def _elementwise(self, other, op):
+        return self._copy_with(op(self._values, self._aligned(other)))
+
+    def copy(self):
+        """
+        As ConfigGrid.copy
+        """
+        return self._copy_with(self._values.copy())
+
+    def _lazy_copy(self):
+        """
+        As ConfigGrid._lazy_copy, copying the array is a single memcpy, so this is simply copy
+        """
+        return self.copy()
+
+    def _nbytes(self):
+        """
+        As ConfigGrid._nbytes
+        """
+        return sys.getsizeof(self._row_slots) + sys.getsizeof(self._col_slots) + self._values.nbytes
+
+    def _blank(self, row_hds, col_hds):
+        """
+        As ConfigGrid._blank, keeping the dtype
+        """
+        return self.__class__(row_hds, col_hds, self.title, self.default, self.dtype)
+
+    def _copy_with(self, values):
+        """
+        Copy of the grid, with values in place of its array
+        """
+        new = self._shallow_copy()
+        new.row_hds = UniqueList(self.row_hds)
+        new.col_hds = UniqueList(self.col_hds)
+        new._row_slots = dict(self._row_slots)
+        new._col_slots = dict(self._col_slots)
+        new._values = values
+        return new
+
+    def __add__(self, other):
+        return self._elementwise(other, operator.add)
+
+    def __sub__(self, other):
+        return self._elementwise(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._elementwise(other, operator.mul)
+
+    def __truediv__(self, other):
+        return self._elementwise(other, operator.truediv)
+
+    def __radd__(self, other):
+        return self._elementwise(other, lambda a, b: b + a)
+
+    def __rsub__(self, other):
+        return self._elementwise(other, lambda a, b: b - a)
+
+    def __rmul__(self, other):
+        return self._elementwise(other, lambda a, b: b * a)
+
+    def __rtruediv__(self, other):
+        return self._elementwise(other, lambda a, b: b / a)
+
+    def __neg__(self):
+        return self._elementwise(None, lambda a, b: -a)
+
+    def _reduce(self, name, axis):
+        """
+        Apply the numpy reduction name across the grid.
+
+        :param axis: "row" for one result per row, "col" for one per column
+        :return: dict of heading -> result, in heading order
+        """
+        if axis == "row":
+            headings, np_axis = self.row_hds, 1
+        elif axis == "col":
+            headings, np_axis = self.col_hds, 0
+        else:
+            raise ValueError("axis must be 'row' or 'col', not {}".format(axis))
+        values = self.to_numpy()
+        if not values.size:
+            # numpy can't take the min/ max of nothing, give what reduce does for an empty row or column
+            reduction = REDUCTIONS[name]
+            return {heading: reduction([], self.default) for heading in headings}
+        results = getattr(_numpy(), name)(values, axis=np_axis)
+        return dict(zip(headings, results.tolist()))
+
+    def _reduce_all(self, axis, func):
+        """
+        As ConfigGrid._reduce_all, computed with numpy
+        """
+        values = self.to_numpy()
+        if not values.size or func not in ("sum", "min", "max", "mean", "count"):
+            return None
+        np = _numpy()
+        np_axis = 1 if axis == "row" else 0
+        if func == "count":
+            results = np.count_nonzero(values != self.default, axis=np_axis)
+        else:
+            results = getattr(np, func)(values, axis=np_axis)
+        return results.tolist()
+
+    def sum(self, axis="col"):
+        """
+        Total of each row (axis="row") or column (axis="col"), as a dict of heading -> total
+        """
+        return self._reduce("sum", axis)
+
+    def mean(self, axis="col"):
+        """
+        As sum, but the mean of each row or column
+        """
+        return self._reduce("mean", axis)
+
+    def min(self, axis="col"):
+        """
+        As sum, but the smallest value of each row or column
+        """
+        return self._reduce("min", axis)
+
+    def max(self, axis="col"):
+        """
+        As sum, but the largest value of each row or column
+        """
+        return self._reduce("max", axis)
+
+    @property
+    def rows(self):
+        """
+        As ConfigGrid.rows, yields plain python numbers
+        """
+        for row in self.to_numpy().tolist():
+            yield iter(row)
+
+    @property
+    def cols(self):
+        """
+        As ConfigGrid.cols, yields plain python numbers
+        """
+        for col in self.to_numpy().T.tolist():
+            yield iter(col)
+
+    @property
+    def cells(self):
+        """
+        As ConfigGrid.cells, with plain python numbers as values
+        """
+        col_hds = self.col_hds
+        for row_heading, row in zip(self.row_hds, self.to_numpy().tolist()):
+            for column_heading, value in zip(col_hds, row):
+                yield Cell(row=row_heading, col=column_heading, value=value)
+
+    def iter_values(self):
+        """
+        As ConfigGrid.iter_values, yields plain python numbers
+        """
+        return iter(self.to_numpy().ravel().tolist())
+
+    def to_lists(self):
+        """
+        As ConfigGrid.to_lists, converted from the array in one go, to plain python numbers
+        """
+        return self.to_numpy().tolist()
+
+    def _get_cell(self, row_heading, col_heading):
+        return self._values[self._row_slots[row_heading], self._col_slots[col_heading]].item()
+
+    def row(self, row):
+        """
+        As ConfigGrid.row, yields plain python numbers
+        """
+        return iter(self._values[self._row_slot(row)][[self._col_slots[heading] for heading in self.col_hds]].tolist())
+
+    def col(self, col):
+        """
+        As ConfigGrid.col, yields plain python numbers
+        """
+        column = self._values[:, self._col_slot(col)]
+        return iter(column[[self._row_slots[heading] for heading in self.row_hds]].tolist())
+
+    def _grow(self, new_rows, new_cols):
+        """
+        As ConfigGrid._grow, NOTE: reallocates the array
+        """
+        self.col_hds.extend(new_cols)
+        self.row_hds.extend(new_rows)
+        for row_heading in new_rows:
+            self._row_slots[row_heading] = len(self._row_slots)
+        for col_heading in new_cols:
+            self._col_slots[col_heading] = len(self._col_slots)
+        rows, cols = self._values.shape
+        values = _numpy().full((len(self._row_slots), len(self._col_slots)), self.default, dtype=self.dtype)
+        values[:rows, :cols] = self._values
+        self._values = values
+        if self._listeners:
+            self._headings_added(new_rows, new_cols)
+
+    def append_col(self, col_heading, col):
+        """
+        As ConfigGrid.append_col, NOTE: reallocates the array
+        """
+        np = _numpy()
+        col = tuple(col)
+        if not len(self.row_hds) == len(col):
+            raise IndexError("Different number of incoming values, to rows to fill")
+        self.col_hds.append(col_heading)
+        column = np.full((len(self._row_slots), 1), self.default, dtype=self.dtype)
+        column[[self._row_slots[heading] for heading in self.row_hds], 0] = col
+        self._col_slots[col_heading] = self._values.shape[1]
+        self._values = np.hstack((self._values, column))
+        if self._listeners:
+            self._headings_added((), (col_heading,))
+
+    def append_row(self, row_hd, row):
+        """
+        As ConfigGrid.append_row, NOTE: reallocates the array
+        """
+        np = _numpy()
+        row = tuple(row)
+        if not len(self.col_hds) == len(row):
+            raise IndexError("Different number of incoming values, to cols to fill")
+        self.row_hds.append(row_hd)
+        new_row = np.full((1, len(self._col_slots)), self.default, dtype=self.dtype)
+        new_row[0, [self._col_slots[heading] for heading in self.col_hds]] = row
+        self._row_slots[row_hd] = self._values.shape[0]
+        self._values = np.vstack((self._values, new_row))
+        if self._listeners:
+            self._headings_added((row_hd,), ())
@@ -0,0 +1,115 @@
+import csv
+import mmap
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .utilities import COMPRESSION_EXTENSIONS, open_grid_file
+
+
+DIALECT_ATTRIBUTES = ("delimiter", "doublequote", "escapechar", "lineterminator", "quotechar", "quoting",
+                      "skipinitialspace", "strict")
+
+
+def dialect_args(dialect):
+    """
+    Picklable dict of the attributes of a csv dialect, sniffed dialects are classes that can't be sent to a worker.
+    """
+    return {name: getattr(dialect, name) for name in DIALECT_ATTRIBUTES if hasattr(dialect, name)}
+
+
+def split_ranges(mapped, start, chunks):
+    """
+    Split mapped[start:] into roughly chunks byte ranges, each ending just after a line break.
+
+    :return: list of (start, end) pairs covering the whole of mapped[start:], in order
+    """
+    size = len(mapped)
+    step = max((size - start) // chunks, 1)
+    ranges = []
+    while start < size:
+        end = mapped.find(b"\n", min(start + step, size - 1))
+        end = size if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def parse_range(path, start, end, encoding, reader_args, grid_cls, title, col_headings, preprocess):
+    """
+    Worker for load_csv_parallel, parses the lines in the byte range start:end of path.
+
+    :param preprocess: apply grid_cls.preprocess_value to each value
+    :return: (row_headings, rows), as returned by ConfigGrid._split_lines
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+    width = len(col_headings)
+    row_headings = []
+    rows = []
+    for row in csv.reader(text.split("\n"), **reader_args):
+        if not row:
+            continue
+        row_heading, *values = row
+        if len(values) > width:
+            raise IndexError("Different number of incoming values, to cols to fill")
+        row_headings.append(row_heading)
+        rows.append(values)
+    if preprocess:
+        preprocess_value = grid_cls([], col_headings, title).preprocess_value
+        rows = [[preprocess_value(row_heading, col_heading, value)
+                 for col_heading, value in zip(col_headings, values)]
+                for row_heading, values in zip(row_headings, rows)]
+    return row_headings, rows
+
+
+def load_csv_parallel(grid_cls, path, workers=None, csv_reader_args=None, col_types=None, row_types=None,
+                      encoding="utf-8", min_size=4 * 1024 * 1024):
+    """
+    See ConfigGrid.from_csv_parallel
+    """
+    def serial():
+        with open_grid_file(path, "r", encoding=encoding) as file:
+            return grid_cls.from_csv_file(file, csv_reader_args, col_types, row_types)
+
+    workers = workers or os.cpu_count() or 1
+    compressed = os.path.splitext(path)[1].lower() in COMPRESSION_EXTENSIONS
+    if workers < 2 or compressed or os.path.getsize(path) < min_size:
+        return serial()
+    try:
+        pickle.dumps(grid_cls)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return serial()
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if csv_reader_args:
+            reader_args = dict(csv_reader_args)
+        else:
+            reader_args = dialect_args(grid_cls._sniff(mapped[:1024].decode(encoding, errors="ignore")))
+        quotechar = reader_args.get("quotechar") or '"'
+        if mapped.find(quotechar.encode(encoding)) != -1:
+            # quoted fields may contain line breaks, so the file can't safely be split on them
+            return serial()
+        header_end = mapped.find(b"\n")
+        if header_end == -1:
+            return serial()
+        ranges = split_ranges(mapped, header_end + 1, workers * 4)
+        header = mapped[:header_end].decode(encoding).rstrip("\r")
+
+    title, *col_headings = next(csv.reader((header,), **reader_args))
+    col_types = grid_cls.col_types if col_types is None else col_types
+    row_types = grid_cls.row_types if row_types is None else row_types
+    preprocess = not (col_types or row_types) and grid_cls([], col_headings, title)._preprocessor() is not None
+    row_headings = []
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_range, path, start, end, encoding, reader_args, grid_cls, title,
+                                   col_headings, preprocess)
+                   for start, end in ranges]
+        for future in futures:
+            chunk_headings, chunk_rows = future.result()
+            row_headings += chunk_headings
+            rows += chunk_rows
+    return grid_cls._from_rows(title, row_headings, col_headings, rows, col_types, row_types,
+                               preprocess=not preprocess)
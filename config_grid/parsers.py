@@ -0,0 +1,137 @@
+"""
+Parser backends for ConfigGrid.from_csv_file
+
+Each backend is a function taking (file, reader_args), where reader_args is a dict of csv.reader arguments, returning
+an iterable of lines, each a sequence of str, as accepted by ConfigGrid.from_lines.
+
+    split: splits each line on the delimiter, for files with no quoting. If a line turns out to contain the dialect's
+           quotechar or escapechar (or a space after a delimiter, with skipinitialspace), the rest of the file is
+           handed to csv.reader, so split only ever reads lines the way csv.reader would.
+    csv: csv.reader
+    pyarrow: pyarrow's multithreaded csv reader, only available if pyarrow is installed. Every row must be full width.
+"""
+import csv
+import io
+from itertools import chain
+
+DELIMITERS = (",", "\t", ";", "|")
+QUOTECHAR = '"'
+
+
+def _dialect(reader_args):
+    """
+    The csv dialect described by reader_args, with any individual arguments applied on top
+    """
+    dialect = reader_args.get("dialect", csv.excel)
+    if reader_args.keys() - {"dialect"}:
+        dialect = csv.reader([], **reader_args).dialect
+    elif isinstance(dialect, str):
+        dialect = csv.get_dialect(dialect)
+    return dialect
+
+
+def parse_split(file, reader_args):
+    dialect = _dialect(reader_args)
+    delimiter = dialect.delimiter
+    special = [char for char in (dialect.quotechar, dialect.escapechar) if char]
+    if dialect.skipinitialspace:
+        special.append(delimiter + " ")
+    file = iter(file)
+    for line in file:
+        if any(char in line for char in special):
+            yield from csv.reader(chain((line,), file), **reader_args)
+            return
+        line = line.rstrip("\r\n")
+        yield line.split(delimiter) if line else []
+
+
+def parse_csv(file, reader_args):
+    return csv.reader(file, **reader_args)
+
+
+def _pyarrow_csv():
+    """
+    pyarrow is only imported once the pyarrow backend is actually used, so config_grid doesn't depend on it.
+    """
+    try:
+        import pyarrow
+        from pyarrow import csv as pyarrow_csv
+    except ImportError:
+        raise ImportError("The pyarrow parser requires pyarrow, install it with `pip install pyarrow`") from None
+    return pyarrow, pyarrow_csv
+
+
+def parse_pyarrow(file, reader_args):
+    pyarrow, pyarrow_csv = _pyarrow_csv()
+    dialect = _dialect(reader_args)
+    header = next(csv.reader(file, dialect))
+    names = ["f{}".format(i) for i in range(len(header))]
+    table = pyarrow_csv.read_csv(
+        io.BytesIO(file.read().encode("utf-8")),
+        read_options=pyarrow_csv.ReadOptions(column_names=names),
+        parse_options=pyarrow_csv.ParseOptions(delimiter=dialect.delimiter,
+                                               quote_char=dialect.quotechar or False,
+                                               double_quote=dialect.doublequote,
+                                               escape_char=dialect.escapechar or False),
+        convert_options=pyarrow_csv.ConvertOptions(column_types=dict.fromkeys(names, pyarrow.string()),
+                                                   strings_can_be_null=False,
+                                                   quoted_strings_can_be_null=False))
+    return chain((header,), zip(*(column.to_pylist() for column in table.columns)))
+
+
+PARSERS = {
+    "split": parse_split,
+    "csv": parse_csv,
+    "pyarrow": parse_pyarrow,
+}
+
+
+def prescan(sample):
+    """
+    Cheap check of whether sample, the start of a file, can be parsed by splitting its lines.
+
+    :return: the delimiter, or None if sample contains quotes, or it isn't clear what the delimiter is
+    """
+    if QUOTECHAR in sample or sample.startswith("'"):
+        return None
+    lines = sample.splitlines()
+    if len(lines) > 1 and not sample.endswith(("\n", "\r")):
+        lines.pop()  # cut off part way through
+    lines = [line for line in lines if line]
+    if not lines:
+        return None
+    found = []
+    for delimiter in DELIMITERS:
+        count = lines[0].count(delimiter)
+        if count and all(line.count(delimiter) == count for line in lines):
+            found.append(delimiter)
+    if len(found) != 1:
+        return None
+    delimiter, = found
+    if delimiter + " " in sample or delimiter + "'" in sample or "\n'" in sample:
+        return None  # leave spaces after delimiters, and ' quoting, to the Sniffer
+    return delimiter
+
+
+def select(sample, parser=None, csv_reader_args=None, sniff=None):
+    """
+    Choose the backend and csv.reader arguments to parse a file with.
+
+    If neither parser or csv_reader_args is given, sample is prescanned, and files with no quoting are split, anything
+    else is sniffed and parsed with csv.reader. Given csv_reader_args, nothing is sniffed, and the csv backend is used
+    unless parser says otherwise.
+
+    :param sample: the start of the file
+    :param parser: name of the backend to use, None to choose automatically
+    :param csv_reader_args: dict of arguments for csv.reader, None to work them out from sample
+    :param sniff: function returning the csv dialect of sample, used when prescan can't tell
+    :return: (name of the backend, reader_args)
+    """
+    if parser is not None and parser not in PARSERS:
+        raise ValueError("Unknown parser {}, expected one of {}".format(parser, list(PARSERS)))
+    if csv_reader_args:
+        return parser or "csv", csv_reader_args
+    delimiter = prescan(sample)
+    if delimiter is None:
+        return parser or "csv", {"dialect": sniff(sample)}
+    return parser or "split", {"delimiter": delimiter}
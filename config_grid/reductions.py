@@ -0,0 +1,81 @@
+"""
+Memoised row and column reductions, see ConfigGrid.reduce
+"""
+from .utilities import GridListener
+
+
+def _mean(values, default):
+    return sum(values) / len(values) if values else None
+
+
+REDUCTIONS = {
+    "sum": lambda values, default: sum(values),
+    "min": lambda values, default: min(values, default=None),
+    "max": lambda values, default: max(values, default=None),
+    "mean": _mean,
+    "count": lambda values, default: len(values) - values.count(default),
+}
+
+
+class ReductionCache(GridListener):
+    """
+    Results of ConfigGrid.reduce, kept per (axis, func, default) and per heading, "count" depends on the grid's
+    default, so results for one default aren't reused once it has changed.
+
+    Setting a cell only drops the results of its row and its col, so only they are recomputed next time. A new row
+    drops the results of every col (and a new col those of every row), the new heading's own result is computed when
+    it's first asked for.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    def reduce(self, grid, axis, func):
+        if axis == "row":
+            headings, lines, line = grid.row_hds, grid.rows, grid.row
+        elif axis == "col":
+            headings, lines, line = grid.col_hds, grid.cols, grid.col
+        else:
+            raise ValueError("axis must be 'row' or 'col', not {}".format(axis))
+        if isinstance(func, str):
+            try:
+                reduction = REDUCTIONS[func]
+            except KeyError:
+                raise ValueError("Unknown reduction {}, expected one of {} or a function".format(
+                    func, list(REDUCTIONS))) from None
+        else:
+            reduction = lambda values, default: func(values)
+        default = grid.default
+        results = self.results.get((axis, func, default))
+        if results is None:
+            results = self.results[axis, func, default] = {}
+        if not results:
+            computed = grid._reduce_all(axis, func) if isinstance(func, str) else None
+            if computed is None:
+                computed = (reduction(list(values), default) for values in lines)
+            results.update(zip(headings, computed))
+        elif len(results) < len(headings):
+            for heading in headings:
+                if heading not in results:
+                    results[heading] = reduction(list(line(heading)), default)
+        return {heading: results[heading] for heading in headings}
+
+    def _drop(self, axis, heading):
+        for (results_axis, func, default), results in self.results.items():
+            if results_axis == axis:
+                results.pop(heading, None)
+
+    def _clear(self, axis):
+        for (results_axis, func, default), results in self.results.items():
+            if results_axis == axis:
+                results.clear()
+
+    def cell_set(self, grid, row, col, old, new):
+        self._drop("row", row)
+        self._drop("col", col)
+
+    def row_added(self, grid, row):
+        self._clear("col")
+
+    def col_added(self, grid, col):
+        self._clear("row")
@@ -0,0 +1,103 @@
+"""
+Text rendering of grids, see ConfigGrid.render
+"""
+from .utilities import GridListener
+
+
+ELLIPSIS = "..."
+
+
+def shown(headings, limit):
+    """
+    The headings to display if only limit of them fit, the first half and the last half.
+
+    :return: (list of headings, position of the ellipsis between them or None if they all fit)
+    """
+    if limit is None or len(headings) <= limit:
+        return list(headings), None
+    head = (limit + 1) // 2
+    return list(headings[:head]) + list(headings[len(headings) - (limit - head):]), head
+
+
+def _table(grid, rows, cols, row_gap, col_gap):
+    """
+    Generator of the values, as str, of each line of the table of the cells of grid in rows and cols, see render_lines
+    """
+    def with_gap(values):
+        if col_gap is not None:
+            values.insert(col_gap + 1, ELLIPSIS)
+        return values
+
+    yield with_gap([str(grid.title)] + [str(heading) for heading in cols])
+    for position, row_heading in enumerate(rows):
+        if position == row_gap:
+            yield with_gap([ELLIPSIS] * (len(cols) + 1))
+        line = grid[row_heading]
+        yield with_gap([str(row_heading)] + [str(line[col_heading]) for col_heading in cols])
+    if row_gap is not None and row_gap >= len(rows):
+        yield with_gap([ELLIPSIS] * (len(cols) + 1))
+
+
+def _join(values, widths):
+    return "".join(value.ljust(width) for value, width in zip(values, widths))
+
+
+def render_lines(grid, rows, cols, row_gap=None, col_gap=None):
+    """
+    Lines of the table of the cells of grid in rows and cols, with columns padded to fit their widest value.
+
+    :param row_gap: position among rows to insert a row of ellipses at, or None
+    :param col_gap: position among cols to insert a column of ellipses at, or None
+    :return: list of str, without line breaks
+    """
+    table = list(_table(grid, rows, cols, row_gap, col_gap))
+    widths = [max(map(len, column)) + 2 for column in zip(*table)]
+    return [_join(values, widths) for values in table]
+
+
+def stream_lines(grid, rows, cols, row_gap=None, col_gap=None):
+    """
+    As render_lines, but a generator that only holds one line at a time. The cells are read twice, first to find the
+    width of each column, then to build the lines.
+    """
+    widths = None
+    for values in _table(grid, rows, cols, row_gap, col_gap):
+        widths = list(map(len, values)) if widths is None else list(map(max, widths, map(len, values)))
+    widths = [width + 2 for width in widths]
+    for values in _table(grid, rows, cols, row_gap, col_gap):
+        yield _join(values, widths)
+
+
+class RenderCache(GridListener):
+    """
+    Keeps the lines of recent renders of a grid, so rendering an unchanged grid again is cheap, see
+    ConfigGrid.render(cache=True).
+
+    A render is dropped when one of the cells it shows is set, or when the title, default or the headings it would
+    show change. Values changed without going through the grid (e.g. mutable values changed in place) aren't noticed.
+    """
+
+    maxsize = 8
+
+    def __init__(self):
+        self.entries = {}
+
+    def lines(self, grid, max_rows, max_cols):
+        """
+        Lines of the table of grid, truncated to max_rows and max_cols, see ConfigGrid.render
+        """
+        rows, row_gap = shown(grid.row_hds, max_rows)
+        cols, col_gap = shown(grid.col_hds, max_cols)
+        state = (grid.title, grid.default, rows, cols)
+        key = (max_rows, max_cols)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != state:
+            if len(self.entries) >= self.maxsize:
+                self.entries.clear()
+            entry = self.entries[key] = (state, set(rows), set(cols), render_lines(grid, rows, cols, row_gap, col_gap))
+        return entry[3]
+
+    def cell_set(self, grid, row, col, old, new):
+        for key, (state, rows, cols, lines) in list(self.entries.items()):
+            if row in rows and col in cols:
+                del self.entries[key]
@@ -0,0 +1,128 @@
+import csv
+
+from . import ConfigGrid
+from .utilities import Cell, SparseLineDict, is_default
+
+
+class SparseGrid(ConfigGrid):
+    """
+    ConfigGrid for mostly empty grids, that only stores the cells that aren't the default.
+
+    Setting a cell to the default (by any means, grid[row][col] = value, from_lines, set_row, append_row etc.) removes
+    it from storage, and reading a cell that isn't stored returns the default, so it behaves exactly like a ConfigGrid.
+    Memory use, and the cost of iter_set_cells, scale with the number of cells that are set, not rows * cols e.g.
+
+        with open("sparse.csv") as grid_file:
+            grid = SparseGrid.from_csv_file(grid_file)
+        grid.density -> 0.05
+        for cell in grid.iter_set_cells():
+            ...
+
+    Values are only considered the default if they're the same type, so a cell set to False in a grid with default 0
+    is kept.
+
+    Grids can be saved in a compact coordinate format, listing only the cells that are set, with save_sparse_csv, and
+    loaded again with from_sparse_csv.
+    """
+
+    _line_cls = SparseLineDict
+
+    def _load_rows(self, rows):
+        """
+        As ConfigGrid._load_rows, leaving out values equal to the default
+        """
+        col_hds = self.col_hds
+        default = self.default
+        for line, values in zip(map(self._data.__getitem__, self.row_hds), rows):
+            dict.update(line, ((col_heading, value) for col_heading, value in zip(col_hds, values)
+                               if not is_default(value, default)))
+
+    @property
+    def set_count(self):
+        """
+        Number of cells that are set to something other than the default
+        """
+        return sum(len(self._data[row_heading].stored_keys()) for row_heading in self.row_hds)
+
+    @property
+    def density(self):
+        """
+        Fraction of the cells of the grid that are set to something other than the default, 1.0 for an empty grid
+        """
+        size = len(self.row_hds) * len(self.col_hds)
+        return self.set_count / size if size else 1.0
+
+    def iter_set_cells(self):
+        """
+        Like cells, but skipping the cells that are the default. Cells are yielded in the same order as cells.
+
+        :return: a generator of Cell objects
+        """
+        col_position = self.col_hds.index
+        for row_heading in self.row_hds:
+            line = self._data[row_heading]
+            stored = line.stored_keys()
+            if not stored:
+                continue
+            for col_heading in sorted(stored, key=col_position):
+                yield Cell(row=row_heading, col=col_heading, value=dict.__getitem__(line, col_heading))
+
+    nonzero_cells = iter_set_cells
+
+    def save_sparse_csv(self, file, csv_writer_args=None):
+        """
+        Save the grid in a compact coordinate format, only listing the cells that are set. The file is csv, with the
+        lines:
+
+            title, <title>
+            default, <default>
+            rows, <row heading>, <row heading>, ...
+            cols, <col heading>, <col heading>, ...
+            <row heading>, <col heading>, <value>     for each cell that is set
+
+        :param file: file object to write to, opened with newline=""
+        :param csv_writer_args: dictionary of arguments to pass to csv.writer
+        :return: the number of cells written
+        """
+        writer = csv.writer(file, **(csv_writer_args or {}))
+        writer.writerow(("title", self.title))
+        writer.writerow(("default", self.default))
+        writer.writerow(["rows"] + list(self.row_hds))
+        writer.writerow(["cols"] + list(self.col_hds))
+        count = 0
+        for cell in self.iter_set_cells():
+            writer.writerow(cell)
+            count += 1
+        return count
+
+    @classmethod
+    def from_sparse_csv(cls, file, csv_reader_args=None, default=None):
+        """
+        Alternative constructor, loading a grid saved with save_sparse_csv. preprocess_value is applied to each value
+        that was saved.
+
+        :param file: file object that contains the grid
+        :param csv_reader_args: dictionary of arguments to pass to csv.reader
+        :param default: default of the grid, by default that saved in the file. Every value in a csv file is read as a
+            str, so pass this if the default wasn't a str.
+        :return: initialised and filled instance of cls
+        """
+        lines = csv.reader(file, **(csv_reader_args or {}))
+        try:
+            sections = [next(lines) for _ in range(4)]
+        except StopIteration:
+            raise ValueError("Incomplete sparse grid file, expected title, default, rows and cols lines") from None
+        if [line[0] if line else None for line in sections] != ["title", "default", "rows", "cols"]:
+            raise ValueError("Not a sparse grid file, expected title, default, rows and cols lines")
+        (_, title), (_, saved_default), (_, *row_headings), (_, *col_headings) = sections
+        obj = cls(row_headings, col_headings, title, saved_default if default is None else default)
+        preprocess_value = obj._preprocessor()
+        data = obj._data
+        for line in lines:
+            if not line:
+                continue
+            row_heading, col_heading, value = line
+            if preprocess_value is not None:
+                value = preprocess_value(row_heading, col_heading, value)
+            data[row_heading][col_heading] = value
+        return obj
@@ -0,0 +1,208 @@
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+from . import ConfigGrid
+from .utilities import COMPRESSION_EXTENSIONS, SharedUniqueList
+
+
+class GridStore:
+    """
+    Collection of the grids saved in a directory, each loaded the first time it's used e.g.
+
+        store = GridStore("grids/", memory_budget=512 * 1024 ** 2)
+        store.names() -> ["east", "north", "south", "west"]
+        grid = store["north"]  # loads grids/north.csv
+
+    Grids are named after their files, without the extension. Creating a store only lists the directory, no file is
+    read until its grid is asked for. Files ending in .csv (optionally compressed, e.g. .csv.gz) and .cgrid are
+    included, and are loaded with grid_cls.load.
+
+    If memory_budget is given, once the grids loaded add up to more than it (as estimated from their storage), the
+    least recently used are dropped, to be loaded again the next time they're asked for. Changes made to a grid are
+    lost when it's dropped, unless they've been saved.
+
+    Grids often share the same headings. The store keeps one copy of each distinct list of headings, shared by every
+    grid that has it, and str headings are interned (see sys.intern) so each is only held once. Because of this the
+    rows and cols of grids from the store can't be added to or rearranged (doing so raises TypeError), use copy() first
+    to get a grid that can be. Values can be set as normal.
+
+    Hit, load and eviction counts are available from stats().
+    """
+
+    extensions = (".csv", ".cgrid")
+
+    def __init__(self, directory, grid_cls=ConfigGrid, memory_budget=None, share_headings=True, **load_kwargs):
+        """
+        :param directory: path of the directory containing the grids
+        :param grid_cls: class to load the grids as
+        :param memory_budget: approximate number of bytes the loaded grids may use, None for no limit
+        :param share_headings: share equal headings between grids
+        :param load_kwargs: passed on to grid_cls.load, e.g. col_types
+        """
+        self.directory = directory
+        self.grid_cls = grid_cls
+        self.memory_budget = memory_budget
+        self.share_headings = share_headings
+        self.load_kwargs = load_kwargs
+        self._paths = {}
+        self._grids = OrderedDict()
+        self._sizes = {}
+        self._headings = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.refresh()
+
+    def _name(self, file_name):
+        """
+        Name of the grid stored in file_name, or None if it isn't a grid file
+        """
+        stem, extension = os.path.splitext(file_name)
+        if extension.lower() in COMPRESSION_EXTENSIONS:
+            stem, extension = os.path.splitext(stem)
+        if extension.lower() in self.extensions:
+            return stem
+        return None
+
+    def refresh(self):
+        """
+        List the directory again, picking up new grid files. Grids whose files have gone are dropped.
+        """
+        paths = {}
+        for file_name in sorted(os.listdir(self.directory)):
+            name = self._name(file_name)
+            if name is None:
+                continue
+            if name in paths:
+                raise ValueError("{} and {} both hold a grid named {}".format(
+                    os.path.basename(paths[name]), file_name, name))
+            paths[name] = os.path.join(self.directory, file_name)
+        with self._lock:
+            self._paths = paths
+            for name in [name for name in self._grids if name not in paths]:
+                self._drop(name)
+
+    def names(self):
+        """
+        Names of all of the grids in the store, loaded or not
+        """
+        return list(self._paths)
+
+    def path(self, name):
+        """
+        Path of the file of the grid name
+        """
+        try:
+            return self._paths[name]
+        except KeyError:
+            raise KeyError("{} not found in grid names: {}".format(name, self.names())) from None
+
+    def loaded(self):
+        """
+        Names of the grids currently loaded, least recently used first
+        """
+        with self._lock:
+            return list(self._grids)
+
+    @property
+    def nbytes(self):
+        """
+        Approximate number of bytes used by the grids currently loaded
+        """
+        return sum(self._sizes.values())
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __contains__(self, name):
+        return name in self._paths
+
+    def __getitem__(self, name):
+        """
+        The grid name, loading it if it isn't already
+        """
+        with self._lock:
+            grid = self._grids.get(name)
+            if grid is not None:
+                self._grids.move_to_end(name)
+                self.hits += 1
+                return grid
+        grid = self.grid_cls.load(self.path(name), cache=False, **self.load_kwargs)
+        if self.share_headings:
+            grid._adopt_headings(self._shared(grid.row_hds), self._shared(grid.col_hds))
+        size = grid._nbytes()
+        with self._lock:
+            self.loads += 1
+            self._grids[name] = grid
+            self._sizes[name] = size
+            self._evict(keep=name)
+        return grid
+
+    def get(self, name, default=None):
+        if name in self._paths:
+            return self[name]
+        return default
+
+    def _shared(self, headings):
+        """
+        The SharedUniqueList equal to headings, creating it if there isn't one yet
+        """
+        with self._lock:
+            shared = self._headings.get(tuple(headings))
+            if shared is None:
+                shared = SharedUniqueList(sys.intern(heading) if type(heading) is str else heading
+                                          for heading in headings)
+                self._headings[tuple(shared)] = shared
+            return shared
+
+    def _drop(self, name):
+        del self._grids[name]
+        del self._sizes[name]
+
+    def _evict(self, keep=None):
+        """
+        Drop the least recently used grids until those left fit in the memory budget, apart from keep, which is never
+        dropped
+        """
+        if self.memory_budget is None:
+            return
+        total = sum(self._sizes.values())
+        for name in list(self._grids):
+            if total <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            total -= self._sizes[name]
+            self._drop(name)
+            self.evictions += 1
+
+    def evict(self, name=None):
+        """
+        Drop the grid name (or every loaded grid if name is None), it will be loaded again the next time it's used
+        """
+        with self._lock:
+            if name is None:
+                self._grids.clear()
+                self._sizes.clear()
+            elif name in self._grids:
+                self._drop(name)
+
+    def stats(self):
+        """
+        dict of the store's hit/ load/ eviction counts, and the number and approximate size of the grids loaded
+        """
+        with self._lock:
+            return {"hits": self.hits,
+                    "loads": self.loads,
+                    "evictions": self.evictions,
+                    "loaded": len(self._grids),
+                    "grids": len(self._paths),
+                    "nbytes": sum(self._sizes.values()),
+                    "memory_budget": self.memory_budget}
@@ -1,13 +1,116 @@
+import bz2
+import gzip
+import lzma
+import os
 from collections import namedtuple
 
 
 Cell = namedtuple("Cell", ["row", "col", "value"])
+WriteStats = namedtuple("WriteStats", ["rows", "chars", "bytes"])
+Patch = namedtuple("Patch", ["rows", "cols", "cells", "title"])
+
+COMPRESSION_OPENERS = {
+    None: open,
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+}
+
+
+def open_grid_file(path, mode="r", compression="infer", encoding="utf-8"):
+    """
+    Open the file at path in text mode, ready for csv.reader or csv.writer, compressed or decompressed on the fly.
+
+    :param path: path of the file
+    :param mode: "r" or "w"
+    :param compression: one of "gzip", "bz2", "xz" or None, or "infer" to choose based on the extension of path
+    :param encoding: text encoding of the file
+    :return: text file object
+    """
+    if compression == "infer":
+        compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    try:
+        opener = COMPRESSION_OPENERS[compression]
+    except KeyError:
+        raise ValueError("Unknown compression {}, expected one of {}".format(
+            compression, ", ".join(map(str, COMPRESSION_OPENERS)))) from None
+    return opener(path, mode + "t", encoding=encoding, newline="")
+
+
+def result_or_error(future):
+    """
+    The result of a concurrent.futures.Future, or the exception it raised
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+
+def vectorised(func):
+    """
+    Decorator for converters (see ConfigGrid.from_lines and save_to_file), marking that func takes a list of all the
+    values in a column/ row and returns the converted values, rather than being called once for each value e.g.
+
+        @vectorised
+        def parse_times(values):
+            return [datetime.strptime(value, pattern) for value in values]
+    """
+    func.vectorised = True
+    return func
+
+
+def apply_converter(func, values):
+    """
+    Convert the list values with func, as a whole if func is vectorised, else value by value.
+    """
+    if getattr(func, "vectorised", False):
+        return list(func(values))
+    return list(map(func, values))
+
+
+class CountingWriter:
+    """
+    Wraps a file object, keeping count of the characters written through it.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.chars = 0
+
+    def write(self, s):
+        self.chars += len(s)
+        return self.file.write(s)
 
 
 class UniqueList(list):
+    """
+    Helper class for ConfigGrid
+
+    A list that refuses duplicate values. Alongside the list a hash index of value -> position is kept in step with
+    every modification, so membership tests, index() and uniqueness checks don't need to scan the list.
+    """
+
+    def _reindex(self, start=0):
+        """
+        Rebuild the position index from start onwards, used after any operation that shifts values.
+        """
+        self._index.update(zip(self[start:], range(start, len(self))))
+
+    def _rebuild(self):
+        self._index = dict(zip(self, range(len(self))))
+        if len(self._index) != len(self):
+            raise ValueError("All new values must be unique")
 
     def is_new(self, new_value):
-        if new_value in self:
+        if new_value in self._index:
             return False
         return True
 
@@ -16,51 +119,182 @@ class UniqueList(list):
             return True
         return False
 
+    def __contains__(self, item):
+        try:
+            return item in self._index
+        except TypeError:
+            return False
+
+    def index(self, value, *args):
+        try:
+            position = self._index[value]
+        except (KeyError, TypeError):
+            raise ValueError("{} is not in list".format(value)) from None
+        if args:
+            return super().index(value, *args)
+        return position
+
+    def count(self, value):
+        return 1 if value in self._index else 0
+
     def insert(self, i, x):
         if not self.is_new(x):
             raise ValueError("All new values must be unique")
         super().insert(i, x)
+        self._reindex()
 
     def append(self, x):
         if not self.is_new(x):
             raise ValueError("All new values must be unique")
         super().append(x)
+        self._index[x] = len(self) - 1
 
-    def __iadd__(self, *args, **kwargs):
-        val = super().__iadd__(*args, **kwargs)
-        if val.check_still_unique():
-            return val
-        raise ValueError("All new values must be unique")
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
 
     def extend(self, t):
+        start = len(self)
         super().extend(t)
-        if not self.check_still_unique():
-            raise ValueError("All new values must be unique")
+        index = self._index
+        for position, value in zip(range(start, len(self)), self[start:]):
+            if value in index:
+                del self[start:]
+                raise ValueError("All new values must be unique")
+            index[value] = position
 
     def __mul__(self, n):
         raise ValueError("This operator is not supported")
 
-    def __init__(self, iterable=None):
+    def __imul__(self, n):
+        raise ValueError("This operator is not supported")
+
+    def __init__(self, iterable=()):
         super().__init__(iterable)
-        if not self.check_still_unique():
-            raise ValueError("All new values must be unique")
+        self._rebuild()
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
 
     def __add__(self, y):
         val = super().__add__(y)
-        if self.check_still_unique():
+        if len(val) == len(set(val)):
             return val
         raise ValueError("All new values must be unique")
 
     def __setitem__(self, i, y):
+        if isinstance(i, slice):
+            old = self[:]
+            super().__setitem__(i, y)
+            try:
+                self._rebuild()
+            except ValueError:
+                super().__setitem__(slice(None), old)
+                self._rebuild()
+                raise
+            return
         if not self.is_new(y):
             raise ValueError("All new values must be unique")
+        old = super().__getitem__(i)
         super().__setitem__(i, y)
+        del self._index[old]
+        self._index[y] = i % len(self)
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._rebuild()
+
+    def pop(self, i=-1):
+        value = super().pop(i)
+        self._rebuild()
+        return value
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def clear(self):
+        super().clear()
+        self._index = {}
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self):
+        super().reverse()
+        self._reindex()
 
     def swap(self, i, j):
-        t1, self[i] = self[i], True
-        t2, self[j] = self[j], False
-        self[i] = t2
-        self[j] = t1
+        length = len(self)
+        i, j = i % length, j % length
+        t1, t2 = super().__getitem__(i), super().__getitem__(j)
+        super().__setitem__(i, t2)
+        super().__setitem__(j, t1)
+        self._index[t2] = i
+        self._index[t1] = j
+
+    def reorder(self, order):
+        """
+        Rearrange the values into order in one go
+
+        :param order: iterable containing each of the current values exactly once
+        """
+        order = list(order)
+        if len(order) != len(self) or not all(value in self._index for value in order) or \
+                len(set(order)) != len(order):
+            raise ValueError("order must contain each value exactly once")
+        super().__setitem__(slice(None), order)
+        self._reindex()
+
+
+class SharedUniqueList(UniqueList):
+    """
+    Helper class for GridStore
+
+    UniqueList of headings shared between several grids, so it can't be changed. Copy the grid (copy gives it its own
+    UniqueLists) before adding, removing or reordering its rows or cols.
+    """
+
+    def _shared(self, *args, **kwargs):
+        raise TypeError("These headings are shared with other grids, use copy() to get a grid whose headings can "
+                        "be changed")
+
+    insert = _shared
+    append = _shared
+    __iadd__ = _shared
+    extend = _shared
+    __setitem__ = _shared
+    __delitem__ = _shared
+    pop = _shared
+    remove = _shared
+    clear = _shared
+    sort = _shared
+    reverse = _shared
+    swap = _shared
+    reorder = _shared
+
+
+class GridListener:
+    """
+    Base class for objects that follow the changes made to a grid, see ConfigGrid.add_listener
+
+    Override the methods of the events you're interested in.
+    """
+
+    def cell_set(self, grid, row, col, old, new):
+        """
+        Called after the value of the cell at row, col of grid has been set, from old to new
+        """
+
+    def row_added(self, grid, row):
+        """
+        Called after the row heading row has been added to grid
+        """
+
+    def col_added(self, grid, col):
+        """
+        Called after the col heading col has been added to grid
+        """
 
 
 class LineDict(dict):
@@ -71,7 +305,12 @@ class LineDict(dict):
 
     Methods are the same as a normal dict, but with the ordering considered, apart from DIRECT ITERATION ITERATES OVER
     CONTENTS NOT KEYS.
+
+    If observer is set, it's called with (key, old value, new value) after each item is set.
     """
+
+    observer = None
+
     def __init__(self, headings, default=""):
         assert isinstance(headings, list), "headings must be lists"
         super().__init__()
@@ -81,19 +320,21 @@ class LineDict(dict):
     def __setitem__(self, key, value):
         if key not in self.headings:
             raise KeyError("{} not found in row/ column headings: {}".format(key, self.headings))
-        return super().__setitem__(key, value)
+        observer = self.observer
+        if observer is None:
+            return super().__setitem__(key, value)
+        old = self[key]
+        super().__setitem__(key, value)
+        observer(key, old, value)
 
-    def __getitem__(self, item):
-        try:
-            return super().__getitem__(item)
-        except KeyError:
-            if item not in self.headings:
-                raise KeyError("{} not found in row/ column headings: {}".format(item, self.headings))
-            else:
-                return self.default
+    def __missing__(self, key):
+        # only called by dict.__getitem__ for keys that aren't stored, so reading a stored value stays a plain dict lookup
+        if key not in self.headings:
+            raise KeyError("{} not found in row/ column headings: {}".format(key, self.headings))
+        return self.default
 
     def __iter__(self):
-        return (self[position] for position in self.headings)
+        return map(self.__getitem__, self.headings)
 
     def keys(self):
         return self.headings
@@ -105,14 +346,21 @@ class LineDict(dict):
         return iter(self)
 
     def update(self, incoming_dict):
-        if all(key in self.headings for key in incoming_dict.keys()):
+        if not all(key in self.headings for key in incoming_dict.keys()):
+            raise KeyError("All keys in incoming_dict must also be in this dict")
+        if self.observer is None:
             super().update(incoming_dict)
         else:
-            raise KeyError("All keys in incoming_dict must also be in this dict")
+            for key in incoming_dict.keys():
+                self[key] = incoming_dict[key]
+
+    def __reduce__(self):
+        # headings must be restored before the items, and the observer (if any) isn't pickled
+        return self.__class__, (self.headings, self.default), None, None, iter(dict.items(self))
 
     def copy(self):
-        new_obj = LineDict(self.headings)
-        new_obj.update(self.copy())
+        new_obj = self.__class__(self.headings, self.default)
+        dict.update(new_obj, self)
         return new_obj
 
     @staticmethod
@@ -131,6 +379,9 @@ class LineDict(dict):
         """
         if k not in self.headings:
             raise KeyError("{} not found in row/ column headings: {}".format(k, self.headings))
+        if self.observer is not None and not dict.__contains__(self, k):
+            self[k] = d
+            return d
         return super().setdefault(k, d)
 
     def __repr__(self):
@@ -139,3 +390,79 @@ class LineDict(dict):
     def append(self, key, value):
         self.headings.append(key)
         self[key] = value
+
+
+class CopiedLines(LineDict):
+    """
+    Helper class for ConfigGrid._lazy_copy
+
+    LineDict of the lines of a grid, that copies each line out of source (the lines of another grid) the first time
+    it's looked up. source must not change afterwards.
+    """
+
+    def __init__(self, headings, source, line_cls, col_hds, line_default):
+        super().__init__(headings)
+        self.source = source
+        self.line_cls = line_cls
+        self.col_hds = col_hds
+        self.line_default = line_default
+
+    def __missing__(self, key):
+        source_line = dict.get(self.source, key)
+        if source_line is None:
+            return super().__missing__(key)
+        line = self.line_cls(self.col_hds, self.line_default)
+        dict.update(line, source_line)
+        dict.__setitem__(self, key, line)
+        return line
+
+    def __reduce__(self):
+        # pickled as a plain LineDict of every line, copied or not
+        return LineDict, (self.headings, self.default), None, None, ((key, self[key]) for key in self.headings)
+
+
+def is_default(value, default):
+    """
+    True if value is the same as default, values of different types (e.g. 0 and False) are never considered the same
+    """
+    return value is default or (type(value) is type(default) and value == default)
+
+
+class SparseLineDict(LineDict):
+    """
+    Helper class for SparseGrid
+
+    LineDict that doesn't store values equal to its default, setting a key to the default removes it instead. Reads
+    are unchanged, as missing keys already return the default.
+    """
+
+    def __setitem__(self, key, value):
+        if key not in self.headings:
+            raise KeyError("{} not found in row/ column headings: {}".format(key, self.headings))
+        observer = self.observer
+        old = self[key] if observer is not None else None
+        if is_default(value, self.default):
+            dict.pop(self, key, None)
+        else:
+            dict.__setitem__(self, key, value)
+        if observer is not None:
+            observer(key, old, value)
+
+    def update(self, incoming_dict):
+        if not all(key in self.headings for key in incoming_dict.keys()):
+            raise KeyError("All keys in incoming_dict must also be in this dict")
+        for key in incoming_dict.keys():
+            self[key] = incoming_dict[key]
+
+    def setdefault(self, k, d=None):
+        if k not in self.headings:
+            raise KeyError("{} not found in row/ column headings: {}".format(k, self.headings))
+        if not dict.__contains__(self, k) and not is_default(d, self.default):
+            self[k] = d
+        return self[k]
+
+    def stored_keys(self):
+        """
+        The keys that have a value other than the default, in the order they were set
+        """
+        return dict.keys(self)
@@ -0,0 +1,626 @@
+from . import ConfigGrid
+from .utilities import Cell, GridListener, UniqueList
+
+
+class _ViewRow:
+    """
+    Helper class for GridView
+
+    Stands in for a row of the parent grid, limited to the cols of the view. Reads and writes go straight through to
+    the parent's row.
+
+    As with LineDict, DIRECT ITERATION ITERATES OVER CONTENTS NOT KEYS.
+    """
+    __slots__ = ("_line", "_view")
+
+    def __init__(self, line, view):
+        self._line = line
+        self._view = view
+
+    @property
+    def headings(self):
+        return self._view.col_hds
+
+    @property
+    def default(self):
+        return self._view.default
+
+    def _check(self, key):
+        if key not in self._view.col_hds:
+            raise KeyError("{} not found in row/ column headings: {}".format(key, self.headings))
+
+    def __getitem__(self, key):
+        self._check(key)
+        return self._line[key]
+
+    def __setitem__(self, key, value):
+        self._check(key)
+        self._line[key] = value
+
+    def __iter__(self):
+        return map(self._line.__getitem__, self._view.col_hds)
+
+    def __len__(self):
+        return len(self._view.col_hds)
+
+    def __contains__(self, key):
+        return key in self._view.col_hds
+
+    def get(self, key, d=None):
+        if key in self._view.col_hds:
+            return self._line[key]
+        return d
+
+    def keys(self):
+        return self.headings
+
+    def items(self):
+        return zip(self.headings, iter(self))
+
+    def values(self):
+        return iter(self)
+
+    def __repr__(self):
+        return "ViewRow {{{}}}".format(", ".join("{}: {}".format(key, value) for key, value in self.items()))
+
+
+class _ViewListener(GridListener):
+    """
+    Helper class for GridView
+
+    Registered with the parent grid on behalf of a listener of the view, passing on the changes to cells in the view.
+    """
+
+    def __init__(self, view, listener):
+        self.view = view
+        self.listener = listener
+
+    def cell_set(self, grid, row, col, old, new):
+        view = self.view
+        if row in view.row_hds and col in view.col_hds:
+            self.listener.cell_set(view, row, col, old, new)
+
+    def row_added(self, grid, row):
+        if self.view.row_hds is grid.row_hds:
+            self.listener.row_added(self.view, row)
+
+    def col_added(self, grid, col):
+        if self.view.col_hds is grid.col_hds:
+            self.listener.col_added(self.view, col)
+
+
+class GridView(ConfigGrid):
+    """
+    Window onto a selection of the rows and cols of a grid, that shares the grid's storage, see ConfigGrid.view and
+    ConfigGrid.loc e.g.
+
+        view = grid.view(cols=("Mon", "Tues"))
+        view["Lunch"]["Mon"] = "Soup"  # sets grid["Lunch"]["Mon"]
+        view.save_to_file(file)
+
+    Reading from the view reads the parent grid, and writing to it writes to the parent grid, so no values are copied.
+    Values set in the parent grid are seen by the view.
+
+    If no rows (or cols) are selected, the view uses the parent's list of row (or col) headings itself, so creating it
+    is O(1), and rows (or cols) added to the parent appear in the view. Otherwise the view keeps its own list of the
+    selected headings. Either way, sorting or swapping the rows/ cols of the view doesn't affect the parent, the view
+    takes its own copy of the headings first. The shape of a view can't be changed, so append_row, append_col, combine
+    and apply_patch raise TypeError, use materialize (or copy) to get an independent grid.
+    """
+
+    def __init__(self, parent, rows=None, cols=None):
+        """
+        :param parent: the ConfigGrid to view. If parent is itself a GridView, the new view is onto its parent, and rows
+            and cols must come from parent
+        :param rows: iterable of the row headings to include, in the order to show them, None for all of them
+        :param cols: iterable of the col headings to include, in the order to show them, None for all of them
+        """
+        selected_from = parent
+        if isinstance(parent, GridView):
+            parent = parent.parent
+        self.parent = parent
+        self.row_hds = self._selection(rows, selected_from.row_hds, parent.row_hds)
+        self.col_hds = self._selection(cols, selected_from.col_hds, parent.col_hds)
+        self.title = parent.title
+        self.path = parent.path
+        self._adapters = {}
+
+    @staticmethod
+    def _selection(selected, available, parent_headings):
+        """
+        The list of headings of the view, parent_headings itself if there's no selection and available is the whole of
+        it, otherwise a new list of the selected headings, which must all be in available
+        """
+        if selected is None:
+            return parent_headings if available is parent_headings else UniqueList(available)
+        headings = UniqueList(selected)
+        for heading in headings:
+            if heading not in available:
+                raise KeyError("{} not found in row/ column headings: {}".format(heading, available))
+        return headings
+
+    def _detach(self):
+        """
+        Give the view its own copy of any list of headings it shares with the parent, before it's rearranged
+        """
+        if self.row_hds is self.parent.row_hds:
+            self.row_hds = UniqueList(self.row_hds)
+        if self.col_hds is self.parent.col_hds:
+            self.col_hds = UniqueList(self.col_hds)
+
+    @property
+    def default(self):
+        return self.parent.default
+
+    @property
+    def col_formats(self):
+        return self.parent.col_formats
+
+    @property
+    def row_formats(self):
+        return self.parent.row_formats
+
+    def _preprocessor(self):
+        return self.parent._preprocessor()
+
+    def _postprocessor(self):
+        return self.parent._postprocessor()
+
+    def materialize(self):
+        """
+        Independent grid, of the same class as the parent, containing a copy of the headings and values of the view
+        """
+        grid = self.parent._blank(self.row_hds, self.col_hds)
+        grid.title = self.title
+        grid._load_rows([list(row) for row in self.rows])
+        return grid
+
+    copy = materialize
+
+    def __getstate__(self):
+        """
+        As ConfigGrid.__getstate__, the parent is pickled along with the view
+        """
+        state = super().__getstate__()
+        state["_adapters"] = {}
+        return state
+
+    def _check_row(self, row_hd):
+        if row_hd not in self.row_hds:
+            raise KeyError("{} not found in row/ column headings: {}".format(row_hd, self.row_hds))
+
+    def __getitem__(self, row_hd):
+        """
+        As ConfigGrid.__getitem__, returns a view of the parent's row, limited to the cols of the view
+        """
+        self._check_row(row_hd)
+        return _ViewRow(self.parent[row_hd], self)
+
+    def __setitem__(self, row_heading, value):
+        """
+        Set the cells of the row in the view from a mapping of col heading -> value, e.g. another row of a grid.
+        """
+        self.set_row(row_heading, (value[col_heading] for col_heading in self.col_hds))
+
+    def add_listener(self, listener):
+        """
+        As ConfigGrid.add_listener, listener is told about changes to the cells in the view, however they're made
+        """
+        adapter = self._adapters[id(listener)] = _ViewListener(self, listener)
+        self.parent.add_listener(adapter)
+
+    def remove_listener(self, listener):
+        self.parent.remove_listener(self._adapters.pop(id(listener)))
+
+    def _get_cell(self, row_heading, col_heading):
+        return self.parent._get_cell(row_heading, col_heading)
+
+    def _lines(self):
+        parent = self.parent
+        return [parent[row_heading] for row_heading in self.row_hds]
+
+    @property
+    def rows(self):
+        """
+        As ConfigGrid.rows
+        """
+        col_hds = self.col_hds
+        parent = self.parent
+        for row_heading in self.row_hds:
+            yield map(parent[row_heading].__getitem__, col_hds)
+
+    @property
+    def cols(self):
+        """
+        As ConfigGrid.cols
+        """
+        lines = self._lines()
+        for col_heading in self.col_hds:
+            yield (line[col_heading] for line in lines)
+
+    @property
+    def cells(self):
+        """
+        As ConfigGrid.cells
+        """
+        col_hds = self.col_hds
+        for row_heading, row in zip(self.row_hds, self.rows):
+            for col_heading, value in zip(col_hds, row):
+                yield Cell(row=row_heading, col=col_heading, value=value)
+
+    def row(self, row):
+        """
+        As ConfigGrid.row
+        """
+        return iter(self[row])
+
+    def col(self, col):
+        """
+        As ConfigGrid.col
+        """
+        if col not in self.col_hds:
+            raise KeyError("{} not found in row/ column headings: {}".format(col, self.col_hds))
+        return (line[col] for line in self._lines())
+
+    def set_row(self, row_heading, values):
+        """
+        As ConfigGrid.set_row, for the cols of the view
+        """
+        self._check_row(row_heading)
+        values = tuple(values)
+        if not len(self.col_hds) == len(values):
+            raise IndexError("Different number of incoming values, to cols to fill")
+        line = self.parent[row_heading]
+        for col_heading, new_val in zip(self.col_hds, values):
+            line[col_heading] = new_val
+
+    def set_col(self, col_hd, values):
+        """
+        As ConfigGrid.set_col, for the rows of the view
+        """
+        if col_hd not in self.col_hds:
+            raise KeyError("{} not found in row/ column headings: {}".format(col_hd, self.col_hds))
+        values = tuple(values)
+        if not len(self.row_hds) == len(values):
+            raise IndexError("Different number of incoming values, to rows to fill")
+        for line, new_val in zip(self._lines(), values):
+            line[col_hd] = new_val
+
+    def _reshape(self, *args, **kwargs):
+        raise TypeError("The shape of a GridView can't be changed, use materialize to get a grid that can be")
+
+    append_col = _reshape
+    append_row = _reshape
+    combine = _reshape
+    apply_patch = _reshape
+    _grow = _reshape
+
+    def _detaching(method):
+        def rearrange(self, *args, **kwargs):
+            self._detach()
+            return method(self, *args, **kwargs)
+        rearrange.__doc__ = method.__doc__
+        return rearrange
+
+    swap_rows = _detaching(ConfigGrid.swap_rows)
+    swap_cols = _detaching(ConfigGrid.swap_cols)
+    reorder_rows = _detaching(ConfigGrid.reorder_rows)
+    reorder_cols = _detaching(ConfigGrid.reorder_cols)
+    sort_rows = _detaching(ConfigGrid.sort_rows)
+    sort_cols = _detaching(ConfigGrid.sort_cols)
+    del _detaching
+
+
+class GridLoc:
+    """
+    Helper class for ConfigGrid.loc, makes views from subscripts
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    @staticmethod
+    def _position(headings, heading):
+        """
+        Index of a slice bound in headings
+        """
+        try:
+            return headings.index(heading)
+        except ValueError:
+            raise KeyError("{} not found in row/ column headings: {}".format(heading, headings)) from None
+
+    @staticmethod
+    def _select(headings, key):
+        """
+        Headings selected by key, None for all of them
+        """
+        if isinstance(key, slice):
+            if key.start is None and key.stop is None and key.step is None:
+                return None
+            start = 0 if key.start is None else GridLoc._position(headings, key.start)
+            stop = len(headings) if key.stop is None else GridLoc._position(headings, key.stop) + 1
+            return headings[start:stop:key.step]
+        if isinstance(key, list):
+            return key
+        return [key]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, cols = key
+        else:
+            rows, cols = key, slice(None)
+        grid = self.grid
+        return GridView(grid, self._select(grid.row_hds, rows), self._select(grid.col_hds, cols))
+
+
+class GridIat:
+    """
+    Helper class for ConfigGrid.iat, looks cells up by position
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __getitem__(self, key):
+        row, col = key
+        grid = self.grid
+        return grid._get_cell(grid.row_hds[row], grid.col_hds[col])
+
+    def __setitem__(self, key, value):
+        row, col = key
+        grid = self.grid
+        grid[grid.row_hds[row]][grid.col_hds[col]] = value
+
+
+class _TransposedRow:
+    """
+    Helper class for TransposedView
+
+    Stands in for a row of the transposed grid, which is a col of the parent grid. Reads and writes go straight through
+    to the parent.
+
+    As with LineDict, DIRECT ITERATION ITERATES OVER CONTENTS NOT KEYS.
+    """
+    __slots__ = ("_parent", "_heading")
+
+    def __init__(self, parent, heading):
+        self._parent = parent
+        self._heading = heading
+
+    @property
+    def headings(self):
+        return self._parent.row_hds
+
+    @property
+    def default(self):
+        return self._parent.default
+
+    def __getitem__(self, key):
+        return self._parent[key][self._heading]
+
+    def __setitem__(self, key, value):
+        self._parent[key][self._heading] = value
+
+    def __iter__(self):
+        return self._parent.col(self._heading)
+
+    def __len__(self):
+        return len(self._parent.row_hds)
+
+    def __contains__(self, key):
+        return key in self._parent.row_hds
+
+    def get(self, key, d=None):
+        if key in self._parent.row_hds:
+            return self[key]
+        return d
+
+    def keys(self):
+        return self.headings
+
+    def items(self):
+        return zip(self.headings, iter(self))
+
+    def values(self):
+        return iter(self)
+
+    def __repr__(self):
+        return "TransposedRow {{{}}}".format(", ".join("{}: {}".format(key, value) for key, value in self.items()))
+
+
+class _TransposedListener(GridListener):
+    """
+    Helper class for TransposedView
+
+    Registered with the parent grid on behalf of a listener of the view, swapping rows for cols in the changes it
+    passes on.
+    """
+
+    def __init__(self, view, listener):
+        self.view = view
+        self.listener = listener
+
+    def cell_set(self, grid, row, col, old, new):
+        self.listener.cell_set(self.view, col, row, old, new)
+
+    def row_added(self, grid, row):
+        self.listener.col_added(self.view, row)
+
+    def col_added(self, grid, col):
+        self.listener.row_added(self.view, col)
+
+
+class TransposedView(ConfigGrid):
+    """
+    The transpose of a grid, whose rows are the cols of the grid and whose cols are its rows, see ConfigGrid.transpose
+    e.g.
+
+        by_day = grid.T
+        by_day["Mon"]["Lunch"]  # grid["Lunch"]["Mon"]
+        by_day.save_to_file(file)
+
+    Nothing is copied, so making one is O(1) whatever the size of the grid. Reads and writes go through to the grid, as
+    do new rows and cols e.g. by_day.append_row adds a col to the grid. The headings are shared with the grid too, so
+    sorting or swapping the rows of the view sorts or swaps the cols of the grid.
+
+    Use materialize (or copy) to get an independent grid in the transposed orientation.
+    """
+
+    def __init__(self, parent):
+        """
+        :param parent: the ConfigGrid to transpose
+        """
+        self.parent = parent
+        self.title = parent.title
+        self.path = parent.path
+        self._adapters = {}
+
+    @property
+    def row_hds(self):
+        return self.parent.col_hds
+
+    @property
+    def col_hds(self):
+        return self.parent.row_hds
+
+    @property
+    def default(self):
+        return self.parent.default
+
+    @property
+    def col_formats(self):
+        return self.parent.row_formats
+
+    @property
+    def row_formats(self):
+        return self.parent.col_formats
+
+    @staticmethod
+    def _swapped(process_value):
+        if process_value is None:
+            return None
+        return lambda row, col, value: process_value(col, row, value)
+
+    def _preprocessor(self):
+        return self._swapped(self.parent._preprocessor())
+
+    def _postprocessor(self):
+        return self._swapped(self.parent._postprocessor())
+
+    def transpose(self):
+        """
+        The transpose of the transpose, the parent grid itself
+        """
+        return self.parent
+
+    def _blank(self, row_hds, col_hds):
+        return self.parent._blank(row_hds, col_hds)
+
+    def materialize(self):
+        """
+        Independent grid, of the same class as the parent, containing a copy of the transposed headings and values
+        """
+        grid = self._blank(self.row_hds, self.col_hds)
+        grid.title = self.title
+        grid._load_rows([list(row) for row in self.rows])
+        return grid
+
+    copy = materialize
+
+    def __getstate__(self):
+        """
+        As ConfigGrid.__getstate__, the parent is pickled along with the view
+        """
+        state = super().__getstate__()
+        state["_adapters"] = {}
+        return state
+
+    def __getitem__(self, row_hd):
+        """
+        As ConfigGrid.__getitem__, returns a view of the parent's col
+        """
+        if row_hd not in self.parent.col_hds:
+            raise KeyError("{} not found in row/ column headings: {}".format(row_hd, self.row_hds))
+        return _TransposedRow(self.parent, row_hd)
+
+    def __setitem__(self, row_heading, value):
+        """
+        Replace the contents of a whole row from a mapping of col heading -> value, e.g. another row of a grid.
+        """
+        self.set_row(row_heading, (value[col_heading] for col_heading in self.col_hds))
+
+    def add_listener(self, listener):
+        """
+        As ConfigGrid.add_listener, listener is told about changes to the grid, transposed
+        """
+        adapter = self._adapters[id(listener)] = _TransposedListener(self, listener)
+        self.parent.add_listener(adapter)
+
+    def remove_listener(self, listener):
+        self.parent.remove_listener(self._adapters.pop(id(listener)))
+
+    def _get_cell(self, row_heading, col_heading):
+        return self.parent._get_cell(col_heading, row_heading)
+
+    @property
+    def rows(self):
+        """
+        As ConfigGrid.rows
+        """
+        return self.parent.cols
+
+    @property
+    def cols(self):
+        """
+        As ConfigGrid.cols
+        """
+        return self.parent.rows
+
+    @property
+    def cells(self):
+        """
+        As ConfigGrid.cells
+        """
+        col_hds = self.col_hds
+        for row_heading, row in zip(self.row_hds, self.rows):
+            for col_heading, value in zip(col_hds, row):
+                yield Cell(row=row_heading, col=col_heading, value=value)
+
+    def row(self, row):
+        """
+        As ConfigGrid.row
+        """
+        return self.parent.col(row)
+
+    def col(self, col):
+        """
+        As ConfigGrid.col
+        """
+        return self.parent.row(col)
+
+    def set_row(self, row_heading, values):
+        """
+        As ConfigGrid.set_row
+        """
+        self.parent.set_col(row_heading, values)
+
+    def set_col(self, col_hd, values):
+        """
+        As ConfigGrid.set_col
+        """
+        self.parent.set_row(col_hd, values)
+
+    def append_row(self, row_hd, row):
+        """
+        As ConfigGrid.append_row, adds a col to the parent
+        """
+        self.parent.append_col(row_hd, row)
+
+    def append_col(self, col_heading, col):
+        """
+        As ConfigGrid.append_col, adds a row to the parent
+        """
+        self.parent.append_row(col_heading, col)
+
+    def _grow(self, new_rows, new_cols):
+        self.parent._grow(new_cols, new_rows)
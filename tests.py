@@ -1,6 +1,30 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import pathlib
+import pickle
+import tempfile
 import unittest
 
-from config_grid import ConfigGrid, Cell
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from config_grid import ConfigGrid, ColumnarGrid, LazyCsvGrid, NumericGrid, SparseGrid, Cell, parsers
+from config_grid.cache import GridCache
+from config_grid.instrument import Instrumentation, active
+from config_grid.store import GridStore
+from config_grid.utilities import UniqueList, LineDict, open_grid_file, vectorised
+
+from benchmarks import bench
 
 
 class BaseCase:
@@ -56,6 +80,21 @@ class BaseCase:
             self.assertEqual(cell, t_cell)
 
 
+    def test_flat_iteration(self):
+        self.assertSequenceEqual(list(self.grid.iter_values()), (1, 2, 3, 4, 5, 6, 7, 8))
+        self.assertSequenceEqual(list(self.grid.itertuples()), (("Row 1", 1, 2, 3, 4), ("Row 2", 5, 6, 7, 8)))
+        self.assertEqual(self.grid.to_lists(), [[1, 2, 3, 4], [5, 6, 7, 8]])
+        self.assertEqual(self.grid.iat[0, 2], 3)
+        self.assertEqual(self.grid.iat[-1, -1], 8)
+        self.assertRaises(IndexError, lambda: self.grid.iat[2, 0])
+        self.grid.iat[1, 0] = 50
+        self.assertEqual(self.grid["Row 2"]["Col 1"], 50)
+        self.grid.swap_cols("Col 1", "Col 4")
+        self.assertEqual(self.grid.iat[1, 3], 50)
+        self.assertEqual(self.grid.to_lists()[0], [4, 2, 3, 1])
+        self.assertEqual(self.grid.T.iat[0, 1], 8)
+        self.assertSequenceEqual(list(self.grid.view(cols=("Col 2",)).iter_values()), (2, 6))
+
     def test_col_row(self):
         self.assertSequenceEqual(tuple(self.grid.col("Col 1")), (1, 5))
         self.assertSequenceEqual(tuple(self.grid.col("Col 4")), (4, 8))
@@ -142,6 +181,127 @@ class BaseCase:
         self.grid.combine(new_grid, False)
         self.compare_cells(self.grid, expected)
 
+    def test_combine_both(self):
+        to_combine = \
+            (("Combine Grid", "Col 2", "Col 5"),
+             (       "Row 2",      13,      14),
+             (       "Row 3",      15,      16))
+        new_grid = ConfigGrid.from_lines(to_combine)
+        self.assertIs(self.grid.combine(new_grid), self.grid)
+        default = self.grid.default
+        expected = \
+            (("Test Grid", "Col 1", "Col 2", "Col 3", "Col 4", "Col 5"),
+             (    "Row 1",       1,       2,       3,       4, default),
+             (    "Row 2",       5,      13,       7,       8,      14),
+             (    "Row 3", default,      15, default, default,      16))
+        self.assertSequenceEqual(self.grid.row_hds, ("Row 1", "Row 2", "Row 3"))
+        self.compare_cells(self.grid, expected)
+
+    def test_merge(self):
+        first = ConfigGrid.from_lines((("First", "Col 1", "Col 2"),
+                                       ("Row 1",       1,       2)))
+        second = ConfigGrid.from_lines((("Second", "Col 2", "Col 3"),
+                                        ( "Row 1",      20,      30),
+                                        ( "Row 2",      40,      50)))
+        merged = self.grid.merge(self.grid, first, second)
+        self.assertIsInstance(merged, type(self.grid))
+        self.assertEqual(merged.title, "Test Grid")
+        self.assertSequenceEqual(merged.col_hds, ("Col 1", "Col 2", "Col 3", "Col 4"))
+        self.assertSequenceEqual(tuple(merged.row("Row 1")), (1, 20, 30, 4))
+        self.assertSequenceEqual(tuple(merged.row("Row 2")), (5, 40, 50, 8))
+        kept = self.grid.merge(self.grid, first, second, overwrite=False)
+        self.assertSequenceEqual(tuple(kept.row("Row 1")), (1, 2, 3, 4))
+        self.assertSequenceEqual(tuple(self.grid.row("Row 1")), (1, 2, 3, 4))
+        self.assertRaises(ValueError, ConfigGrid.merge)
+
+    def test_diff_patch(self):
+        old = self.grid.copy()
+        self.assertEqual(old, self.grid)
+        self.grid["Row 1"]["Col 2"] = 20
+        self.grid.combine(ConfigGrid.from_lines((("Other", "Col 5"),
+                                                 ("Row 3",      30))))
+        self.assertNotEqual(old, self.grid)
+        patch = old.diff(self.grid)
+        self.assertSequenceEqual(patch.rows, ["Row 3"])
+        self.assertSequenceEqual(patch.cols, ["Col 5"])
+        self.assertIn(("Row 1", "Col 2", 20), patch.cells)
+        self.assertNotIn(("Row 1", "Col 1", 1), patch.cells)
+        self.assertIsNone(patch.title)
+        self.assertEqual(old.apply_patch(patch), self.grid)
+        self.assertRaises(ValueError, self.grid.diff, ConfigGrid.from_lines((("", "Col 1"), ("Row 1", 1))))
+
+    def test_track_changes(self):
+        old = self.grid.copy()
+        tracker = self.grid.track_changes()
+        self.assertFalse(tracker.dirty)
+        self.grid["Row 2"]["Col 3"] = 70
+        self.grid.set_col("Col 1", (10, 50))
+        self.grid.append_row("Row 3", (9, 10, 11, 12))
+        self.grid.append_col("Col 5", (13, 14, 15))
+        self.assertTrue(tracker.dirty)
+        patch = tracker.patch()
+        self.assertSequenceEqual(patch.rows, ["Row 3"])
+        self.assertSequenceEqual(patch.cols, ["Col 5"])
+        self.assertEqual(len(patch.cells), 5 + 2 + 3)
+        self.assertEqual(old.apply_patch(patch), self.grid)
+        tracker.reset()
+        self.assertFalse(tracker.dirty)
+        tracker.stop()
+        self.grid["Row 1"]["Col 1"] = 0
+        self.assertFalse(tracker.dirty)
+
+    def test_where(self):
+        self.assertEqual(self.grid.where(6), {("Row 2", "Col 2")})
+        self.grid["Row 1"]["Col 1"] = 6
+        self.grid.set_col("Col 4", (6, 0))
+        self.assertEqual(self.grid.where(6), {("Row 1", "Col 1"), ("Row 2", "Col 2"), ("Row 1", "Col 4")})
+        self.assertEqual(self.grid.where(1), set())
+        self.grid.append_row("Row 3", (0, 0, 6, 0))
+        self.grid.append_col("Col 5", (0, 9, 6))
+        self.assertEqual(self.grid.rows_with(6), {"Row 1", "Row 2", "Row 3"})
+        self.assertEqual(self.grid.cols_with(6), {"Col 1", "Col 2", "Col 3", "Col 4", "Col 5"})
+        self.grid.combine(ConfigGrid.from_lines((("Other", "Col 6"),
+                                                 ("Row 2",      9),
+                                                 ("Row 4",      6))))
+        self.assertEqual(self.grid.where(9), {("Row 2", "Col 5"), ("Row 2", "Col 6")})
+        self.assertIn(("Row 4", "Col 6"), self.grid.where(6))
+        if self.grid.default == 0:
+            self.assertEqual(len(self.grid.where(0)), 5 + 7)
+        else:
+            self.assertEqual(len(self.grid.where(0)), 5)
+            self.assertEqual(len(self.grid.where(self.grid.default)), 7)
+        self.assertEqual(self.grid.copy().where(9), self.grid.where(9))
+
+    def test_set_whole_row(self):
+        other = ConfigGrid.from_lines((("Other", "Col 1", "Col 2", "Col 3", "Col 4"),
+                                       ("Row 1",       1,       2,       3,       4)))
+        other.where(1)
+        self.assertEqual(self.grid.where(6), {("Row 2", "Col 2")})
+        self.grid["Row 1"] = {"Col 1": 6, "Col 2": 0, "Col 3": 0, "Col 4": 0}
+        self.assertEqual(self.grid["Row 1"]["Col 1"], 6)
+        self.assertEqual(self.grid.where(6), {("Row 1", "Col 1"), ("Row 2", "Col 2")})
+        self.grid["Row 1"] = other["Row 1"]
+        self.assertEqual(self.grid.where(6), {("Row 2", "Col 2")})
+        self.grid["Row 1"]["Col 1"] = 9
+        self.assertEqual(other["Row 1"]["Col 1"], 1)
+        self.assertEqual(other.where(1), {("Row 1", "Col 1")})
+        self.assertEqual(self.grid.where(9), {("Row 1", "Col 1")})
+
+    def test_line_updates(self):
+        if not isinstance(self.grid["Row 1"], LineDict):
+            self.skipTest("rows are not LineDicts")
+        self.assertEqual(self.grid.where(6), {("Row 2", "Col 2")})
+        self.assertEqual(self.grid.reduce("row"), {"Row 1": 10, "Row 2": 26})
+        self.grid["Row 1"].update({"Col 1": 6, "Col 2": 0})
+        self.assertEqual(self.grid.where(6), {("Row 1", "Col 1"), ("Row 2", "Col 2")})
+        self.assertEqual(self.grid.reduce("row"), {"Row 1": 13, "Row 2": 26})
+        self.grid.combine(ConfigGrid.from_lines((("Other", "Col 5"),
+                                                 ("Row 1",       1))))
+        self.assertEqual(self.grid["Row 2"].setdefault("Col 5", 6), 6)
+        self.assertEqual(self.grid["Row 2"].setdefault("Col 5", 7), 6)
+        self.assertIn(("Row 2", "Col 5"), self.grid.where(6))
+        self.assertEqual(self.grid.reduce("row"), {"Row 1": 14, "Row 2": 32})
+
     def test_swaps(self):
         self.grid.swap_rows("Row 1", "Row 2")
         self.grid.swap_cols("Col 4", "Col 2")
@@ -151,6 +311,156 @@ class BaseCase:
              (    "Row 1",       1,       4,       3,       2))
         self.compare_cells(self.grid, expected)
 
+    def test_sort_reorder(self):
+        self.grid.reorder_rows(("Row 2", "Row 1"))
+        self.grid.reorder_cols(("Col 3", "Col 1", "Col 4", "Col 2"))
+        expected = \
+            (("Test Grid", "Col 3", "Col 1", "Col 4", "Col 2"),
+             (    "Row 2",       7,       5,       8,       6),
+             (    "Row 1",       3,       1,       4,       2))
+        self.compare_cells(self.grid, expected)
+        self.assertRaises(ValueError, self.grid.reorder_rows, ("Row 2",))
+        self.assertRaises(ValueError, self.grid.reorder_rows, ("Row 2", "Row 2"))
+        self.assertRaises(ValueError, self.grid.reorder_cols, ("Col 1", "Col 2", "Col 3", "Col ?"))
+        self.grid.sort_rows()
+        self.grid.sort_cols(by_row="Row 1", reverse=True)
+        expected = \
+            (("Test Grid", "Col 4", "Col 3", "Col 2", "Col 1"),
+             (    "Row 1",       4,       3,       2,       1),
+             (    "Row 2",       8,       7,       6,       5))
+        self.compare_cells(self.grid, expected)
+        self.grid.sort_rows(by_col="Col 1", key=lambda value: -value)
+        self.assertSequenceEqual(self.grid.row_hds, ("Row 2", "Row 1"))
+        self.assertEqual(self.grid.row_hds.index("Row 1"), 1)
+        self.grid.sort_cols(key=lambda heading: heading[-1])
+        self.assertSequenceEqual(self.grid.col_hds, ("Col 1", "Col 2", "Col 3", "Col 4"))
+        self.assertEqual(self.grid["Row 2"]["Col 3"], 7)
+
+    def test_reduce(self):
+        self.assertEqual(self.grid.reduce(), {"Col 1": 6, "Col 2": 8, "Col 3": 10, "Col 4": 12})
+        self.assertEqual(self.grid.reduce("row", "max"), {"Row 1": 4, "Row 2": 8})
+        self.assertEqual(self.grid.reduce("row", "mean"), {"Row 1": 2.5, "Row 2": 6.5})
+        self.assertEqual(self.grid.reduce("col", len), dict.fromkeys(self.grid.col_hds, 2))
+        self.assertRaises(ValueError, self.grid.reduce, "diagonal")
+        self.assertRaises(ValueError, self.grid.reduce, "row", "median")
+
+        calls = []
+
+        def total(values):
+            calls.append(values)
+            return sum(values)
+
+        self.assertEqual(self.grid.reduce("row", total), {"Row 1": 10, "Row 2": 26})
+        self.assertEqual(len(calls), 2)
+        self.grid.reduce("row", total)
+        self.assertEqual(len(calls), 2)
+        self.grid["Row 2"]["Col 1"] = 15
+        self.assertEqual(self.grid.reduce("row", total), {"Row 1": 10, "Row 2": 36})
+        self.assertEqual(calls[-1], [15, 6, 7, 8])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.grid.reduce()["Col 1"], 16)
+
+        self.grid.set_col("Col 4", (0, 0))
+        count = 3 if self.grid.default == 0 else 4  # only values that aren't the default are counted
+        self.assertEqual(self.grid.reduce("row", "count"), {"Row 1": count, "Row 2": count})
+        default = self.grid.default
+        self.grid.default = 1
+        self.assertEqual(self.grid.reduce("row", "count"), {"Row 1": 3, "Row 2": 4})
+        self.grid.default = default
+        self.assertEqual(self.grid.reduce("row", "count"), {"Row 1": count, "Row 2": count})
+        self.grid.append_row("Row 3", (1, 1, 1, 1))
+        self.assertEqual(self.grid.reduce("row", total)["Row 3"], 4)
+        self.assertEqual(self.grid.reduce(), {"Col 1": 17, "Col 2": 9, "Col 3": 11, "Col 4": 1})
+        self.grid.sort_rows(reverse=True)
+        self.assertSequenceEqual(list(self.grid.reduce("row", total)), ("Row 3", "Row 2", "Row 1"))
+        self.assertEqual(self.grid.copy().reduce("row", total), {"Row 3": 4, "Row 2": 28, "Row 1": 6})
+
+    def test_view(self):
+        view = self.grid.view(cols=("Col 3", "Col 2"))
+        expected = \
+            (("Test Grid", "Col 3", "Col 2"),
+             (    "Row 1",       3,       2),
+             (    "Row 2",       7,       6))
+        self.compare_cells(view, expected)
+        self.assertSequenceEqual([tuple(col) for col in view.cols], ((3, 7), (2, 6)))
+        self.assertSequenceEqual(tuple(view.col("Col 2")), (2, 6))
+        self.assertRaises(KeyError, lambda: view["Row 1"]["Col 1"])
+        self.assertRaises(KeyError, self.grid.view, ("Row ?",))
+        view["Row 2"]["Col 3"] = 70
+        view.set_col("Col 2", (20, 60))
+        self.assertEqual(self.grid["Row 2"]["Col 3"], 70)
+        self.assertSequenceEqual(tuple(self.grid.col("Col 2")), (20, 60))
+        self.grid["Row 1"]["Col 3"] = 30
+        self.assertEqual(view["Row 1"]["Col 3"], 30)
+        self.assertRaises(TypeError, view.append_row, "Row 3", (0, 0))
+
+        tracker = view.track_changes()
+        self.grid["Row 1"]["Col 4"] = 40
+        self.grid["Row 1"]["Col 2"] = 2
+        self.assertEqual(list(tracker.cells), [("Row 1", "Col 2")])
+        tracker.stop()
+
+        corner = self.grid.loc["Row 2", "Col 2":"Col 4"]
+        self.assertSequenceEqual(corner.row_hds, ("Row 2",))
+        self.assertSequenceEqual(corner.col_hds, ("Col 2", "Col 3", "Col 4"))
+        self.assertSequenceEqual(self.grid.loc[:, ["Col 4", "Col 1"]].col_hds, ("Col 4", "Col 1"))
+        self.assertSequenceEqual(self.grid.loc["Row 1":].row_hds, ("Row 1", "Row 2"))
+        self.assertRaises(KeyError, lambda: self.grid.loc["zz":])
+        self.assertRaises(KeyError, lambda: self.grid.loc[:, :"zz"])
+        inner = corner.loc[:, "Col 3":]
+        self.assertIs(inner.parent, self.grid)
+        self.assertSequenceEqual(inner.col_hds, ("Col 3", "Col 4"))
+
+        whole = self.grid.view(cols=("Col 1", "Col 2"))
+        self.assertIs(whole.row_hds, self.grid.row_hds)
+        self.assertIs(whole.view(cols=("Col 2",)).row_hds, self.grid.row_hds)
+        self.assertIsNot(view.view(rows=None).col_hds, view.col_hds)
+        whole.sort_rows(reverse=True)
+        self.assertSequenceEqual(whole.row_hds, ("Row 2", "Row 1"))
+        self.assertSequenceEqual(self.grid.row_hds, ("Row 1", "Row 2"))
+
+        copy = corner.materialize()
+        self.assertIsInstance(copy, self.grid.__class__)
+        copy["Row 2"]["Col 2"] = 0
+        self.assertEqual(self.grid["Row 2"]["Col 2"], 60)
+        self.assertNotEqual(copy, corner)
+        file = io.StringIO()
+        corner.save_to_file(file)
+        self.assertEqual(file.getvalue().splitlines(), ["Test Grid,Col 2,Col 3,Col 4", "Row 2,60,70,8"])
+
+    def test_transpose(self):
+        transposed = self.grid.T
+        expected = \
+            (("Test Grid", "Row 1", "Row 2"),
+             (    "Col 1",       1,       5),
+             (    "Col 2",       2,       6),
+             (    "Col 3",       3,       7),
+             (    "Col 4",       4,       8))
+        self.compare_cells(transposed, expected)
+        self.assertSequenceEqual([tuple(col) for col in transposed.cols], ((1, 2, 3, 4), (5, 6, 7, 8)))
+        self.assertSequenceEqual(tuple(transposed.row("Col 2")), (2, 6))
+        self.assertRaises(KeyError, lambda: transposed["Row 1"])
+        self.assertIs(transposed.T, self.grid)
+        transposed["Col 3"]["Row 2"] = 70
+        self.assertEqual(self.grid["Row 2"]["Col 3"], 70)
+        self.grid["Row 1"]["Col 4"] = 40
+        self.assertEqual(transposed["Col 4"]["Row 1"], 40)
+
+        tracker = transposed.track_changes()
+        transposed.append_row("Col 5", (9, 10))
+        self.assertSequenceEqual(tuple(self.grid.col("Col 5")), (9, 10))
+        self.assertEqual(tracker.rows, {"Col 5": None})
+        tracker.stop()
+
+        copy = transposed.materialize()
+        self.assertIsInstance(copy, self.grid.__class__)
+        self.assertSequenceEqual(copy.row_hds, ("Col 1", "Col 2", "Col 3", "Col 4", "Col 5"))
+        copy["Col 1"]["Row 1"] = 0
+        self.assertEqual(self.grid["Row 1"]["Col 1"], 1)
+        file = io.StringIO()
+        transposed.save_to_file(file)
+        self.assertEqual(file.getvalue().splitlines()[:2], ["Test Grid,Row 1,Row 2", "Col 1,1,5"])
+
     def test_writing(self):
         with open("tests/t_out.csv", "w") as file:
             self.grid.save_to_file(file)
@@ -195,6 +505,893 @@ class FilledCase(unittest.TestCase, BaseCase):
                 filled_grid["Row {}".format(row)]["Col {}".format(col)] = ((row - 1) * 4) + col
         self.grid = filled_grid
 
+class ColumnarFromLinesCase(unittest.TestCase, BaseCase):
+
+    def setUp(self):
+        self.input = (("Test Grid", "Col 1", "Col 2", "Col 3", "Col 4"),
+                      (    "Row 1",       1,       2,       3,       4),
+                      (    "Row 2",       5,       6,       7,       8))
+        self.grid = ColumnarGrid.from_lines(self.input)
+
+    def test_storage(self):
+        self.assertEqual(self.grid._columns, [[1, 5], [2, 6], [3, 7], [4, 8]])
+        self.grid.swap_rows("Row 1", "Row 2")
+        self.grid.append_row("Row 3", (9, 10, 11, 12))
+        self.assertSequenceEqual(tuple(self.grid.col("Col 2")), (6, 2, 10))
+        self.assertEqual(self.grid._columns[1], [2, 6, 10])
+
+
+class ColumnarFilledCase(unittest.TestCase, BaseCase):
+
+    def setUp(self):
+        filled_grid = ColumnarGrid(("Row 1", "Row 2"),
+                                   ("Col 1", "Col 2", "Col 3", "Col 4"),
+                                   "Test Grid")
+        for row in range(1, 3):
+            for col in range(1, 5):
+                filled_grid["Row {}".format(row)]["Col {}".format(col)] = ((row - 1) * 4) + col
+        self.grid = filled_grid
+
+
+class SparseCase(unittest.TestCase, BaseCase):
+
+    def setUp(self):
+        self.input = (("Test Grid", "Col 1", "Col 2", "Col 3", "Col 4"),
+                      (    "Row 1",       1,       2,       3,       4),
+                      (    "Row 2",       5,       6,       7,       8))
+        self.grid = SparseGrid.from_lines(self.input)
+
+    def test_sparse(self):
+        grid = SparseGrid.from_lines((("Sparse", "Col 1", "Col 2", "Col 3"),
+                                      ( "Row 1",      "",     "a",      ""),
+                                      ( "Row 2",      "",      "",      ""),
+                                      ( "Row 3",     "b",      "",     "c")))
+        self.assertAlmostEqual(grid.density, 3 / 9)
+        self.assertEqual(grid["Row 2"]["Col 2"], "")
+        self.assertSequenceEqual(tuple(grid._data["Row 2"].stored_keys()), ())
+        grid["Row 1"]["Col 2"] = ""
+        grid.set_row("Row 2", ("", "d", ""))
+        grid.append_row("Row 4", ("", "", "e"))
+        self.assertSequenceEqual(tuple(grid.iter_set_cells()),
+                                 (Cell("Row 2", "Col 2", "d"), Cell("Row 3", "Col 1", "b"),
+                                  Cell("Row 3", "Col 3", "c"), Cell("Row 4", "Col 3", "e")))
+        self.assertEqual(grid.set_count, 4)
+        self.assertIsInstance(grid.copy()._data["Row 1"], type(grid._data["Row 1"]))
+
+    def test_not_default(self):
+        grid = SparseGrid(("Row 1",), ("Col 1", "Col 2"), default=0)
+        grid["Row 1"]["Col 1"] = False
+        grid["Row 1"]["Col 2"] = 0
+        self.assertIs(grid["Row 1"]["Col 1"], False)
+        self.assertSequenceEqual(tuple(grid.nonzero_cells()), (Cell("Row 1", "Col 1", False),))
+
+    def test_sparse_csv(self):
+        self.grid["Row 1"]["Col 2"] = ""
+        file = io.StringIO()
+        self.assertEqual(self.grid.save_sparse_csv(file), 7)
+        self.assertEqual(file.getvalue().splitlines()[:4],
+                         ["title,Test Grid", "default,", "rows,Row 1,Row 2", "cols,Col 1,Col 2,Col 3,Col 4"])
+        file.seek(0)
+
+        class IntGrid(SparseGrid):
+            def preprocess_value(self, row, col, value):
+                return int(value)
+
+        loaded = IntGrid.from_sparse_csv(file)
+        self.assertEqual(loaded, self.grid)
+        self.assertEqual(loaded.density, 7 / 8)
+        self.assertRaises(ValueError, SparseGrid.from_sparse_csv, io.StringIO("Test Grid,Col 1\nRow 1,1\n"))
+
+
+class LazyCsvCase(unittest.TestCase):
+
+    class IntGrid(LazyCsvGrid):
+
+        def preprocess_value(self, row, col, value):
+            return int(value)
+
+    def setUp(self):
+        with open(r"tests/test_grid.csv", "r") as file:
+            self.grid = self.IntGrid.from_csv_file(file, cache_size=1)
+
+    def tearDown(self):
+        self.grid.close()
+
+    test_headings = BaseCase.test_headings
+    test_subscripting = BaseCase.test_subscripting
+    test_iters = BaseCase.test_iters
+    test_col_row = BaseCase.test_col_row
+
+    def test_cache(self):
+        row_1 = self.grid["Row 1"]
+        self.assertIs(self.grid["Row 1"], row_1)
+        self.grid["Row 2"]
+        self.assertEqual(list(self.grid._data.cache), ["Row 2"])
+        self.assertIsNot(self.grid["Row 1"], row_1)
+
+    def test_copy(self):
+        copy = self.grid.copy()
+        self.assertIsInstance(copy, self.IntGrid)
+        self.assertIsNot(copy, self.grid)
+        self.assertIs(copy._data.mapped, self.grid._data.mapped)
+        self.grid["Row 1"]
+        copy["Row 2"]
+        self.assertEqual(list(self.grid._data.cache), ["Row 1"])
+        self.assertEqual(list(copy._data.cache), ["Row 2"])
+        self.assertEqual(copy.to_lists(), self.grid.to_lists())
+        copy.close()
+        self.assertEqual(self.grid["Row 2"]["Col 4"], 8)
+        self.assertFalse(self.grid._data.mapped.closed)
+
+    def test_load_arguments(self):
+        grid = LazyCsvGrid.load("tests/test_grid.csv", cache=False, col_types={"Col 2": int}, row_types={"Row 2": int})
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), ("1", 2, "3", "4"))
+        self.assertSequenceEqual(tuple(grid.row("Row 2")), (5, 6, 7, 8))
+        grid.close()
+        self.assertRaises(ValueError, LazyCsvGrid.load, "tests/test_grid.csv", cache=False, parser="split")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.csv.gz")
+            ConfigGrid.load("tests/test_grid.csv", cache=False).save_to_path(path)
+            with self.assertRaisesRegex(ValueError, "uncompressed"):
+                LazyCsvGrid.load(path, cache=False)
+            with self.assertRaisesRegex(ValueError, "uncompressed"):
+                GridStore(directory, LazyCsvGrid)["grid"]
+
+    def test_cached_load(self):
+        cache = GridCache()
+        first = LazyCsvGrid.load("tests/test_grid.csv", cache=cache)
+        self.assertEqual(first["Row 1"]["Col 2"], "2")
+        first.close()
+        again = LazyCsvGrid.load("tests/test_grid.csv", cache=cache)
+        self.assertEqual(again["Row 1"]["Col 2"], "2")
+        self.assertEqual(cache.stats()["hits"], 1)
+        again.close()
+
+    def test_read_only(self):
+        self.assertRaises(TypeError, self.grid.append_row, "Row 3", (9, 10, 11, 12))
+        self.assertRaises(TypeError, self.grid.set_col, "Col 1", (9, 10))
+        row = self.grid["Row 1"]
+        with self.assertRaises(TypeError):
+            row["Col 1"] = 10
+        self.assertRaises(TypeError, row.update, {"Col 1": 10})
+        self.assertRaises(TypeError, row.setdefault, "Col 1", 10)
+        self.assertEqual(self.grid["Row 1"]["Col 1"], 1)
+        writable = row.copy()
+        writable["Col 1"] = 10
+        self.assertEqual(writable["Col 1"], 10)
+
+    def test_flat_iteration(self):
+        self.assertSequenceEqual(list(self.grid.iter_values()), (1, 2, 3, 4, 5, 6, 7, 8))
+        self.assertEqual(self.grid.to_lists(), [[1, 2, 3, 4], [5, 6, 7, 8]])
+        self.assertEqual(self.grid.iat[-1, 2], 7)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class NumericCase(unittest.TestCase):
+
+    class IntGrid(NumericGrid):
+        dtype = int
+
+    def setUp(self):
+        with open(r"tests/test_grid.csv", "r") as file:
+            self.grid = self.IntGrid.from_csv_file(file)
+
+    test_headings = BaseCase.test_headings
+    test_subscripting = BaseCase.test_subscripting
+    test_iters = BaseCase.test_iters
+    test_flat_iteration = BaseCase.test_flat_iteration
+    test_col_row = BaseCase.test_col_row
+    test_appends = BaseCase.test_appends
+    test_combine_all_new = BaseCase.test_combine_all_new
+    test_combine_both = BaseCase.test_combine_both
+    test_merge = BaseCase.test_merge
+    test_diff_patch = BaseCase.test_diff_patch
+    test_track_changes = BaseCase.test_track_changes
+    test_where = BaseCase.test_where
+    test_sort_reorder = BaseCase.test_sort_reorder
+    test_reduce = BaseCase.test_reduce
+    test_view = BaseCase.test_view
+    test_transpose = BaseCase.test_transpose
+    test_swaps = BaseCase.test_swaps
+    test_writing = BaseCase.test_writing
+    compare_cells = BaseCase.compare_cells
+
+    def test_set_col(self):
+        self.grid.set_col("Col 2", (20, 60))
+        self.assertSequenceEqual(tuple(self.grid.col("Col 2")), (20, 60))
+
+    def test_python_scalars(self):
+        self.assertIs(type(self.grid["Row 1"]["Col 2"]), int)
+        self.assertEqual(json.dumps(self.grid["Row 1"]["Col 2"]), "2")
+        self.assertEqual(list(self.grid["Row 2"]), [5, 6, 7, 8])
+        self.assertEqual(json.dumps(self.grid.view(cols=("Col 4", "Col 1")).to_lists()), "[[4, 1], [8, 5]]")
+        tracker = self.grid.track_changes()
+        self.grid["Row 1"]["Col 2"] = 20
+        self.assertEqual(self.grid.col("Col 2").__next__(), 20)
+        self.assertEqual(list(tracker.cells), [("Row 1", "Col 2")])
+        with Instrumentation() as stats:
+            self.grid["Row 1"]["Col 2"]
+        self.assertEqual(stats.cell_reads, 1)
+
+    def test_empty_reductions(self):
+        grid = self.IntGrid(["Row 1"], [])
+        self.assertEqual(grid.min(axis="row"), {"Row 1": None})
+        self.assertEqual(grid.sum(axis="row"), {"Row 1": 0})
+        self.assertEqual(grid.mean(axis="col"), {})
+        self.assertEqual(grid.max(axis="row"), grid.reduce("row", "max"))
+
+    def test_to_numpy(self):
+        self.assertIs(self.grid.to_numpy(), self.grid._values)
+        self.grid.swap_cols("Col 1", "Col 4")
+        numpy.testing.assert_array_equal(self.grid.to_numpy(), [[4, 2, 3, 1], [8, 6, 7, 5]])
+
+    def test_reduce_numpy(self):
+        calls = []
+        self.grid._reduce_all = lambda axis, func: calls.append(func) or NumericGrid._reduce_all(self.grid, axis, func)
+        expected = {"sum": (10, 26), "min": (1, 5), "max": (4, 8), "mean": (2.5, 6.5), "count": (4, 4)}
+        for func, (row_1, row_2) in expected.items():
+            self.assertEqual(self.grid.reduce("row", func), {"Row 1": row_1, "Row 2": row_2})
+        self.assertEqual(calls, list(expected))
+        result = self.grid.reduce("col", "count")
+        self.assertEqual(result, {"Col 1": 2, "Col 2": 2, "Col 3": 2, "Col 4": 2})
+        self.assertIsInstance(result["Col 1"], int)
+
+    def test_reductions(self):
+        self.assertEqual(self.grid.sum(axis="row"), {"Row 1": 10, "Row 2": 26})
+        self.assertEqual(self.grid.max(axis="col"), {"Col 1": 5, "Col 2": 6, "Col 3": 7, "Col 4": 8})
+        self.assertEqual(self.grid.mean(axis="col")["Col 1"], 3)
+        self.assertRaises(ValueError, self.grid.sum, axis="diagonal")
+
+    def test_arithmetic(self):
+        other = self.IntGrid.from_lines((("Other", "Col 4", "Col 3", "Col 2", "Col 1"),
+                                         ("Row 2",       1,       1,       1,       1),
+                                         ("Row 1",       0,       0,       0,      10)))
+        self.assertSequenceEqual(tuple((self.grid + other).row("Row 1")), (11, 2, 3, 4))
+        self.assertSequenceEqual(tuple((self.grid * 2).col("Col 2")), (4, 12))
+        self.assertSequenceEqual(tuple((10 - self.grid).row("Row 2")), (5, 4, 3, 2))
+        other.append_row("Row 3", (0, 0, 0, 0))
+        self.assertRaises(KeyError, lambda: self.grid - other)
+
+
+class ParallelCase(unittest.TestCase, BaseCase):
+
+    def setUp(self):
+        self.grid = FromCsvCase.IntGrid.from_csv_parallel("tests/test_grid.csv", workers=2, min_size=0)
+
+    def test_matches_serial(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.csv")
+            lines = [["Big Grid"] + ["Col {}".format(j) for j in range(20)]]
+            lines += [["Row {}".format(i)] + [str(i * j) for j in range(20)] for i in range(500)]
+            ConfigGrid.from_lines(lines).save_to_path(path)
+            with open(path) as file:
+                serial = ConfigGrid.from_csv_file(file)
+            parallel = ConfigGrid.from_csv_parallel(path, workers=3, min_size=0)
+            self.assertEqual(parallel.row_hds, serial.row_hds)
+            self.assertEqual(list(parallel.cells), list(serial.cells))
+
+    def test_duplicate_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.csv")
+            with open(path, "w") as file:
+                file.write("Grid,Col 1\n" + "Row 1,1\n" * 100)
+            self.assertRaises(ValueError, ConfigGrid.from_csv_parallel, path, workers=2, min_size=0)
+
+
+class BulkLoadCase(unittest.TestCase):
+
+    lines = (("Test Grid", "Col 1", "Col 2", "Col 3"),
+             (    "Row 1",     "1",     "2",     "3"),
+             (    "Row 2",     "4",     "5"))
+
+    def test_short_rows_keep_default(self):
+        for grid_cls in (ConfigGrid, ColumnarGrid):
+            grid = grid_cls.from_lines(self.lines)
+            self.assertSequenceEqual(tuple(grid.row("Row 2")), ("4", "5", ""))
+
+    def test_wide_rows(self):
+        lines = self.lines + (("Row 3", "6", "7", "8", "9"),)
+        for grid_cls in (ConfigGrid, ColumnarGrid):
+            self.assertRaises(IndexError, grid_cls.from_lines, lines)
+
+    def test_preprocess_value(self):
+        calls = []
+
+        class IntGrid(ConfigGrid):
+
+            def preprocess_value(self, row, col, value):
+                calls.append((row, col))
+                return int(value)
+
+        grid = IntGrid.from_lines(self.lines)
+        self.assertEqual(calls, [("Row 1", "Col 1"), ("Row 1", "Col 2"), ("Row 1", "Col 3"),
+                                 ("Row 2", "Col 1"), ("Row 2", "Col 2")])
+        self.assertSequenceEqual(tuple(grid.col("Col 2")), (2, 5))
+
+    def test_process_lines(self):
+        row_hds, col_hds, data, title = ConfigGrid.process_lines(self.lines)
+        self.assertEqual(title, "Test Grid")
+        self.assertEqual(row_hds, ["Row 1", "Row 2"])
+        self.assertEqual(data[-1], Cell("Row 2", "Col 2", "5"))
+
+
+class ParserCase(unittest.TestCase):
+
+    plain = "Test Grid,Col 1,Col 2\nRow 1,1,2\nRow 2,3,\n"
+    quoted = 'Test Grid,Col 1,Col 2\nRow 1,"a, b",2\nRow 2,"multi\nline",\n'
+
+    def test_select(self):
+        self.assertEqual(parsers.select(self.plain, sniff=ConfigGrid._sniff), ("split", {"delimiter": ","}))
+        self.assertEqual(parsers.select(self.plain.replace(",", "\t"), sniff=ConfigGrid._sniff)[1], {"delimiter": "\t"})
+        self.assertEqual(parsers.select(self.quoted, sniff=ConfigGrid._sniff)[0], "csv")
+        self.assertEqual(parsers.select(self.plain, "csv", sniff=ConfigGrid._sniff), ("csv", {"delimiter": ","}))
+        self.assertEqual(parsers.select(self.plain, csv_reader_args={"delimiter": ";"}), ("csv", {"delimiter": ";"}))
+        self.assertRaises(ValueError, parsers.select, self.plain, "fastest")
+
+    def test_backends_agree(self):
+        for text in (self.plain, self.quoted, self.plain + 'Row 3,"late, quote",4\n', self.plain.replace(",", ";")):
+            expected = ConfigGrid.from_csv_file(io.StringIO(text), parser="csv")
+            for parser in ("split", None):
+                grid = ConfigGrid.from_csv_file(io.StringIO(text), parser=parser)
+                self.assertSequenceEqual(grid.col_hds, expected.col_hds)
+                self.assertEqual(grid, expected)
+        grid = ConfigGrid.from_csv_file(io.StringIO(self.quoted))
+        self.assertEqual(grid["Row 1"]["Col 1"], "a, b")
+        self.assertEqual(grid["Row 2"]["Col 1"], "multi\nline")
+
+    def test_pinned_dialect(self):
+        grid = ConfigGrid.from_csv_file(io.StringIO(self.plain.replace(",", "|")), {"delimiter": "|"}, parser="split")
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), ("1", "2"))
+
+    def test_split_dialect_quoting(self):
+        text = "Grid,Col 1,Col 2\nRow 1,1,2\nRow 2,'a,b',3\n"
+        for args in ({"quotechar": "'"}, {"quotechar": "'", "escapechar": "\\"}):
+            grid = ConfigGrid.from_csv_file(io.StringIO(text), args, parser="split")
+            self.assertEqual(grid, ConfigGrid.from_csv_file(io.StringIO(text), args, parser="csv"))
+            self.assertSequenceEqual(tuple(grid.row("Row 2")), ("a,b", "3"))
+        text = "Grid,Col 1,Col 2\nRow 1,1,a\\,b\n"
+        grid = ConfigGrid.from_csv_file(io.StringIO(text), {"escapechar": "\\"}, parser="split")
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), ("1", "a,b"))
+        text = "Grid, Col 1, Col 2\nRow 1, 1, 2\n"
+        grid = ConfigGrid.from_csv_file(io.StringIO(text), {"skipinitialspace": True}, parser="split")
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), ("1", "2"))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_pyarrow(self):
+        self.assertEqual(ConfigGrid.from_csv_file(io.StringIO(self.quoted), parser="pyarrow"),
+                         ConfigGrid.from_csv_file(io.StringIO(self.quoted), parser="csv"))
+
+
+class SaveCase(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = ConfigGrid.from_lines((("Test Grid", "Col 1", "Col 2"),
+                                           (    "Row 1",       1,       2),
+                                           (    "Row 2",       3,       4),
+                                           (    "Row 3",       5,       6)))
+
+    def test_batches(self):
+        for batch_size in (1, 2, 1000):
+            file = io.StringIO()
+            stats = self.grid.save_to_file(file, batch_size=batch_size)
+            self.assertEqual(file.getvalue(), "Test Grid,Col 1,Col 2\nRow 1,1,2\nRow 2,3,4\nRow 3,5,6\n")
+            self.assertEqual(stats.rows, 4)
+            self.assertEqual(stats.chars, len(file.getvalue()))
+
+    def test_postprocess_value(self):
+
+        class DoubleGrid(ConfigGrid):
+
+            def postprocess_value(self, row, col, value):
+                return value * 2
+
+        grid = DoubleGrid.from_lines((("Test Grid", "Col 1"), ("Row 1", 1)))
+        file = io.StringIO()
+        grid.save_to_file(file)
+        self.assertEqual(file.getvalue(), "Test Grid,Col 1\nRow 1,2\n")
+
+    def test_compression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("grid.csv", "grid.csv.gz", "grid.csv.bz2", "grid.csv.xz"):
+                path = os.path.join(directory, name)
+                stats = self.grid.save_to_path(path)
+                self.assertEqual(stats.bytes, os.path.getsize(path))
+                with open_grid_file(path) as file:
+                    self.assertEqual(file.read(), "Test Grid,Col 1,Col 2\nRow 1,1,2\nRow 2,3,4\nRow 3,5,6\n")
+            self.assertRaises(ValueError, self.grid.save_to_path, path, compression="zip")
+
+
+class ConverterCase(unittest.TestCase):
+
+    lines = (("Test Grid", "Col 1", "Col 2", "Col 3"),
+             (    "Row 1",     "1",     "2",     "3"),
+             (    "Row 2",     "4",     "5",     "6"),
+             (    "Total",     "5",     "7",     "9"))
+
+    class TaggedGrid(ConfigGrid):
+        col_types = {"Col 1": int}
+
+        def preprocess_value(self, row, col, value):
+            return "<{}>".format(value)
+
+    def test_col_types(self):
+        for grid_cls in (ConfigGrid, ColumnarGrid):
+            grid = grid_cls.from_lines(self.lines, col_types={"Col 1": int, "Col 3": float})
+            self.assertSequenceEqual(tuple(grid.row("Row 2")), (4, "5", 6.0))
+
+    def test_row_types(self):
+        grid = ConfigGrid.from_lines(self.lines, row_types={"Total": int})
+        self.assertSequenceEqual(tuple(grid.row("Total")), (5, 7, 9))
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), ("1", "2", "3"))
+
+    def test_vectorised(self):
+        calls = []
+
+        @vectorised
+        def running_total(values):
+            calls.append(values)
+            total = 0
+            for value in values:
+                total += int(value)
+                yield total
+
+        grid = ConfigGrid.from_lines(self.lines, col_types={"Col 2": running_total})
+        self.assertSequenceEqual(tuple(grid.col("Col 2")), (2, 7, 14))
+        self.assertEqual(len(calls), 1)
+
+    def test_preprocess_fallback(self):
+        grid = self.TaggedGrid.from_lines(self.lines)
+        self.assertSequenceEqual(tuple(grid.row("Row 1")), (1, "<2>", "<3>"))
+
+    def test_short_rows(self):
+        lines = (("Test Grid", "Col 1", "Col 2", "Col 3"),
+                 (    "Row 1",     "1",     "2",     "3"),
+                 (    "Row 2",     "4"),
+                 (    "Total",     "5",     "7"))
+        for grid_cls in (ConfigGrid, ColumnarGrid):
+            grid = grid_cls.from_lines(lines, col_types={"Col 2": int}, row_types={"Total": int})
+            self.assertSequenceEqual(tuple(grid.row("Row 2")), ("4", "", ""))
+            self.assertSequenceEqual(tuple(grid.row("Total")), (5, 7, ""))
+        grid = self.TaggedGrid.from_lines(lines)
+        self.assertSequenceEqual(tuple(grid.row("Row 2")), (4, "", ""))
+        self.assertSequenceEqual(tuple(grid.row("Total")), (5, "<7>", ""))
+
+        class IntGrid(LazyCsvGrid):
+            col_types = {"Col 3": int}
+
+            def preprocess_value(self, row, col, value):
+                return "<{}>".format(value)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "short.csv")
+            with open(path, "w") as file:
+                file.write("Test Grid,Col 1,Col 2,Col 3\nRow 1,1,2,3\nRow 2,4\n")
+            with open(path, "r") as file:
+                grid = IntGrid.from_csv_file(file, {"dialect": "excel"})
+            self.assertSequenceEqual(tuple(grid.row("Row 1")), ("<1>", "<2>", 3))
+            self.assertSequenceEqual(tuple(grid.row("Row 2")), ("<4>", "", ""))
+            grid.close()
+
+    def test_formats(self):
+        grid = ConfigGrid.from_lines(self.lines, col_types={"Col 1": int})
+        file = io.StringIO()
+        grid.save_to_file(file, col_formats={"Col 1": "{:03}".format}, row_formats={"Total": "={}".format})
+        self.assertEqual(file.getvalue(), "Test Grid,Col 1,Col 2,Col 3\n"
+                                          "Row 1,001,2,3\n"
+                                          "Row 2,004,5,6\n"
+                                          "Total,=005,=7,=9\n")
+
+    def test_lazy(self):
+
+        class IntGrid(LazyCsvGrid):
+            col_types = {"Col 2": int}
+
+        with open(r"tests/test_grid.csv", "r") as file:
+            grid = IntGrid.from_csv_file(file)
+        self.assertSequenceEqual(tuple(grid.row("Row 2")), ("5", 6, "7", "8"))
+        grid.close()
+
+
+class BinaryCase(unittest.TestCase):
+
+    lines = (("Test Grid", "Ints", "Floats", "Strings", "Mixed"),
+             (    "Row 1",      1,      1.5,     "one",       1),
+             (    "Row 2",     -2,      2.5,     "two",   "two"),
+             (    "Row 3",     30,     -3.5,   "three",    None))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grid.cgrid")
+        ConfigGrid.from_lines(self.lines).save_binary(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for grid_cls in (ConfigGrid, ColumnarGrid):
+            grid = grid_cls.load_binary(self.path)
+            self.assertEqual(grid.title, "Test Grid")
+            self.assertEqual(grid.path, self.path)
+            self.assertEqual(list(grid.cells), list(ConfigGrid.from_lines(self.lines).cells))
+
+    def test_zero_copy(self):
+        grid = ColumnarGrid.load_binary(self.path)
+        self.assertIsInstance(grid._columns[0], memoryview)
+        self.assertIsInstance(grid._columns[1], memoryview)
+        self.assertIsInstance(grid._columns[2], list)
+        grid["Row 1"]["Ints"] = 10
+        self.assertIsInstance(grid._columns[0], memoryview)
+        grid["Row 1"]["Ints"] = "ten"
+        grid.append_row("Row 4", (4, 4.5, "four", 4))
+        self.assertSequenceEqual(tuple(grid.col("Ints")), ("ten", -2, 30, 4))
+        self.assertSequenceEqual(tuple(grid.col("Floats")), (1.5, 2.5, -3.5, 4.5))
+        self.assertSequenceEqual(tuple(ColumnarGrid.load_binary(self.path).col("Ints")), (1, -2, 30))
+
+    def test_typed_writes(self):
+        grid = ColumnarGrid.load_binary(self.path)
+        grid["Row 1"]["Floats"] = 3
+        grid["Row 2"]["Ints"] = True
+        self.assertIs(grid["Row 1"]["Floats"], 3)
+        self.assertIs(grid["Row 2"]["Ints"], True)
+        grid.set_col("Floats", (0.5, 1.5, 2.5))
+        grid.set_col("Ints", (1, 2 ** 70, 3))
+        self.assertSequenceEqual(tuple(grid.col("Floats")), (0.5, 1.5, 2.5))
+        self.assertSequenceEqual(tuple(grid.col("Ints")), (1, 2 ** 70, 3))
+        grid = ColumnarGrid.load_binary(self.path)
+        grid.set_col("Floats", (0.5, 1.5, 2.5))
+        self.assertIsInstance(grid._columns[1], memoryview)
+
+    def test_not_binary(self):
+        self.assertRaises(ValueError, ConfigGrid.load_binary, "tests/test_grid.csv")
+
+
+class LoadCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grid.csv")
+        self.write("1")
+        self.cache = GridCache(maxsize=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, value, path=None):
+        with open(path or self.path, "w") as file:
+            file.write("Test Grid,Col 1\nRow 1,{}\n".format(value))
+
+    def test_hits(self):
+        grid = ConfigGrid.load(self.path, cache=self.cache)
+        self.assertEqual(grid.path, self.path)
+        grid["Row 1"]["Col 1"] = "changed"
+        again = ConfigGrid.load(self.path, cache=self.cache)
+        self.assertEqual(again["Row 1"]["Col 1"], "1")
+        self.assertIsNot(again, grid)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_hits_share_nothing(self):
+        for grid_cls in (ConfigGrid, SparseGrid):
+            with open(self.path, "w") as file:
+                file.write("Test Grid,Col 1,Col 2\nRow 1,1,2\nRow 2,3,4\n")
+            first = grid_cls.load(self.path, cache=self.cache)
+            second = grid_cls.load(self.path, cache=self.cache)
+            first["Row 1"]["Col 1"] = "changed"
+            first.append_row("Row 3", ("new", "row"))
+            self.assertEqual(second["Row 1"]["Col 1"], "1")
+            self.assertSequenceEqual(second.row_hds, ("Row 1", "Row 2"))
+            self.assertEqual(pickle.loads(pickle.dumps(second)), grid_cls.load(self.path, cache=False))
+            self.assertEqual(second.copy(), grid_cls.load(self.path, cache=self.cache))
+
+        path = os.path.join(self.directory.name, "grid.cgrid")
+        ColumnarGrid.from_lines((("Test Grid", "Ints"), ("Row 1", 1), ("Row 2", 2))).save_binary(path)
+        first = ColumnarGrid.load(path, cache=self.cache)
+        second = ColumnarGrid.load(path, cache=self.cache)
+        first["Row 1"]["Ints"] = 10
+        first.set_col("Ints", (20, 30))
+        self.assertSequenceEqual(tuple(second.col("Ints")), (1, 2))
+        self.assertSequenceEqual(tuple(first.col("Ints")), (20, 30))
+
+    def test_invalidation(self):
+        ConfigGrid.load(self.path, cache=self.cache)
+        self.write("22")
+        self.assertEqual(ConfigGrid.load(self.path, cache=self.cache)["Row 1"]["Col 1"], "22")
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_eviction(self):
+        for i in range(3):
+            path = os.path.join(self.directory.name, "grid_{}.csv".format(i))
+            self.write(i, path)
+            ConfigGrid.load(path, cache=self.cache)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_kwargs_and_classes(self):
+        as_str = ConfigGrid.load(self.path, cache=self.cache)
+        as_int = ConfigGrid.load(self.path, cache=self.cache, col_types={"Col 1": int})
+        columnar = ColumnarGrid.load(self.path, cache=self.cache)
+        self.assertEqual(as_str["Row 1"]["Col 1"], "1")
+        self.assertEqual(as_int["Row 1"]["Col 1"], 1)
+        self.assertIsInstance(columnar, ColumnarGrid)
+        self.assertEqual(self.cache.stats()["misses"], 3)
+
+    def test_no_cache(self):
+        ConfigGrid.load(self.path, cache=False)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_load_many(self):
+        paths = [os.path.join(self.directory.name, "grid{}.csv".format(i)) for i in range(5)]
+        for i, path in enumerate(paths):
+            self.write(i, path)
+        paths.insert(2, os.path.join(self.directory.name, "missing.csv"))
+        for processes in (False, True):
+            grids = ConfigGrid.load_many(paths, max_workers=3, processes=processes, cache=False)
+            self.assertIsInstance(grids[2], FileNotFoundError)
+            del grids[2]
+            self.assertEqual([grid["Row 1"]["Col 1"] for grid in grids], ["0", "1", "2", "3", "4"])
+
+    def test_pathlib(self):
+        binary_path = pathlib.Path(self.directory.name, "grid.cgrid")
+        ConfigGrid.load(self.path, cache=False).save_binary(binary_path)
+        for path in (pathlib.Path(self.path), binary_path):
+            self.assertEqual(ConfigGrid.load(path, cache=self.cache)["Row 1"]["Col 1"], "1")
+        grids = ConfigGrid.load_many([pathlib.Path(self.path), binary_path], cache=False)
+        self.assertEqual([grid["Row 1"]["Col 1"] for grid in grids], ["1", "1"])
+
+    def test_async(self):
+        async def round_trip():
+            grid = await ConfigGrid.aload(self.path, cache=self.cache)
+            grid["Row 1"]["Col 1"] = "saved"
+            copy_path = os.path.join(self.directory.name, "copy.csv.gz")
+            stats = await grid.asave(copy_path)
+            binary_path = pathlib.Path(self.directory.name, "copy.cgrid")
+            await grid.asave(binary_path)
+            return await asyncio.gather(ConfigGrid.aload(copy_path, cache=False),
+                                        ConfigGrid.aload(binary_path, cache=False),
+                                        ConfigGrid.aload("missing.csv"), return_exceptions=True), stats
+
+        (loaded, binary, missing), stats = asyncio.run(round_trip())
+        self.assertEqual(loaded["Row 1"]["Col 1"], "saved")
+        self.assertEqual(binary["Row 1"]["Col 1"], "saved")
+        self.assertEqual(stats.rows, 2)
+        self.assertIsInstance(missing, FileNotFoundError)
+
+
+class StoreCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for name, path in (("north", "north.csv"), ("south", "south.csv.gz"), ("east", "east.csv")):
+            grid = ConfigGrid.from_lines((("Test Grid", "Col 1", "Col 2"),
+                                          (    "Row 1",    name,     "2"),
+                                          (    "Row 2",     "3",     "4")))
+            grid.save_to_path(os.path.join(self.directory.name, path))
+        with open(os.path.join(self.directory.name, "notes.txt"), "w") as file:
+            file.write("not a grid")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lazy_loading(self):
+        store = GridStore(self.directory.name)
+        self.assertEqual(store.names(), ["east", "north", "south"])
+        self.assertEqual(store.loaded(), [])
+        self.assertEqual(store["south"]["Row 1"]["Col 1"], "south")
+        self.assertIs(store["south"], store["south"])
+        self.assertEqual(store.loaded(), ["south"])
+        self.assertRaises(KeyError, lambda: store["west"])
+        self.assertIsNone(store.get("west"))
+        self.assertEqual(store.stats()["loads"], 1)
+        self.assertEqual(store.stats()["hits"], 2)
+
+    def test_shared_headings(self):
+        for grid_cls in (ConfigGrid, ColumnarGrid, SparseGrid):
+            store = GridStore(self.directory.name, grid_cls)
+            north, south = store["north"], store["south"]
+            self.assertIs(north.col_hds, south.col_hds)
+            self.assertIs(north.row_hds[1], south.row_hds[1])
+            self.assertEqual(north["Row 2"]["Col 2"], "4")
+            north["Row 2"]["Col 2"] = "5"
+            self.assertEqual(south["Row 2"]["Col 2"], "4")
+            self.assertRaises(TypeError, north.append_row, "Row 3", ("5", "6"))
+            self.assertRaises(TypeError, north.sort_cols, reverse=True)
+            copy = north.copy()
+            copy.append_row("Row 3", ("5", "6"))
+            self.assertSequenceEqual(south.row_hds, ("Row 1", "Row 2"))
+
+    def test_memory_budget(self):
+        store = GridStore(self.directory.name)
+        size = store["north"]._nbytes()
+        store = GridStore(self.directory.name, memory_budget=size * 2.5)
+        for name in ("north", "south", "east"):
+            store[name]
+        self.assertEqual(store.loaded(), ["south", "east"])
+        self.assertEqual(store.stats()["evictions"], 1)
+        store["north"]
+        self.assertEqual(store.loaded(), ["east", "north"])
+        self.assertLessEqual(store.nbytes, store.memory_budget)
+        store.evict()
+        self.assertEqual(store.loaded(), [])
+
+
+class RenderCase(unittest.TestCase):
+
+    def setUp(self):
+        lines = [["Big Grid"] + ["Col {}".format(i) for i in range(1, 101)]]
+        for j in range(1, 1001):
+            lines.append(["Row {}".format(j)] + list(range((j - 1) * 100 + 1, j * 100 + 1)))
+        self.grids = (ConfigGrid.from_lines(lines), ColumnarGrid.from_lines(lines))
+
+    def test_truncated(self):
+        for grid in self.grids:
+            lines = grid.render(max_rows=4, max_cols=4).split("\n")
+            self.assertEqual(len(lines), 6)
+            self.assertEqual(lines[0].split(), ["Big", "Grid", "Col", "1", "Col", "2", "...", "Col", "99", "Col", "100"])
+            self.assertEqual(lines[3].split(), ["..."] * 6)
+            self.assertEqual(lines[-1].split(), ["Row", "1000", "99901", "99902", "...", "99999", "100000"])
+            self.assertEqual(len(repr(grid).split("\n")), grid.max_repr_rows + 2)
+
+    def test_stream(self):
+        for grid in self.grids:
+            for limits in ((None, None), (4, 4), (1, 1), (0, 3)):
+                out = io.StringIO()
+                grid.render(*limits, file=out)
+                self.assertEqual(out.getvalue(), grid.render(*limits) + "\n")
+            repr(grid)
+            self.assertFalse(grid._listeners)
+            self.assertNotIn("_renderer", vars(grid))
+
+    def test_small(self):
+        with open(r"tests/test_grid.csv", "r") as file:
+            grid = ConfigGrid.from_csv_file(file)
+        self.assertEqual(repr(grid), grid.render())
+        self.assertEqual(repr(grid).split("\n")[1], "Row 1      1      2      3      4      ")
+        out = io.StringIO()
+        self.assertIsNone(grid.render(file=out))
+        self.assertEqual(out.getvalue(), repr(grid) + "\n")
+
+    def test_cache(self):
+        for grid in self.grids:
+            first = grid.render(4, 4, cache=True)
+            self.assertIs(grid._renderer.lines(grid, 4, 4), grid._renderer.lines(grid, 4, 4))
+            grid["Row 500"]["Col 50"] = "not shown"
+            self.assertIn((4, 4), grid._renderer.entries)
+            grid["Row 1"]["Col 1"] = "a much wider value"
+            self.assertNotIn((4, 4), grid._renderer.entries)
+            self.assertIn("a much wider value", grid.render(4, 4, cache=True))
+            grid.set_col("Col 2", ["x"] * 1000)
+            self.assertIn("x", grid.render(4, 4, cache=True).split("\n")[1].split())
+            grid.swap_rows("Row 1", "Row 500")
+            self.assertIn("Row 500", grid.render(4, 4, cache=True))
+            grid.title = "Renamed"
+            self.assertTrue(grid.render(4, 4, cache=True).startswith("Renamed"))
+            self.assertNotEqual(first, grid.render(4, 4, cache=True))
+            self.assertNotIn("_renderer", vars(grid.copy()))
+            self.assertFalse(grid.copy()._listeners)
+
+
+class InstrumentationCase(unittest.TestCase):
+
+    def test_phases(self):
+        with Instrumentation() as stats:
+            with open(r"tests/test_grid.csv", "r") as file:
+                grid = ConfigGrid.from_csv_file(file)
+            grid.save_to_file(io.StringIO())
+            grid.combine(grid.copy())
+        self.assertIsNone(active())
+        phases = stats.as_dict()["phases"]
+        for name in ("from_csv_file", "from_csv_file.sniff", "from_lines", "from_lines.parse", "from_lines.headings",
+                     "from_lines.load", "save_to_file", "combine"):
+            self.assertEqual(phases[name]["count"], 1)
+        self.assertNotIn("from_lines.convert", phases)
+        self.assertGreaterEqual(phases["from_csv_file"]["seconds"], phases["from_lines"]["seconds"])
+
+    def test_cells(self):
+        for grid_cls in (ConfigGrid, ColumnarGrid, SparseGrid):
+            grid = grid_cls(["Row 1", "Row 2"], ["Col 1", "Col 2"])
+            row_cls = type(grid["Row 1"])
+            methods = (row_cls.__getitem__, row_cls.__setitem__)
+            with Instrumentation() as stats:
+                grid["Row 1"]["Col 1"] = 1
+                grid["Row 1"]["Col 1"]
+                grid["Row 2"]["Col 2"]
+            self.assertEqual(stats.as_dict()["cell_writes"], 1)
+            self.assertEqual(stats.as_dict()["cell_reads"], 2)
+            self.assertEqual((row_cls.__getitem__, row_cls.__setitem__), methods)
+
+    def test_nesting(self):
+        outer = Instrumentation()
+        with outer:
+            with Instrumentation(count_cells=False) as inner:
+                ConfigGrid.from_lines((("", "Col 1"), ("Row 1", 1)))["Row 1"]["Col 1"]
+            self.assertIs(active(), outer)
+            ConfigGrid.from_lines((("", "Col 1"), ("Row 1", 1)))["Row 1"]["Col 1"]
+        self.assertEqual(inner.as_dict()["phases"]["from_lines"]["count"], 1)
+        self.assertEqual(inner.cell_reads, 0)
+        self.assertEqual(outer.as_dict()["phases"]["from_lines"]["count"], 1)
+        self.assertEqual(outer.cell_reads, 1)
+
+
+class BenchCase(unittest.TestCase):
+
+    def setUp(self):
+        self.old = {"meta": {}, "results": [
+            {"name": "from_lines", "rows": 10, "cols": 10, "payload": "int", "seconds": 1.0, "peak_bytes": 1000},
+            {"name": "combine", "rows": 10, "cols": 10, "payload": "int", "seconds": 2.0, "peak_bytes": 2000},
+        ]}
+
+    def run_with(self, **changes):
+        new = json.loads(json.dumps(self.old))
+        for result in new["results"]:
+            result.update(changes.get(result["name"], {}))
+        return new
+
+    def test_unchanged(self):
+        self.assertEqual(bench.compare(self.old, self.old), [])
+        self.assertEqual(bench.compare(self.old, self.run_with(combine={"seconds": 2.1})), [])
+
+    def test_slower(self):
+        regressions = bench.compare(self.old, self.run_with(combine={"seconds": 3.0}))
+        self.assertEqual(regressions, [(("combine", 10, 10, "int"), "seconds", 2.0, 3.0, 1.5)])
+        self.assertEqual(bench.compare(self.old, self.run_with(combine={"seconds": 3.0}), threshold=0.6), [])
+
+    def test_now_fails(self):
+        new = self.run_with(from_lines={"seconds": None, "peak_bytes": None, "error": "ValueError: bad"})
+        self.assertEqual(bench.compare(self.old, new), [(("from_lines", 10, 10, "int"), "error", None,
+                                                         "ValueError: bad", None)])
+        self.assertEqual(bench.compare(new, new), [])
+
+    def test_main_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            old, new = os.path.join(directory, "old.json"), os.path.join(directory, "new.json")
+            with open(old, "w") as file:
+                json.dump(self.old, file)
+            for run, status in ((self.old, 0), (self.run_with(from_lines={"peak_bytes": 2000}), 1)):
+                with open(new, "w") as file:
+                    json.dump(run, file)
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    self.assertEqual(bench.main(["compare", old, new]), status)
+                self.assertEqual("REGRESSION" in out.getvalue(), bool(status))
+
+    def test_parse_sizes(self):
+        self.assertEqual(bench.parse_sizes("quick"), bench.SIZES["quick"])
+        self.assertEqual(bench.parse_sizes("100x10,20X30"), [(100, 10), (20, 30)])
+        self.assertRaises(ValueError, bench.parse_sizes, "100")
+
+
+class UniqueListCase(unittest.TestCase):
+
+    def check_index(self, unique):
+        self.assertEqual(unique._index, {value: i for i, value in enumerate(unique)})
+
+    def test_index_kept_in_step(self):
+        unique = UniqueList(("a", "b", "c", "d"))
+        unique.append("e")
+        unique.insert(0, "f")
+        unique.swap(0, 3)
+        unique[1] = "g"
+        unique.extend(("h", "i"))
+        unique += ["j"]
+        self.check_index(unique)
+        self.assertEqual(unique.index("f"), 3)
+        self.assertIn("j", unique)
+        self.assertNotIn("a", unique)
+        unique.sort()
+        self.check_index(unique)
+        unique.remove("c")
+        unique.pop(0)
+        self.check_index(unique)
+
+    def test_still_unique(self):
+        unique = UniqueList(("a", "b", "c"))
+        self.assertRaises(ValueError, unique.append, "a")
+        self.assertRaises(ValueError, unique.insert, 0, "b")
+        self.assertRaises(ValueError, unique.__setitem__, 0, "c")
+        self.assertRaises(ValueError, unique.extend, ("d", "a"))
+        self.assertSequenceEqual(unique, ("a", "b", "c"))
+        self.check_index(unique)
+        self.assertRaises(ValueError, UniqueList, ("a", "a"))
+
 
 if __name__ == "__main__":
     unittest.main()